@@ -27,6 +27,7 @@ setup(
     long_description=long_description,
     install_requires=[
         'numpy',
+        'scipy',
         'pandas',
         'pyomo',
         'glpk',
@@ -24,6 +24,7 @@ else:
   sys.path.append(os.path.join(pluginLoc, 'src', 'contrib'))
 from LOGOS.src.CapitalInvestments import PyomoModels
 from LOGOS.src.CapitalInvestments.investment_utils import inputReader
+from LOGOS.src.CapitalInvestments.investment_utils import cacheUtils
 #Internal Modules End--------------------------------------------------------------------------------
 
 try:
@@ -47,9 +48,15 @@ class CapitalInvestmentModel(ExternalModelPluginBase):
     ExternalModelPluginBase.__init__(self)
     self.initDict = None
     self.xmlModelData = None
+    self.variables = []
+    self.sampledSlots = None
     self.modelInstance = None
     self.type = None
     self.workingDir = None
+    self.cacheNode = None
+    self.cache = None
+    self.solutionCacheNode = None
+    self.solutionCache = None
     self.name = self.__class__.__name__
 
   def _readMoreXML(self, container, xmlNode):
@@ -64,7 +71,11 @@ class CapitalInvestmentModel(ExternalModelPluginBase):
       if child.tag == 'ModelData':
         self.xmlModelData = copy.deepcopy(child)
       elif child.tag == 'variables':
-        variables = [str(var.strip()) for var in child.text.split(",")]
+        self.variables = [str(var.strip()) for var in child.text.split(",")]
+      elif child.tag == 'cache':
+        self.cacheNode = copy.deepcopy(child)
+      elif child.tag == 'solutionCache':
+        self.solutionCacheNode = copy.deepcopy(child)
       else:
         raise IOError(self.name + ": xml node " + child.tag + " is not allowed!")
     logger.info('End of process %s input', self.name)
@@ -88,6 +99,21 @@ class CapitalInvestmentModel(ExternalModelPluginBase):
     logger.info('Starting to create Optimization Instance')
     self.modelInstance = PyomoModels.returnInstance(problemType)
     self.workingDir = runInfoDict['WorkingDir']
+    if self.cacheNode is not None:
+      cacheDir = self.cacheNode.text.strip() if self.cacheNode.text is not None else 'logos_cache'
+      cacheDir = os.path.join(self.workingDir, os.path.expanduser(cacheDir))
+      self.cache = cacheUtils.InputCache(cacheDir, self.cacheNode.get('maxSize', 512))
+      logger.info('Input cache: %s', self.cache.cacheDir)
+    if self.solutionCacheNode is not None:
+      cacheDir = self.solutionCacheNode.text.strip() if self.solutionCacheNode.text is not None else ''
+      cacheDir = os.path.join(self.workingDir, os.path.expanduser(cacheDir)) if cacheDir else None
+      decimals = self.solutionCacheNode.get('decimals', None)
+      self.solutionCache = cacheUtils.SolutionCache(self.solutionCacheNode.get('maxEntries', 128), cacheDir,
+                                                    self.solutionCacheNode.get('maxSize', 512), decimals)
+      logger.info('Solution cache: %s', cacheDir if cacheDir is not None else 'in memory')
+    # the input is processed once, and each sample only updates the parameter entries driven by the sampled variables
+    self.initDict, self.sampledSlots = inputReader.readSampledInput(self.xmlModelData, self.variables, self.workingDir, self.cache)
+    logger.info('Parameters driven by the sampled variables: %s', ', '.join(sorted(set(slot[0] for slots in self.sampledSlots.values() for slot in slots))))
 
   def createNewInput(self, container, inputs, samplerType, **Kwargs):
     """
@@ -99,31 +125,7 @@ class CapitalInvestmentModel(ExternalModelPluginBase):
            a mandatory key is the sampledVars'that contains a dictionary {'name variable':value}
       @ Out, inputDict, dict, return the new input in a dict form
     """
-    newXml = copy.deepcopy(self.xmlModelData)
-    paramNode = newXml.find('Parameters')
-    for child in paramNode:
-      if child.tag in Kwargs['SampledVars']:
-        if isinstance(Kwargs['SampledVars'][child.tag],(list, np.ndarray)):
-          child.text = ','.join(str(var) for var in Kwargs['SampledVars'][child.tag])
-        else:
-          child.text = str(Kwargs['SampledVars'][child.tag])
-      # check the text of each child
-      else:
-        pertData = []
-        if ',' in child.text:
-          listData = list(elem.strip() for elem in child.text.split(','))
-        else:
-          listData = list(elem.strip() for elem in child.text.split())
-        for var in listData:
-          if var in Kwargs['SampledVars']:
-            pertData.append(Kwargs['SampledVars'][var])
-          else:
-            pertData.append(var)
-        if len(pertData) > 1:
-          child.text = ','.join(str(var) for var in pertData)
-        elif len(pertData) == 1:
-          child.text = str(pertData[0])
-    inputDict = inputReader.readInput(newXml, self.workingDir)
+    inputDict = inputReader.applySampledValues(self.initDict, self.sampledSlots, Kwargs['SampledVars'])
     return inputDict
 
   def run(self, container, inputDict):
@@ -133,14 +135,38 @@ class CapitalInvestmentModel(ExternalModelPluginBase):
       @ In, inputDict, dict, dictionary of inputs from createNewInput
     """
     logger.info('Optimization Instance: %s is successfully created', self.modelInstance.name)
+    # the keys are computed before the input is consumed by the model
+    cacheKey, exactKey, entry = None, None, None
+    if self.solutionCache is not None:
+      cacheKey, exactKey = self.solutionCache.computeKeys(inputDict)
+      entry = self.solutionCache.load(cacheKey)
     logger.info('Starting to initialize Optimizer Instance: %s', self.modelInstance.name)
-    self.modelInstance.initialize(inputDict)
-
+    # the constructed instance is kept if only the values of the parameters are changed by the sampler
+    self.modelInstance.update(inputDict)
     logger.info('Optimization Instance: %s is successfully intialized',self.modelInstance.name)
-    logger.info('Starting to run Optimization Instance: %s', self.modelInstance.name)
-    # TODO: run method should be modified to return output dictionary for raven to retrieve information
-    outputDict = self.modelInstance.run()
-    logger.info('Optimization Instance: %s is successfully optimized', self.modelInstance.name)
+    outputDict = None
+    if entry is not None and entry['exactKey'] == exactKey:
+      outputDict = entry['output']
+    elif entry is not None:
+      # the cached problem is only the same as this problem after rounding, its solution is reused only if it is
+      # feasible for this problem, and the outputs are evaluated with the data of this problem
+      outputDict = self.modelInstance.evaluateSolution(entry['solution'])
+    reused = outputDict is not None
+    if reused:
+      # the cached solution replaces the solve, i.e. it is used as the last incumbent of the next solve, and the
+      # outputs that describe the solve are reported for this run instead of the run that solved it
+      outputDict.update(self.modelInstance.adoptCachedSolution(entry['solution'], entry['exactKey'] == exactKey))
+    else:
+      logger.info('Starting to run Optimization Instance: %s', self.modelInstance.name)
+      # TODO: run method should be modified to return output dictionary for raven to retrieve information
+      outputDict = self.modelInstance.run()
+      logger.info('Optimization Instance: %s is successfully optimized', self.modelInstance.name)
+      if cacheKey is not None:
+        cachedOutput = dict((key, val) for key, val in outputDict.items() if key not in self.modelInstance.solveOutputs)
+        self.solutionCache.store(cacheKey, exactKey, cachedOutput, self.modelInstance.solutionValues())
+    if self.solutionCache is not None:
+      self.solutionCache.record(reused)
+      outputDict['CacheHit'] = 1.0 if reused else 0.0
     # store requested information into container
     for key, val in outputDict.items():
       container.__dict__[key] = np.atleast_1d(val)
@@ -95,8 +95,8 @@ class CVaRMCKP(MCKP):
       @ Out, model, pyomo model instance, pyomo abstract model
     """
     model = MCKP.addAdditionalParams(self, model)
-    model._lambda = pyomo.Param(within=pyomo.UnitInterval, mutable=True)
-    model.alpha = pyomo.Param(within=pyomo.UnitInterval, mutable=True)
+    model._lambda = pyomo.Param(within=pyomo.UnitInterval, mutable=True, initialize=self.modelData('_lambda'))
+    model.alpha = pyomo.Param(within=pyomo.UnitInterval, mutable=True, initialize=self.modelData('alpha'))
     return model
 
   def addVariables(self, model):
@@ -174,3 +174,63 @@ class CVaRMCKP(MCKP):
     treeModel.StageVariables[secondStage].add('cvar')
     treeModel.StageVariables[secondStage].add('expectProfit')
     return treeModel
+
+  def addMatrixFirstStage(self, lp, data):
+    """
+      Add the first stage variables and constraints to the matrix model, i.e. the priority variables 'y' and the
+      value at risk 'u'
+      @ In, lp, matrixUtils.LinearProgram, the mixed integer linear program
+      @ In, data, dict, input data for pyomo model, i.e. self.generateModelInputData()[None]
+      @ Out, firstStage, collections.OrderedDict, {varName: (indices, columns)} of the first stage variables
+    """
+    firstStage = MCKP.addMatrixFirstStage(self, lp, data)
+    firstStage['u'] = ([None], lp.addVariables('u', [None], lower=-np.inf))
+    return firstStage
+
+  def firstStageCostCoefficients(self, data, firstStage):
+    """
+      Get the coefficients of the first stage cost, see self.computeFirstStageCost
+      @ In, data, dict, input data for pyomo model, i.e. self.generateModelInputData()[None]
+      @ In, firstStage, collections.OrderedDict, {varName: (indices, columns)} of the first stage variables
+      @ Out, (columns, coefficients), tuple, the columns and coefficients of the first stage cost
+    """
+    return firstStage['u'][1], np.asarray([-self._lambda])
+
+  def secondStageCostCoefficients(self, params, variables):
+    """
+      Get the coefficients of the second stage cost of one scenario, see self.computeSecondStageCost
+      @ In, params, dict, {paramName: numpy.array}, the parameter arrays of this scenario
+      @ In, variables, collections.OrderedDict, {varName: (indices, columns)} of the second stage variables
+      @ Out, (columns, coefficients), tuple, the columns and coefficients of the second stage cost
+    """
+    columns, npv = self.npvCoefficients(params, variables)
+    columns = np.concatenate([columns, variables['nu'][1]])
+    coeffs = np.concatenate([npv * (1.-self._lambda), [-self._lambda/(1.0-self.alpha)]])
+    return columns, coeffs
+
+  def addMatrixScenario(self, lp, data, params, firstStage, prefix=''):
+    """
+      Add the variables and constraints of one scenario to the matrix model, including the variables and
+      constraints for CVaR optimization
+      @ In, lp, matrixUtils.LinearProgram, the mixed integer linear program
+      @ In, data, dict, input data for pyomo model, i.e. self.generateModelInputData()[None]
+      @ In, params, dict, {paramName: numpy.array}, the parameter arrays of this scenario
+      @ In, firstStage, collections.OrderedDict, {varName: (indices, columns)} of the first stage variables
+      @ In, prefix, str, optional, prefix of the names of the variables and constraints, i.e. the scenario name
+      @ Out, variables, collections.OrderedDict, {varName: (indices, columns)} of the second stage variables
+    """
+    variables = MCKP.addMatrixScenario(self, lp, data, params, firstStage, prefix)
+    # variables for CVaR optimization
+    variables['nu'] = ([None], lp.addVariables(prefix + 'nu', [None]))
+    # variables to retrieve additional information
+    variables['cvar'] = ([None], lp.addVariables(prefix + 'cvar', [None], lower=-np.inf))
+    variables['expectProfit'] = ([None], lp.addVariables(prefix + 'expectProfit', [None], lower=-np.inf))
+    columns, npv = self.npvCoefficients(params, variables)
+    nu, u = variables['nu'][1], firstStage['u'][1]
+    lp.addConstraints(prefix + 'cvarConstraint', [None], np.concatenate([[1.0, 1.0], npv])[None, :],
+                      np.concatenate([nu, u, columns]), lower=0.0)
+    lp.addConstraints(prefix + 'computeExpectProfit', [None], np.concatenate([[1.0], -npv])[None, :],
+                      np.concatenate([variables['expectProfit'][1], columns]), lower=0.0, upper=0.0)
+    lp.addConstraints(prefix + 'computeCVAR', [None], np.asarray([[1.0, -1.0, 1./(1.-self.alpha)]]),
+                      np.concatenate([variables['cvar'][1], u, nu]), lower=0.0, upper=0.0)
+    return variables
@@ -85,7 +85,7 @@ class DROMCKP(MCKP):
       @ Out, model, pyomo model instance, pyomo abstract model
     """
     model = MCKP.addAdditionalSets(self, model)
-    model.sigma = pyomo.Set(ordered=True)
+    model.sigma = pyomo.Set(ordered=True, initialize=self.modelData('sigma'))
     return model
 
   def addAdditionalParams(self, model):
@@ -95,10 +95,10 @@ class DROMCKP(MCKP):
       @ Out, model, pyomo model instance, pyomo abstract model
     """
     model = MCKP.addAdditionalParams(self, model)
-    model.epsilon = pyomo.Param(within=pyomo.NonNegativeReals, mutable=True)
-    model.prob = pyomo.Param(model.sigma, within=pyomo.UnitInterval, mutable=True)
+    model.epsilon = pyomo.Param(within=pyomo.NonNegativeReals, mutable=True, initialize=self.modelData('epsilon'))
+    model.prob = pyomo.Param(model.sigma, within=pyomo.UnitInterval, mutable=True, initialize=self.modelData('prob'))
     # model.dist will be changed on the fly via scenario callback functions
-    model.dist = pyomo.Param(model.sigma, mutable=True)
+    model.dist = pyomo.Param(model.sigma, mutable=True, initialize=self.modelData('dist'))
     return model
 
   def addVariables(self, model):
@@ -153,3 +153,58 @@ class DROMCKP(MCKP):
     treeModel.StageVariables[firstStage].add('gamma')
     treeModel.StageVariables[firstStage].add('nu[*]')
     return treeModel
+
+  def addMatrixFirstStage(self, lp, data):
+    """
+      Add the first stage variables and constraints to the matrix model, i.e. the priority variables 'y' and the
+      variables 'gamma' and 'nu' of the distributionally robust optimization
+      @ In, lp, matrixUtils.LinearProgram, the mixed integer linear program
+      @ In, data, dict, input data for pyomo model, i.e. self.generateModelInputData()[None]
+      @ Out, firstStage, collections.OrderedDict, {varName: (indices, columns)} of the first stage variables
+    """
+    firstStage = MCKP.addMatrixFirstStage(self, lp, data)
+    sigma = data['sigma'][None]
+    firstStage['gamma'] = ([None], lp.addVariables('gamma', [None]))
+    firstStage['nu'] = (sigma, lp.addVariables('nu', sigma))
+    return firstStage
+
+  def firstStageCostCoefficients(self, data, firstStage):
+    """
+      Get the coefficients of the first stage cost, see self.computeFirstStageCost
+      @ In, data, dict, input data for pyomo model, i.e. self.generateModelInputData()[None]
+      @ In, firstStage, collections.OrderedDict, {varName: (indices, columns)} of the first stage variables
+      @ Out, (columns, coefficients), tuple, the columns and coefficients of the first stage cost
+    """
+    sigma, nu = firstStage['nu']
+    columns = np.concatenate([firstStage['gamma'][1], nu])
+    coeffs = np.concatenate([[-self.epsilon], list(data['prob'][s] for s in sigma)])
+    return columns, coeffs
+
+  def secondStageCostCoefficients(self, params, variables):
+    """
+      Get the coefficients of the second stage cost of one scenario, see self.computeSecondStageCost
+      @ In, params, dict, {paramName: numpy.array}, the parameter arrays of this scenario
+      @ In, variables, collections.OrderedDict, {varName: (indices, columns)} of the second stage variables
+      @ Out, (columns, coefficients), tuple, the columns and coefficients of the second stage cost
+    """
+    return np.zeros(0, dtype=int), np.zeros(0)
+
+  def addMatrixScenario(self, lp, data, params, firstStage, prefix=''):
+    """
+      Add the variables and constraints of one scenario to the matrix model, including the Wasserstein distance
+      constraints, where 'dist' is the distance between this scenario and the other scenarios
+      @ In, lp, matrixUtils.LinearProgram, the mixed integer linear program
+      @ In, data, dict, input data for pyomo model, i.e. self.generateModelInputData()[None]
+      @ In, params, dict, {paramName: numpy.array}, the parameter arrays of this scenario
+      @ In, firstStage, collections.OrderedDict, {varName: (indices, columns)} of the first stage variables
+      @ In, prefix, str, optional, prefix of the names of the variables and constraints, i.e. the scenario name
+      @ Out, variables, collections.OrderedDict, {varName: (indices, columns)} of the second stage variables
+    """
+    variables = MCKP.addMatrixScenario(self, lp, data, params, firstStage, prefix)
+    columns, npv = self.npvCoefficients(params, variables)
+    sigma, nu = firstStage['nu']
+    # -gamma * dist[s] + nu[s] - npv * x <= 0
+    coeffs = np.hstack([-params['dist'][:, None], np.identity(len(sigma)), np.tile(-npv, (len(sigma), 1))])
+    lp.addConstraints(prefix + 'constraintWassersteinDistance', sigma, coeffs,
+                      np.concatenate([firstStage['gamma'][1], nu, columns]), upper=0.0)
+    return variables
@@ -10,6 +10,7 @@ import abc
 import copy
 import itertools
 import numpy as np
+import scipy.sparse as sparse
 import logging
 import pandas as pd
 import collections
@@ -21,9 +22,11 @@ import pyomo.environ as pyomo
 try:
   from LOGOS.src.CapitalInvestments.PyomoModels.PySPBase import PySPBase
   from LOGOS.src.CapitalInvestments.investment_utils import investmentUtils as utils
+  from LOGOS.src.CapitalInvestments.investment_utils import matrixUtils
 except ImportError:
   from .PySPBase import PySPBase
   from CapitalInvestments.investment_utils import investmentUtils as utils
+  from CapitalInvestments.investment_utils import matrixUtils
 #Internal Modules End--------------------------------------------------------------------------------
 
 logger = logging.getLogger(__name__)
@@ -41,6 +44,13 @@ class KnapsackBase(PySPBase):
     super().__init__()
     self.mandatory = None # regulatory mandated projects
     self.nonSelection = False   # options DoNothing should be included for each projects if True, otherwise should not be included
+    self.priorityFormulation = 'pairwise' # formulation of the priorities, i.e. 'pairwise' for y[i,j], 'rank' for rank[i]
+    self.priorityPresolve = False # fix the priorities y[i,j] whose orders are implied by the data if True
+    self._ahead = None          # boolean array, _ahead[i,j] is True if investment i is known to be ahead of investment j
+    self.itemAggregation = False # identical investments are collapsed into one integer variable if True
+    self._aggregates = None     # collections.OrderedDict, {representative investment: list of aggregated investments}
+    self._matrixFirstStage = None # (variables, columns, coefficients) of the first stage of the matrix model
+    self._matrixScenarios = None  # list of (scenarioName, probability, variables, columns, coefficients) of the matrix model
 
   def initialize(self, initDict):
     """
@@ -60,6 +70,18 @@ class KnapsackBase(PySPBase):
     indices = list(self.sets['investments'])
     self.lowerBounds = self.setBounds(self.lowerBounds, indices, 'lowerBounds')
     self.upperBounds = self.setBounds(self.upperBounds, indices, 'upperBounds')
+    # the priority variables are only built for the stochastic programs
+    if self.uncertainties is not None and self.priorityFormulation == 'rank' and max(self.upperBounds.values()) > 1:
+      raise IOError('priorityFormulation "rank" requires binary selection of investments, i.e. "upperBounds" <= 1!')
+
+  def instanceReusable(self):
+    """
+      Check if the constructed instance can be reused when only the parameter values are changed, the presolves
+      change the structure of the instance according to the parameter values
+      @ In, None
+      @ Out, instanceReusable, bool, True if the instance can be reused
+    """
+    return super().instanceReusable() and not self.priorityPresolve and not self.itemAggregation
 
   def setBounds(self, bounds, indices, boundName):
     """
@@ -102,6 +124,14 @@ class KnapsackBase(PySPBase):
       self.mandatory = utils.convertNodeTextToList(mandatory)
       if not set(self.mandatory).issubset(self.sets['investments']):
         raise IOError('"mandatory" list should be a subset of "investments"!')
+    self.priorityFormulation = self.settings.pop('priorityFormulation', 'pairwise').strip().lower()
+    if self.priorityFormulation not in ['pairwise', 'rank']:
+      raise IOError('Unrecognized priorityFormulation "{}", valid formulations are "pairwise" and "rank"!'.format(self.priorityFormulation))
+    logger.info('Priority formulation of %s: %s', self.name, self.priorityFormulation)
+    self.priorityPresolve = utils.convertStringToBool(self.settings.pop('priorityPresolve', 'False'))
+    self.itemAggregation = utils.convertStringToBool(self.settings.pop('itemAggregation', 'False'))
+    if self.priorityFormulation == 'rank' and self.optionalConstraints.get('consistentConstraintII', False):
+      raise IOError('"consistentConstraintII" is not supported by priorityFormulation "rank", please use "pairwise"!')
 
   def generateModelInputData(self):
     """
@@ -109,46 +139,147 @@ class KnapsackBase(PySPBase):
       @ In, None
       @ Out, data, dict, input data for pyomo model
     """
-    data = {}
-    # Generate input set data
-    indexName = 'investments'
-    if indexName not in self.sets.keys():
-      raise IOError('Required node ' + indexName + ' is not found in input file, please specify it under node "Sets"!')
-    else:
-      data[indexName] = {None:self.sets[indexName]}
-    indexList = ['time_periods','capitals','options','resources']
-    for indexName in indexList:
-      data[indexName] = self.processInputSets(indexName)
+    names = ['investments', 'time_periods', 'capitals', 'options', 'resources']
     # Generate input regulatory mandated data
     if self.mandatory is not None:
-      data['mandatory'] = {None: self.mandatory}
-
+      names.append('mandatory')
     # set the Parameters with the extended indices
-    for paramName, paramInfo in self.paramsAuxInfo.items():
-      options = paramInfo['options']
-      maxDim = paramInfo['maxDim']
-      if paramName not in self.params.keys():
-        raise IOError('Required node ' + paramName + ' is not found in input file, please specify it under node "Parameters"!')
-      else:
-        data[paramName] = self.setParameters(paramName, options, maxDim, self.params[paramName])
-
+    names.extend(self.paramsAuxInfo.keys())
     ## used for DRO model
     if self.uncertainties is not None and 'DRO' in self.name:
-      # logger.info('Generate additional model inputs for DRO optimization')
-      data['sigma'] = {None:list(self.scenarios['probabilities'].keys())}
-      data['prob'] = copy.copy(self.scenarios['probabilities'])
-      data['epsilon'] = {None:self.epsilon}
-      distData = copy.copy(self.distData[0,:])
-      smIndices = list(self.scenarios['probabilities'].keys())
-      data['dist'] = dict(zip(smIndices,np.ravel(distData)))
+      names.extend(['sigma', 'prob', 'epsilon', 'dist'])
     # used for CVaR model
     if self.uncertainties is not None and 'CVaR' in self.name:
-      # logger.info('Generate additional model inputs for CVaR optimization')
-      data['_lambda'] = {None: self._lambda}
-      data['alpha'] = {None: self.alpha}
+      names.extend(['_lambda', 'alpha'])
+    data = dict((name, self.componentData(name)) for name in names)
+    if self.itemAggregation:
+      self.aggregateItems(data)
     data = {None:data}
     return data
 
+  def componentData(self, name):
+    """
+      Get the input data of given component, the sets and the parameters are taken from the index-to-value maps
+      of self.sets and self.params, and the parameters are only extended when the provided indices are fewer than
+      the indices of the component, see self.setParameters
+      @ In, name, str, name of pyomo component
+      @ Out, data, dict, data of the component, None if the data is not provided
+    """
+    if name == 'investments':
+      if name not in self.sets.keys():
+        raise IOError('Required node ' + name + ' is not found in input file, please specify it under node "Sets"!')
+      return {None:self.sets[name]}
+    elif name in ['time_periods', 'capitals', 'options', 'resources']:
+      return self.processInputSets(name)
+    elif name == 'mandatory':
+      return {None: self.mandatory} if self.mandatory is not None else None
+    elif name in self.paramsAuxInfo:
+      if name not in self.params.keys():
+        raise IOError('Required node ' + name + ' is not found in input file, please specify it under node "Parameters"!')
+      paramInfo = self.paramsAuxInfo[name]
+      return self.setParameters(name, paramInfo['options'], paramInfo['maxDim'], self.params[name])
+    elif self.uncertainties is not None and 'DRO' in self.name and name in ['sigma', 'prob', 'epsilon', 'dist']:
+      smIndices = list(self.scenarios)
+      if name == 'sigma':
+        return {None:smIndices}
+      elif name == 'prob':
+        return dict(zip(smIndices, self.scenarios.probabilities()))
+      elif name == 'epsilon':
+        return {None:self.epsilon}
+      distData = copy.copy(self.distData[0,:])
+      return dict(zip(smIndices,np.ravel(distData)))
+    elif self.uncertainties is not None and 'CVaR' in self.name and name in ['_lambda', 'alpha']:
+      return {None: getattr(self, name)}
+    return None
+
+  def requiresModelData(self):
+    """
+      Check if the full input data is required to construct the instance, i.e. the item aggregation removes the
+      aggregated investments from the sets and the parameters, and the priority presolve compares the data of
+      all investments
+      @ In, None
+      @ Out, requiresModelData, bool, True if the data of the instance is generated by self.generateModelInputData
+    """
+    return super().requiresModelData() or self.itemAggregation or self.priorityPresolve
+
+  def aggregateItems(self, data):
+    """
+      Collapse the identical investments, i.e. investments with the same NPV and costs, into one integer variable
+      whose bounds are the sums of the bounds of the aggregated investments. The first investment of each group
+      represents the group in the model. Only applied to the deterministic problems, and the regulatory mandated
+      investments and the investments with nonzero lower bounds are not aggregated.
+      @ In, data, dict, input data for pyomo model, i.e. self.generateModelInputData()[None], updated in place
+      @ Out, None
+    """
+    self._aggregates = None
+    if self.uncertainties is not None:
+      logger.warning('Item aggregation is skipped, since the priorities of the individual investments are required')
+      return
+    if self.externalConstraints:
+      logger.warning('Item aggregation is skipped, since the investments can be used by the external constraints')
+      return
+    _, _, params = list(self.matrixParameterScenarios(data))[0]
+    arrays = self.dominanceParameters(params)
+    if arrays is None:
+      logger.warning('Item aggregation is not applicable to %s', self.name)
+      return
+    npv, costs = arrays
+    investments = data['investments'][None]
+    mandatory = set(self.mandatory or [])
+    groups = collections.OrderedDict()
+    for pos, i in enumerate(investments):
+      if i in mandatory or self.lowerBounds[i] != 0:
+        continue
+      groups.setdefault((npv[pos],) + tuple(costs[pos]), []).append(i)
+    aggregates = collections.OrderedDict((group[0], group) for group in groups.values() if len(group) > 1)
+    numAggregated = sum(len(group) for group in aggregates.values())
+    logger.info('Item aggregation of %s: %d investments are aggregated into %d items', self.name, numAggregated, len(aggregates))
+    if not aggregates:
+      return
+    removed = set(i for group in aggregates.values() for i in group[1:])
+    data['investments'] = {None: list(i for i in investments if i not in removed)}
+    for paramName in ['net_present_values', 'costs']:
+      data[paramName] = collections.OrderedDict((key, val) for key, val in data[paramName].items()
+                                                if matrixUtils.flattenIndex((key,))[0] not in removed)
+    self._aggregates = aggregates
+
+  def investmentBounds(self, i):
+    """
+      Get the bounds of the decision variable of given investment, i.e. the sums of the bounds of the aggregated
+      investments if the investment represents a group of identical investments
+      @ In, i, str, investment index
+      @ Out, (lower, upper), tuple, the lower and upper bounds
+    """
+    if self._aggregates is not None and i in self._aggregates:
+      group = self._aggregates[i]
+      return sum(self.lowerBounds[j] for j in group), sum(self.upperBounds[j] for j in group)
+    return self.lowerBounds[i], self.upperBounds[i]
+
+  def disaggregateSolution(self, solution):
+    """
+      Distribute the solution of the aggregated items over the identical investments, i.e. each investment is
+      filled up to its upper bound in the input order
+      @ In, solution, dict, {investment: list of numbers of selected items}, i.e. one number per capital
+      @ Out, solution, collections.OrderedDict, {investment: list of numbers of selected items} of all investments
+    """
+    if self._aggregates is None:
+      return solution
+    full = {}
+    for i, counts in solution.items():
+      if i not in self._aggregates:
+        full[i] = counts
+        continue
+      remaining = list(float(round(count)) for count in counts)
+      for j in self._aggregates[i]:
+        capacity = self.upperBounds[j]
+        full[j] = []
+        for pos, count in enumerate(remaining):
+          numSelected = min(count, capacity)
+          full[j].append(numSelected)
+          remaining[pos] -= numSelected
+          capacity -= numSelected
+    return collections.OrderedDict((i, full[i]) for i in self.sets['investments'] if i in full)
+
   def setParameters(self, paramName, options, maxDim, initParamDict):
     """
       Method to generate Parameter input for pyomo model
@@ -205,6 +336,8 @@ class KnapsackBase(PySPBase):
     """
     dim = len(self.sets['investments'])
     ysol = pd.DataFrame(np.zeros((dim,dim)), index=self.sets['investments'], columns=self.sets['investments'])
+    if self.priorityFormulation == 'rank':
+      solutionGenerator = self.rankToPairwise(solutionGenerator)
 
     if 'DRO' in self.name:
       for var, val in solutionGenerator:
@@ -240,6 +373,27 @@ class KnapsackBase(PySPBase):
       msg = 'Investment ' + str(ind).ljust(4) + ' is assigned priority level: ' + str(priorityLevel)
       logger.info(msg)
 
+  def rankToPairwise(self, solutionGenerator):
+    """
+      Convert the ranks of the investments into the pairwise priorities, i.e. y[i,j] = 1 if rank[i] < rank[j], so
+      that the priorities are collected in the same way for both formulations. The ranks are not required to be
+      distinct, and the investments with the same rank are always selected together, so the ties are broken by
+      the input order, i.e. y[i,j] + y[j,i] = 1 for i != j as required by the pairwise formulation
+      @ In, solutionGenerator, Instance, pyomo solution generator
+      @ Out, rankToPairwise, generator, generator of (varName, value) where 'rank[i]' is replaced by 'y[i,j]'
+    """
+    ranks = collections.OrderedDict()
+    for var, val in solutionGenerator:
+      if var.split('[')[0] == 'rank':
+        ranks[self.getSolutionGeneratorIndex(var)[0]] = val
+      else:
+        yield var, val
+    positions = dict((inv, pos) for pos, inv in enumerate(self.sets['investments']))
+    order = dict((i, (round(ri), positions.get(i, len(positions)))) for i, ri in ranks.items())
+    for i in ranks:
+      for j in ranks:
+        yield 'y[{},{}]'.format(i, j), float(order[i] < order[j])
+
   @staticmethod
   def getSolutionGeneratorIndex(var):
     """
@@ -341,17 +495,31 @@ class KnapsackBase(PySPBase):
     else:
       return pyomo.Constraint.Skip
 
+  @staticmethod
+  def rankConsistentConstraint(model, i, selection):
+    """
+      Consistent constraint of the rank formulation, i.e. the selected investments are the ones with ranks not
+      greater than the threshold of the scenario: if selection == 1, rank[i] <= threshold, otherwise
+      rank[i] >= threshold + 1, which are combined as 1 <= rank[i] - threshold + M * selection <= M with M = n + 1
+      @ In, model, instance, pyomo abstract model instance
+      @ In, i, str, investment index
+      @ In, selection, pyomo.expression, the selection of investment i, either 0 or 1
+      @ Out, rankConsistentConstraint, pyomo.expression, consistent constraint
+    """
+    bigM = len(model.investments) + 1
+    return pyomo.inequality(1, model.rank[i] - model.threshold + bigM * selection, bigM)
+
   def initializeModel(self):
     """
       Initialize the pyomo model parameters for Knapsack problem (MCKP)
       @ In, None
       @ Out, model, pyomo model instance, pyomo abstract model
     """
-    model = pyomo.AbstractModel()
-    model.time_periods = pyomo.Set()
-    model.investments = pyomo.Set(ordered=True)
+    model = self.newModel()
+    model.time_periods = pyomo.Set(initialize=self.modelData('time_periods'))
+    model.investments = pyomo.Set(ordered=True, initialize=self.modelData('investments'))
     if self.mandatory is not None:
-      model.mandatory = pyomo.Set()
+      model.mandatory = pyomo.Set(initialize=self.modelData('mandatory'))
     return model
 
   def addObjective(self, model):
@@ -370,7 +538,13 @@ class KnapsackBase(PySPBase):
       @ Out, model, pyomo model instance, pyomo abstract model
     """
     if self.uncertainties is not None:
-      model.y = pyomo.Var(model.investments, model.investments, domain=self.solutionVariableType)
+      if self.priorityFormulation == 'rank':
+        # the rank of each investment, and the rank threshold of the selected investments in each scenario
+        n = len(self.sets['investments'])
+        model.rank = pyomo.Var(model.investments, domain=pyomo.NonNegativeIntegers, bounds=(1, n))
+        model.threshold = pyomo.Var(domain=pyomo.NonNegativeIntegers, bounds=(0, n))
+      else:
+        model.y = pyomo.Var(model.investments, model.investments, domain=self.solutionVariableType)
     return model
 
   def addConstraints(self, model):
@@ -380,7 +554,7 @@ class KnapsackBase(PySPBase):
       @ Out, model, pyomo model instance, pyomo abstract model
     """
     # constraint for scenario analysis
-    if self.uncertainties is not None:
+    if self.uncertainties is not None and self.priorityFormulation == 'pairwise':
       # constraint (1b) and (1h)
       model.orderConstraintI = pyomo.Constraint(model.investments, model.investments, rule=self.orderConstraintI)
       # constraint (1b) extension
@@ -447,10 +621,23 @@ class KnapsackBase(PySPBase):
     firstStage = treeModel.Stages.first()
     # first Stage
     treeModel.StageCost[firstStage] = 'firstStageCost'
-    treeModel.StageVariables[firstStage].add('y[*,*]')
+    if self.priorityFormulation == 'rank':
+      # the auxiliary variable 'threshold' is not declared, and it is treated as the last stage variable
+      treeModel.StageVariables[firstStage].add('rank[*]')
+    else:
+      treeModel.StageVariables[firstStage].add('y[*,*]')
     # second Stage added by specific model
     return treeModel
 
+  def firstStageDecisions(self):
+    """
+      Get the names of the first stage variables that define the candidate solution of sample average
+      approximation, i.e. the priorities 'y' or the ranks 'rank' of the investments
+      @ In, None
+      @ Out, firstStageDecisions, list, names of the first stage decision variables
+    """
+    return ['rank'] if self.priorityFormulation == 'rank' else ['y']
+
   def printSolution(self, model):
     """
       Output optimization solution to screen
@@ -460,6 +647,383 @@ class KnapsackBase(PySPBase):
     outputDict = super().printSolution(model)
     return outputDict
 
+  ## matrix backend
+  def matrixIndexLists(self, data):
+    """
+      Get the index lists of the parameters that are used by the matrix model
+      @ In, data, dict, input data for pyomo model, i.e. self.generateModelInputData()[None]
+      @ Out, indexLists, dict, {paramName: list of index lists}
+    """
+    return {}
+
+  def matrixScenarios(self, params, positions):
+    """
+      Generate the parameter arrays of each scenario, i.e. the arrays of the uncertain parameters are updated with
+      the scenario data
+      @ In, params, dict, {paramName: numpy.array}, the parameter arrays
+      @ In, positions, dict, {paramName: {index: position}}, the positions of the indices in the parameter arrays
+      @ Out, matrixScenarios, generator, generator of (scenarioName, probability, {paramName: numpy.array})
+    """
+    probabilities = self.scenarios.probabilities()
+    scenarioPositions = {}
+    for k, scenarioName in enumerate(self.scenarios):
+      scenarioParams = dict(params)
+      for paramName, indices, val in self.scenarioValues(k):
+        if paramName not in scenarioPositions:
+          if paramName not in params:
+            raise IOError('Uncertain parameter "{}" is not used by "{}"!'.format(paramName, self.name))
+          try:
+            scenarioPositions[paramName] = np.asarray(list(positions[paramName][matrixUtils.flattenIndex(index)] for index in indices), dtype=int)
+          except KeyError as err:
+            raise IOError('Index {} of uncertain parameter "{}" is not defined by the model!'.format(err, paramName))
+        array = params[paramName].copy()
+        array.flat[scenarioPositions[paramName]] = val
+        scenarioParams[paramName] = array
+      ## distance between this scenario and the other scenarios, used by DRO
+      if self.distData is not None:
+        scenarioParams['dist'] = np.ravel(self.distData[k,:])
+      yield scenarioName, probabilities[k], scenarioParams
+
+  def buildLinearProgram(self):
+    """
+      Assemble the knapsack problem in the matrix form, with uncertainties the extensive form of the two stage
+      stochastic programming is assembled, where the first stage variables are shared by all scenarios
+      @ In, None
+      @ Out, lp, matrixUtils.LinearProgram, the mixed integer linear program
+    """
+    if self.externalConstraints:
+      raise IOError('External constraints are not supported by backend "matrix", please use backend "pyomo"!')
+    data = self.generateModelInputData()[None]
+    lp = matrixUtils.LinearProgram(self.name, maximize=self.sense == pyomo.maximize)
+    self._ahead = self.impliedPriorities(data)
+    firstStage = self.addMatrixFirstStage(lp, data)
+    firstCols, firstCoeffs = self.firstStageCostCoefficients(data, firstStage)
+    scenarios = self.matrixParameterScenarios(data)
+    self._matrixScenarios = []
+    totalProb = 0.0
+    for scenarioName, prob, scenarioParams in scenarios:
+      prefix = '' if scenarioName is None else scenarioName + '.'
+      variables = self.addMatrixScenario(lp, data, scenarioParams, firstStage, prefix)
+      cols, coeffs = self.secondStageCostCoefficients(scenarioParams, variables)
+      lp.addObjective(cols, prob * coeffs)
+      totalProb += prob
+      self._matrixScenarios.append((scenarioName, prob, variables, cols, coeffs))
+    lp.addObjective(firstCols, totalProb * firstCoeffs)
+    self._matrixFirstStage = (firstStage, firstCols, firstCoeffs)
+    return lp
+
+  def matrixParameterScenarios(self, data):
+    """
+      Generate the parameter arrays of each scenario that are used by the matrix model
+      @ In, data, dict, input data for pyomo model, i.e. self.generateModelInputData()[None]
+      @ Out, scenarios, list or generator, (scenarioName, probability, {paramName: numpy.array}) of the scenarios,
+        the scenario name is None without uncertainties
+    """
+    indexLists = self.matrixIndexLists(data)
+    positions = dict((paramName, matrixUtils.indexPositions(lists)) for paramName, lists in indexLists.items())
+    params = dict((paramName, matrixUtils.dictToArray(paramName, data[paramName], lists, positions[paramName])) for paramName, lists in indexLists.items())
+    if self.uncertainties is None:
+      return [(None, 1.0, params)]
+    return self.matrixScenarios(params, positions)
+
+  def dominanceParameters(self, params):
+    """
+      Get the NPVs and costs of the investments that are used to identify the dominated investments
+      @ In, params, dict, {paramName: numpy.array}, the parameter arrays of one scenario
+      @ Out, (npv, costs), tuple, numpy.array of NPVs with shape (n,) and numpy.array of costs with shape (n, k),
+        None if the dominance is not applicable
+    """
+    npv = np.ravel(params['net_present_values'])
+    return npv, params['costs'].reshape(len(npv), -1)
+
+  def impliedPriorities(self, data):
+    """
+      Find the pairs of investments whose orders are implied by the data, i.e. the regulatory mandated investments
+      are always selected, so that they are ranked ahead of the others (and in the input order among themselves),
+      and investment i is ranked ahead of investment j if i has no less NPV and no more costs than j in every
+      scenario, since swapping i and j in any priority list will not reduce the objective.
+      @ In, data, dict, input data for pyomo model, i.e. self.generateModelInputData()[None]
+      @ Out, ahead, numpy.array, boolean array with shape (n, n), ahead[i,j] is True if investment i is known to
+        be ahead of investment j, i.e. y[i,j] = 1 and y[j,i] = 0, None if the presolve is not applied
+    """
+    if not self.priorityPresolve or self.uncertainties is None or self.priorityFormulation != 'pairwise':
+      return None
+    if self.optionalConstraints.get('consistentConstraintII', False):
+      logger.warning('Priority presolve is skipped, since the priorities of the options are required by "consistentConstraintII"')
+      return None
+    investments = data['investments'][None]
+    n = len(investments)
+    order = np.arange(n)
+    before = order[:, None] < order[None, :]
+    mandatory = np.zeros(n, dtype=bool)
+    if self.mandatory is not None:
+      mandatory[list(investments.index(i) for i in self.mandatory)] = True
+    ahead = mandatory[:, None] & (~mandatory[None, :] | before)
+    # the exchange argument only holds for the binary selection of the investments
+    binary = max(self.upperBounds.values()) <= 1 and min(self.lowerBounds.values()) == 0
+    dominance = self.dominanceMatrix(data) if binary else None
+    if dominance is not None:
+      # investments with identical data are ordered by the input order
+      strict = dominance & (~dominance.T | before)
+      np.fill_diagonal(strict, False)
+      ahead |= strict & ~mandatory[:, None] & ~mandatory[None, :]
+    logger.info('Priority presolve of %s: %d of %d priority pairs are implied by the data', self.name,
+                int(ahead.sum()), n*(n-1)//2)
+    return ahead
+
+  def dominanceMatrix(self, data):
+    """
+      Compute the dominance between investments over all scenarios
+      @ In, data, dict, input data for pyomo model, i.e. self.generateModelInputData()[None]
+      @ Out, dominance, numpy.array, boolean array with shape (n, n), dominance[i,j] is True if investment i has
+        no less NPV and no more costs than investment j in every scenario, None if not applicable
+    """
+    dominance = None
+    for _, _, params in self.matrixParameterScenarios(data):
+      arrays = self.dominanceParameters(params)
+      if arrays is None:
+        return None
+      npv, costs = arrays
+      dom = (npv[:, None] >= npv[None, :]) & np.all(costs[:, None, :] <= costs[None, :, :], axis=2)
+      dominance = dom if dominance is None else dominance & dom
+    return dominance
+
+  def createInstance(self, data=None):
+    """
+      This method is used to instantiate the pyomo model, the priorities implied by the data are fixed
+      @ In, data, dict, optional, dictionary to initialize pyomo abstract model, see ModelBase.createInstance
+      @ Out, model, pyomo.instance, instance of pyomo model
+    """
+    model = super().createInstance(data)
+    if data is None:
+      # the priority presolve requires the full input data, see self.requiresModelData
+      return model
+    ahead = self.impliedPriorities(data[None])
+    if ahead is not None:
+      self.fixImpliedPriorities(model, data[None]['investments'][None], ahead)
+    return model
+
+  def fixImpliedPriorities(self, model, investments, ahead):
+    """
+      Fix the priority variables whose orders are implied by the data, and deactivate the constraints that are
+      always satisfied
+      @ In, model, pyomo.instance, instance of pyomo model
+      @ In, investments, list, list of investments
+      @ In, ahead, numpy.array, boolean array with shape (n, n), see self.impliedPriorities
+      @ Out, None
+    """
+    known = ahead | ahead.T
+    for a, b in zip(*np.nonzero(ahead)):
+      i, j = investments[a], investments[b]
+      model.y[i,j].fix(1)
+      model.y[j,i].fix(0)
+      for index in [(i,j), (j,i)]:
+        if index in model.orderConstraintI:
+          model.orderConstraintI[index].deactivate()
+      # s[i] + y[j,i] - 1 <= s[j] always holds with y[j,i] = 0
+      if (j,i) in model.consistentConstraintI:
+        model.consistentConstraintI[j,i].deactivate()
+    # s[j] + y[i,j] - 1 <= s[i] always holds for mandated investment i
+    for i in (self.mandatory or []):
+      for j in investments:
+        if (i,j) in model.consistentConstraintI:
+          model.consistentConstraintI[i,j].deactivate()
+    positions = dict((i, pos) for pos, i in enumerate(investments))
+    for (i, ip, idp) in model.constraintNoTie:
+      a, b, c = positions[i], positions[ip], positions[idp]
+      if known[a,b] and known[b,c] and known[c,a]:
+        model.constraintNoTie[i,ip,idp].deactivate()
+
+  def addMatrixFirstStage(self, lp, data):
+    """
+      Add the first stage variables and constraints to the matrix model, i.e. the priority variables 'y' and
+      the constraints (1b), (1h) and (1i), or the ranks of the investments for priorityFormulation 'rank'
+      @ In, lp, matrixUtils.LinearProgram, the mixed integer linear program
+      @ In, data, dict, input data for pyomo model, i.e. self.generateModelInputData()[None]
+      @ Out, firstStage, collections.OrderedDict, {varName: (indices, columns)} of the first stage variables
+    """
+    firstStage = collections.OrderedDict()
+    if self.uncertainties is None:
+      return firstStage
+    investments = data['investments'][None]
+    n = len(investments)
+    if self.priorityFormulation == 'rank':
+      firstStage['rank'] = (investments, lp.addVariables('rank', investments, lower=1.0, upper=float(n), integer=True))
+      return firstStage
+    pairs = list(itertools.product(investments, investments))
+    # constraint (1b) extension, i.e. y[i,i] == 0, is imposed by the bounds
+    upper = np.ones((n, n))
+    np.fill_diagonal(upper, 0.0)
+    lower = np.zeros((n, n))
+    known = np.zeros((n, n), dtype=bool)
+    if self._ahead is not None:
+      # the priorities implied by the data are fixed
+      lower[self._ahead] = 1.0
+      upper[self._ahead.T] = 0.0
+      known = self._ahead | self._ahead.T
+    y = lp.addVariables('y', pairs, lower=lower.ravel(), upper=upper.ravel(), integer=True)
+    firstStage['y'] = (pairs, y)
+    # constraint (1b) and (1h), i.e. y[i,j] + y[j,i] == 1
+    i, j = np.triu_indices(n, 1)
+    i, j = i[~known[i, j]], j[~known[i, j]]
+    rows = np.arange(len(i))
+    coeffs = (np.ones(2*len(i)), (np.tile(rows, 2), np.concatenate([i*n + j, j*n + i])))
+    lp.addConstraints('orderConstraintI', matrixUtils.IndexArray(np.column_stack([i, j]), [investments]*2), coeffs, y,
+                      lower=1.0, upper=1.0, lazy=self.lazyConstraints)
+    # constraint (1i) helps to remove ties, i.e. y[i,ip] + y[ip,idp] + y[idp,i] <= 2, each cycle of three distinct
+    # investments is only added once, where i is the first investment of the cycle
+    triples = []
+    for i in range(n - 2):
+      ip, idp = np.nonzero(~np.eye(n - i - 1, dtype=bool))
+      triples.append(np.column_stack([np.full(len(ip), i), ip + i + 1, idp + i + 1]))
+    triples = np.vstack(triples) if triples else np.zeros((0, 3), dtype=int)
+    undecided = ~(known[triples[:,0], triples[:,1]] & known[triples[:,1], triples[:,2]] & known[triples[:,2], triples[:,0]])
+    triples = triples[undecided]
+    i, ip, idp = triples[:,0], triples[:,1], triples[:,2]
+    rows = np.arange(len(triples))
+    coeffs = (np.ones(3*len(rows)), (np.tile(rows, 3), np.concatenate([i*n + ip, ip*n + idp, idp*n + i])))
+    lp.addConstraints('constraintNoTie', matrixUtils.IndexArray(triples, [investments]*3), coeffs, y, upper=2.0, lazy=self.lazyConstraints)
+    return firstStage
+
+  def addMatrixScenario(self, lp, data, params, firstStage, prefix=''):
+    """
+      Add the variables and constraints of one scenario to the matrix model
+      @ In, lp, matrixUtils.LinearProgram, the mixed integer linear program
+      @ In, data, dict, input data for pyomo model, i.e. self.generateModelInputData()[None]
+      @ In, params, dict, {paramName: numpy.array}, the parameter arrays of this scenario
+      @ In, firstStage, collections.OrderedDict, {varName: (indices, columns)} of the first stage variables
+      @ In, prefix, str, optional, prefix of the names of the variables and constraints, i.e. the scenario name
+      @ Out, variables, collections.OrderedDict, {varName: (indices, columns)} of the second stage variables
+    """
+    variables = collections.OrderedDict()
+    if self.uncertainties is not None and self.priorityFormulation == 'rank':
+      n = len(data['investments'][None])
+      variables['threshold'] = ([None], lp.addVariables(prefix + 'threshold', [None], lower=0.0, upper=float(n), integer=True))
+    return variables
+
+  def addMatrixConsistentConstraint(self, lp, name, selection, x, firstStage, variables):
+    """
+      Add the consistent constraint (1c) to the matrix model, i.e. s[j] + y[i,j] - 1 <= s[i] for i != j, where s is
+      the selection of the investments, i.e. s = selection * x. For priorityFormulation 'rank', the constraint is
+      1 <= rank[i] - threshold + M * s[i] <= M, see self.rankConsistentConstraint
+      @ In, lp, matrixUtils.LinearProgram, the mixed integer linear program
+      @ In, name, str, name of the constraint
+      @ In, selection, scipy.sparse matrix, matrix with shape (len(investments), len(x)) that maps x to the selection
+      @ In, x, numpy.array, the columns of the variables 'x'
+      @ In, firstStage, collections.OrderedDict, {varName: (indices, columns)} of the first stage variables
+      @ In, variables, collections.OrderedDict, {varName: (indices, columns)} of the second stage variables
+      @ Out, rows, numpy.array, the rows of the added constraints
+    """
+    n = selection.shape[0]
+    if self.priorityFormulation == 'rank':
+      investments, rank = firstStage['rank']
+      bigM = n + 1.0
+      coeffs = sparse.hstack([bigM * sparse.csr_matrix(selection), sparse.identity(n), -np.ones((n, 1))])
+      return lp.addConstraints(name, investments, coeffs, np.concatenate([x, rank, variables['threshold'][1]]),
+                               lower=1.0, upper=bigM)
+    indices, columns = firstStage['y']
+    keep = ~np.eye(n, dtype=bool)
+    if self._ahead is not None:
+      # s[i] + y[j,i] - 1 <= s[j] always holds with y[j,i] = 0, and s[j] + y[i,j] - 1 <= s[i] always holds for
+      # mandated investment i
+      keep &= ~self._ahead.T
+      if self.mandatory is not None:
+        keep[list(index[0] in self.mandatory for index in indices[::n]), :] = False
+    i, j = np.nonzero(keep)
+    selection = sparse.csr_matrix(selection)
+    priority = sparse.coo_matrix((np.ones(len(i)), (np.arange(len(i)), i*n + j)), shape=(len(i), n*n))
+    coeffs = sparse.hstack([selection[j] - selection[i], priority])
+    return lp.addConstraints(name, list(indices[k] for k in i*n + j), coeffs, np.concatenate([x, columns]), upper=1.0,
+                             lazy=self.lazyConstraints)
+
+  def npvCoefficients(self, params, variables):
+    """
+      Get the coefficients of the total NPV of one scenario
+      @ In, params, dict, {paramName: numpy.array}, the parameter arrays of this scenario
+      @ In, variables, collections.OrderedDict, {varName: (indices, columns)} of the second stage variables
+      @ Out, (columns, coefficients), tuple, the columns and coefficients of the total NPV
+    """
+    return variables['x'][1], np.ravel(params['net_present_values'])
+
+  def firstStageCostCoefficients(self, data, firstStage):
+    """
+      Get the coefficients of the first stage cost, see self.computeFirstStageCost
+      @ In, data, dict, input data for pyomo model, i.e. self.generateModelInputData()[None]
+      @ In, firstStage, collections.OrderedDict, {varName: (indices, columns)} of the first stage variables
+      @ Out, (columns, coefficients), tuple, the columns and coefficients of the first stage cost
+    """
+    return np.zeros(0, dtype=int), np.zeros(0)
+
+  def secondStageCostCoefficients(self, params, variables):
+    """
+      Get the coefficients of the second stage cost of one scenario, see self.computeSecondStageCost
+      @ In, params, dict, {paramName: numpy.array}, the parameter arrays of this scenario
+      @ In, variables, collections.OrderedDict, {varName: (indices, columns)} of the second stage variables
+      @ Out, (columns, coefficients), tuple, the columns and coefficients of the second stage cost
+    """
+    return self.npvCoefficients(params, variables)
+
+  def matrixFirstStageSolution(self, values):
+    """
+      Get the solution of the first stage variables of the matrix model
+      @ In, values, numpy.array, the values of the variables
+      @ Out, matrixFirstStageSolution, generator, generator of (varName, value), i.e. ('y[1,2]', 1.0)
+    """
+    for varName, (indices, columns) in self._matrixFirstStage[0].items():
+      for index, col in zip(indices, columns):
+        if index is None:
+          yield varName, values[col]
+        else:
+          index = matrixUtils.flattenIndex(index)
+          index = index if isinstance(index, tuple) else (index,)
+          yield varName + '[' + ','.join(str(ind) for ind in index) + ']', values[col]
+
+  def getMatrixScenarioSolution(self, values):
+    """
+      Collect the scenario solutions of the matrix model, in the same format as self.getScenarioSolution
+      @ In, values, numpy.array, the values of the variables
+      @ Out, scenarioOutput, collections.OrderedDict, the scenario solutions
+    """
+    logger.info("Dumping scenario solutions ...")
+    _, firstCols, firstCoeffs = self._matrixFirstStage
+    firstStageCost = float(np.dot(firstCoeffs, values[firstCols]))
+    scenarioOutput = collections.OrderedDict()
+    scenarioNameList = []
+    probabilityWeight = []
+    costList = []
+    # the scenarios are sorted by the names of the leaf nodes of scenario tree
+    for scenarioName, prob, variables, cols, coeffs in sorted(self._matrixScenarios, key=lambda scenario: 'leaf_' + scenario[0]):
+      scenarioNameList.append(scenarioName)
+      probabilityWeight.append(prob)
+      for varName in sorted(variables):
+        if varName == 'threshold':
+          # auxiliary variable of priorityFormulation 'rank', which is not reported
+          continue
+        indices, columns = variables[varName]
+        for index, col in sorted(zip(indices, columns), key=lambda item: item[0] is not None and item[0]):
+          key = varName if index is None else index
+          scenarioOutput.setdefault(key, []).append(float(values[col]))
+      costList.append(firstStageCost + float(np.dot(coeffs, values[cols])))
+    scenarioOutput['ScenarioName'] = scenarioNameList
+    scenarioOutput['ProbabilityWeight'] = probabilityWeight
+    scenarioOutput['MaxNPV'] = costList
+    return scenarioOutput
+
+  def printMatrixSolution(self, lp, values, duals):
+    """
+      Output the optimization solution of the matrix backend to screen
+      @ In, lp, matrixUtils.LinearProgram, the mixed integer linear program
+      @ In, values, numpy.array, the values of the variables
+      @ In, duals, numpy.array, the duals of the constraints
+      @ Out, outputDict, dict, dictionary stores the outputs
+    """
+    outputDict = super().printMatrixSolution(lp, values, duals)
+    if self.uncertainties is not None:
+      self.collectPriorityOutputs(self.matrixFirstStageSolution(values))
+      logger.info("Expecatation of NPV take over scenarios = %16.4f" %(lp.objectiveValue(values)))
+      outputDict.update(self.getMatrixScenarioSolution(values))
+    return outputDict
+
   def writeOutput(self, filename):
     """
       Method used to output the optimization results
@@ -13,7 +13,9 @@ warnings.simplefilter('default',DeprecationWarning)
 
 #External Modules------------------------------------------------------------------------------------
 import numpy as np
+import scipy.sparse as sparse
 import itertools
+import collections
 import logging
 import pyomo.environ as pyomo
 #External Modules End--------------------------------------------------------------------------------
@@ -22,9 +24,13 @@ import pyomo.environ as pyomo
 try:
   from LOGOS.src.CapitalInvestments.PyomoModels.KnapsackBase import KnapsackBase
   from LOGOS.src.CapitalInvestments.PyomoModels.PyomoWrapper import PyomoWrapper
+  from LOGOS.src.CapitalInvestments.investment_utils import investmentUtils as utils
+  from LOGOS.src.CapitalInvestments.investment_utils import matrixUtils
 except ImportError:
   from .KnapsackBase import KnapsackBase
   from .PyomoWrapper import PyomoWrapper
+  from CapitalInvestments.investment_utils import investmentUtils as utils
+  from CapitalInvestments.investment_utils import matrixUtils
 #Internal Modules End--------------------------------------------------------------------------------
 
 logger = logging.getLogger(__name__)
@@ -50,6 +56,8 @@ class MCKP(KnapsackBase):
     self.paramsAuxInfo['costs'] = {'maxDim':3,
       'options': [['options'],['options','resources'],['options','time_periods'],['options','resources','time_periods']]
     }
+    self.optionPresolve = False # remove the options that are dominated by the other options of the same investment if True
+    self._removedOptions = []   # list of (investment, option) that are removed by the option presolve
 
   def initialize(self, initDict):
     """
@@ -66,46 +74,147 @@ class MCKP(KnapsackBase):
     """
     KnapsackBase.initialize(self, initDict)
 
-  def setScenarioData(self):
+  def setSettings(self):
     """
-      Method to setup the scenario data for scenario tree construction
+      Method to process the settings of pyomo solver
       @ In, None
       @ Out, None
     """
-    # uncertainties for multiple parameters
-    logger.info('Initialize Uncertainties for Optimization Instance: %s', self.name)
-    self.scenarios = {}
-    scenarioList = []
-    scenarioNameList = []
-    scenarioProbList = []
-    paramList = []
-    for paramName, scenarioDict in self.uncertainties.items():
-      if paramName == 'available_capitals':
-        options = [[None], ['resources'], ['time_periods'], ['resources','time_periods']]
-        sdKeys = list(self.meta['Parameters'][paramName].keys())
-        print(sdKeys)
-        if len(sdKeys) == self.paramsAuxInfo['available_capitals']['maxDim']:
-          scenarioList.append(list(scenarioDict['scenarios'].values()))
-        elif len(sdKeys) == 1 and sdKeys in options:
-          pos = options.index(sdKeys)
-          dataList = []
-          for scenarioData in scenarioDict['scenarios'].values():
-            indices = [list(scenarioData.keys()), ['None']] if pos == 1 else [['None'], list(scenarioData.keys())]
-            indices = list(itertools.product(*indices))
-            paramDict = dict(zip(indices, list(scenarioData.values())))
-            dataList.append(paramDict)
-          scenarioList.append(dataList)
-        else:
-          raise IOError('Not supported index: ' + ','.join(sdKeys))
+    KnapsackBase.setSettings(self)
+    self.optionPresolve = utils.convertStringToBool(self.settings.pop('optionPresolve', 'False'))
+
+  def instanceReusable(self):
+    """
+      Check if the constructed instance can be reused when only the parameter values are changed
+      @ In, None
+      @ Out, instanceReusable, bool, True if the instance can be reused
+    """
+    return KnapsackBase.instanceReusable(self) and not self.optionPresolve
+
+  def requiresModelData(self):
+    """
+      Check if the full input data is required to construct the instance, i.e. the option presolve removes the
+      dominated options from the sets and the parameters
+      @ In, None
+      @ Out, requiresModelData, bool, True if the data of the instance is generated by self.generateModelInputData
+    """
+    return KnapsackBase.requiresModelData(self) or self.optionPresolve
+
+  def generateModelInputData(self):
+    """
+      This method is used to generate input data for pyomo model, the dominated options are removed if
+      optionPresolve is True
+      @ In, None
+      @ Out, data, dict, input data for pyomo model
+    """
+    data = KnapsackBase.generateModelInputData(self)
+    if self.optionPresolve:
+      self.removeDominatedOptions(data[None])
+    return data
+
+  def removeDominatedOptions(self, data):
+    """
+      Remove the options that are dominated by another option of the same investment, i.e. option a dominates
+      option b if a has no less NPV and no more costs than b for every resource and time period in every scenario.
+      Option b can always be replaced by option a without reducing the objective or changing the selection of
+      the investment. Options with identical data are kept in the input order, and the "non-selection" options
+      are always kept.
+      @ In, data, dict, input data for pyomo model, i.e. self.generateModelInputData()[None], updated in place
+      @ Out, None
+    """
+    self._removedOptions = []
+    if self.externalConstraints:
+      logger.warning('Option presolve is skipped, since the options can be used by the external constraints')
+      return
+    if self.uncertainties is not None and self.optionalConstraints.get('consistentConstraintII', False):
+      logger.warning('Option presolve is skipped, since the orders of the options are required by "consistentConstraintII"')
+      return
+    options = data['options'][None]
+    groups = collections.OrderedDict()
+    for pos, (i, j) in enumerate(options):
+      groups.setdefault(i, []).append(pos)
+    if self.nonSelection:
+      groups = collections.OrderedDict((i, positions[:-1]) for i, positions in groups.items())
+    dominance = dict.fromkeys(groups)
+    for _, _, params in self.matrixParameterScenarios(data):
+      npv = np.ravel(params['net_present_values'])
+      costs = params['costs'].reshape(len(npv), -1)
+      for i, positions in groups.items():
+        npvI, costsI = npv[positions], costs[positions]
+        dom = (npvI[:, None] >= npvI[None, :]) & np.all(costsI[:, None, :] <= costsI[None, :, :], axis=2)
+        dominance[i] = dom if dominance[i] is None else dominance[i] & dom
+    removed = []
+    for i, positions in groups.items():
+      order = np.arange(len(positions))
+      strict = dominance[i] & (~dominance[i].T | (order[:, None] < order[None, :]))
+      np.fill_diagonal(strict, False)
+      removed.extend(positions[b] for b in np.nonzero(strict.any(axis=0))[0])
+    self._removedOptions = list(options[pos] for pos in sorted(removed))
+    logger.info('Option presolve of %s: %d of %d options are removed', self.name, len(removed), len(options))
+    if not removed:
+      return
+    removedSet = set(self._removedOptions)
+    data['options'] = {None: list(option for option in options if option not in removedSet)}
+    for paramName in ['net_present_values', 'costs']:
+      data[paramName] = collections.OrderedDict((key, val) for key, val in data[paramName].items()
+                                                if matrixUtils.flattenIndex(key)[:2] not in removedSet)
+
+  def scenarioValues(self, k):
+    """
+      Get the values of the uncertain parameters of given scenario, the values of the removed options are excluded
+      @ In, k, int, the position of the scenario in the scenario space
+      @ Out, scenarioValues, generator, generator of (paramName, indices, numpy.array of values)
+    """
+    removedSet = set(self._removedOptions)
+    for paramName, indices, val in KnapsackBase.scenarioValues(self, k):
+      if removedSet and paramName in ['net_present_values', 'costs']:
+        keep = np.asarray(list(matrixUtils.flattenIndex(index)[:2] not in removedSet for index in indices), dtype=bool)
+        indices = list(index for index, kept in zip(indices, keep) if kept)
+        val = np.asarray(val)[keep]
+      yield paramName, indices, val
+
+  def addRemovedOptionsOutput(self, outputDict, scenarioOutput=False):
+    """
+      Add the options that are removed by the option presolve to the outputs, i.e. they are never selected, and
+      the number of the removed options, i.e. "RemovedOptions", if the option presolve is enabled
+      @ In, outputDict, dict, dictionary stores the outputs
+      @ In, scenarioOutput, bool, optional, True if the outputs are the scenario solutions
+      @ Out, outputDict, dict, dictionary stores the outputs
+    """
+    numOutputs = len(outputDict['ScenarioName']) if scenarioOutput else 1
+    for (i, j) in self._removedOptions:
+      if scenarioOutput:
+        outputDict[(i,j)] = [0.0] * numOutputs
       else:
-        scenarioList.append(list(scenarioDict['scenarios'].values()))
-      scenarioNameList.append(list(scenarioDict['scenarios'].keys()))
-      scenarioProbList.append(scenarioDict['probabilities'])
-      paramList.append(paramName)
-    self.scenarios['params'] = paramList
-    self.scenarios['scenario_name'] = dict(('scenario_' + str(i), name) for i, name in enumerate(list(itertools.product(*scenarioNameList)), 1))
-    self.scenarios['probabilities'] = dict(('scenario_' + str(i), float(np.product(list(prob)))) for i, prob in enumerate(list(itertools.product(*scenarioProbList)), 1))
-    self.scenarios['scenario_data'] = dict(('scenario_' + str(i), dict(zip(paramList, data))) for i, data in enumerate(list(itertools.product(*scenarioList)), 1))
+        outputDict['__'.join([i,j])] = [0.0]
+    if self.optionPresolve:
+      outputDict['RemovedOptions'] = [float(len(self._removedOptions))] * numOutputs
+    return outputDict
+
+  def processScenarioData(self, paramName, scenarioData):
+    """
+      Method to process the scenario data of given uncertain parameter before it is added to the scenario space
+      @ In, paramName, str, name of the uncertain parameter
+      @ In, scenarioData, list, list of scenario data, i.e. [{setIndex:uncertaintyVal}]
+      @ Out, dataList, list, list of processed scenario data, i.e. [{setIndex:uncertaintyVal}]
+    """
+    if paramName != 'available_capitals':
+      return scenarioData
+    options = [[None], ['resources'], ['time_periods'], ['resources','time_periods']]
+    sdKeys = list(self.meta['Parameters'][paramName].keys())
+    if len(sdKeys) == self.paramsAuxInfo['available_capitals']['maxDim']:
+      return scenarioData
+    elif len(sdKeys) == 1 and sdKeys in options:
+      pos = options.index(sdKeys)
+      dataList = []
+      for paramData in scenarioData:
+        indices = [list(paramData.keys()), ['None']] if pos == 1 else [['None'], list(paramData.keys())]
+        indices = list(itertools.product(*indices))
+        paramDict = dict(zip(indices, list(paramData.values())))
+        dataList.append(paramDict)
+      return dataList
+    else:
+      raise IOError('Not supported index: ' + ','.join(sdKeys))
 
   @staticmethod
   def optionsOutInit(model, option):
@@ -210,6 +319,19 @@ class MCKP(KnapsackBase):
         expr2 = sum(model.x[i,j] for j in model.optionsOut[i]) - model.x[i,lastIndexI]
       return expr1 <= expr2
 
+  def rankConsistentConstraintI(self, model, i):
+    """
+      Constraint for variable rank if priority project selection is required, the "non-selection" option is
+      excluded from the selection of investment i if it is not regulatory mandated
+      @ In, model, instance, pyomo abstract model instance
+      @ In, i, str, investment index
+      @ Out, rankConsistentConstraintI, pyomo.expression, consistent constraint
+    """
+    selection = sum(model.x[i,j] for j in model.optionsOut[i])
+    if self.nonSelection and (self.mandatory is None or i not in self.mandatory):
+      selection = selection - model.x[i,model.optionsOut[i].last()]
+    return self.rankConsistentConstraint(model, i, selection)
+
   @staticmethod
   def consistentConstraintI(model, i, ip):
     """
@@ -308,14 +430,14 @@ class MCKP(KnapsackBase):
       @ Out, model, pyomo model instance, pyomo abstract model
     """
     model = KnapsackBase.initializeModel(self)
-    model.options = pyomo.Set(dimen=2, ordered=True)
-    model.resources = pyomo.Set()
+    model.options = pyomo.Set(dimen=2, ordered=True, initialize=self.modelData('options'))
+    model.resources = pyomo.Set(initialize=self.modelData('resources'))
     model.optionsOut = pyomo.Set(model.investments, initialize=self.optionsOutInit, ordered=True)
     # Set used for constraint (1j)
     model.investmentOption = pyomo.Set(dimen=2, initialize=self.investmentOptionInit, ordered=True)
-    model.net_present_values = pyomo.Param(model.options, mutable=True)
-    model.available_capitals = pyomo.Param(model.resources, model.time_periods, mutable=True)
-    model.costs = pyomo.Param(model.options, model.resources, model.time_periods, mutable=True)
+    model.net_present_values = pyomo.Param(model.options, mutable=True, initialize=self.modelData('net_present_values'))
+    model.available_capitals = pyomo.Param(model.resources, model.time_periods, mutable=True, initialize=self.modelData('available_capitals'))
+    model.costs = pyomo.Param(model.options, model.resources, model.time_periods, mutable=True, initialize=self.modelData('costs'))
     return model
 
   def addConstraints(self, model):
@@ -340,7 +462,10 @@ class MCKP(KnapsackBase):
     else:
       model.constraintX = pyomo.Constraint(model.investments, rule=self.constraintX)
     # constraint for scenario analysis
-    if self.uncertainties is not None:
+    if self.uncertainties is not None and self.priorityFormulation == 'rank':
+      # constraint (1c) --> optional, constraint (1j) is not available for the rank formulation
+      model.consistentConstraintI = pyomo.Constraint(model.investments, rule=self.rankConsistentConstraintI)
+    elif self.uncertainties is not None:
       if self.nonSelection:
         # constraint (1c) --> optional
         model.consistentConstraintI = pyomo.Constraint(model.investments, model.investments, rule=self.consistentConstraintINonSelection)
@@ -440,13 +565,15 @@ class MCKP(KnapsackBase):
         if numSelected == 1:
           msg = "Investment: " + str(item) + " with option: " + str(opt) + " is selected!"
           logger.info(msg)
+    self.addRemovedOptionsOutput(outputDict)
     outputDict['MaxNPV'] = model.obj()
     logger.info("Maximum NPV: %16.4f" %(outputDict['MaxNPV']))
     # Accessing Duals
     # In some cases, a solver plugin will raise an exception if it encounters a Suffix type that it does not handle
     # One should be careful in verifying that Suffix declarations are being handled as expected when switching
     # to a different solver or solver interface.
-    if self.solver == 'cbc':
+    # the duals are not available if the solution is reused without solving
+    if self.solver == 'cbc' and self.dualsAvailable:
       logger.info("Duals Information for Constraint Capacity:")
       print("Resources|Time_Periods      Capacity_Margin")
       for const in model.component_objects(pyomo.Constraint, active=True):
@@ -454,3 +581,158 @@ class MCKP(KnapsackBase):
           for index in const:
             print("{0:20s} {1:10.1f}".format(str(index), model.dual[const[index]]))
     return outputDict
+
+  def getScenarioSolution(self, ts):
+    """
+      Output optimization solution to csv file
+      @ In, ts, instance, scenario tree structure intance
+      @ Out, scenarioOutput, collections.OrderedDict, the scenario solutions
+    """
+    scenarioOutput = KnapsackBase.getScenarioSolution(self, ts)
+    return self.addRemovedOptionsOutput(scenarioOutput, scenarioOutput=True)
+
+  def getMatrixScenarioSolution(self, values):
+    """
+      Collect the scenario solutions of the matrix model, in the same format as self.getScenarioSolution
+      @ In, values, numpy.array, the values of the variables
+      @ Out, scenarioOutput, collections.OrderedDict, the scenario solutions
+    """
+    scenarioOutput = KnapsackBase.getMatrixScenarioSolution(self, values)
+    return self.addRemovedOptionsOutput(scenarioOutput, scenarioOutput=True)
+
+  def matrixIndexLists(self, data):
+    """
+      Get the index lists of the parameters that are used by the matrix model
+      @ In, data, dict, input data for pyomo model, i.e. self.generateModelInputData()[None]
+      @ Out, indexLists, dict, {paramName: list of index lists}
+    """
+    indexLists = KnapsackBase.matrixIndexLists(self, data)
+    options, resources, timePeriods = data['options'][None], data['resources'][None], data['time_periods'][None]
+    indexLists['net_present_values'] = [options]
+    indexLists['available_capitals'] = [resources, timePeriods]
+    indexLists['costs'] = [options, resources, timePeriods]
+    return indexLists
+
+  def dominanceParameters(self, params):
+    """
+      Get the NPVs and costs of the investments that are used to identify the dominated investments, which is not
+      applicable to MCKP, since the NPVs and costs are defined on the options of the investments
+      @ In, params, dict, {paramName: numpy.array}, the parameter arrays of one scenario
+      @ Out, dominanceParameters, None, the dominance is not applicable
+    """
+    return None
+
+  def matrixSelection(self, investments, optionsOut, nonSelection=False):
+    """
+      Get the matrix that maps the variables 'x' to the selection of the investments, i.e. the sum of x[i,j] over
+      the options of each investment
+      @ In, investments, list, list of investments
+      @ In, optionsOut, dict, {investment: list of positions of its options in the variables 'x'}
+      @ In, nonSelection, bool, optional, the last option (i.e. "non-selection" option) is excluded from the selection
+        of the investments that are not regulatory mandated if True
+      @ Out, selection, scipy.sparse.csr_matrix, matrix with shape (len(investments), len(x))
+    """
+    rows, cols = [], []
+    for k, i in enumerate(investments):
+      positions = optionsOut[i]
+      if nonSelection and (self.mandatory is None or i not in self.mandatory):
+        positions = positions[:-1]
+      rows.extend([k] * len(positions))
+      cols.extend(positions)
+    numOptions = sum(len(positions) for positions in optionsOut.values())
+    return sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(investments), numOptions))
+
+  def addMatrixScenario(self, lp, data, params, firstStage, prefix=''):
+    """
+      Add the variables and constraints of one scenario to the matrix model
+      @ In, lp, matrixUtils.LinearProgram, the mixed integer linear program
+      @ In, data, dict, input data for pyomo model, i.e. self.generateModelInputData()[None]
+      @ In, params, dict, {paramName: numpy.array}, the parameter arrays of this scenario
+      @ In, firstStage, collections.OrderedDict, {varName: (indices, columns)} of the first stage variables
+      @ In, prefix, str, optional, prefix of the names of the variables and constraints, i.e. the scenario name
+      @ Out, variables, collections.OrderedDict, {varName: (indices, columns)} of the second stage variables
+    """
+    variables = KnapsackBase.addMatrixScenario(self, lp, data, params, firstStage, prefix)
+    investments, options = data['investments'][None], data['options'][None]
+    resources, timePeriods = data['resources'][None], data['time_periods'][None]
+    optionsOut = collections.OrderedDict((i, []) for i in investments)
+    for pos, (i, j) in enumerate(options):
+      optionsOut[i].append(pos)
+    x = lp.addVariables(prefix + 'x', options, lower=0.0, upper=1.0, integer=True)
+    variables['x'] = (options, x)
+    # constraint (1d)
+    costs = params['costs'].reshape(len(options), len(resources)*len(timePeriods))
+    lp.addConstraints(prefix + 'constraintCapacity', list(itertools.product(resources, timePeriods)), costs.T, x,
+                      upper=params['available_capitals'].ravel())
+    # constraint (1e) and (1f)
+    selection = self.matrixSelection(investments, optionsOut)
+    if self.mandatory is not None:
+      positions = dict((i, pos) for pos, i in enumerate(investments))
+      mandatory = list(positions[i] for i in self.mandatory)
+      lp.addConstraints(prefix + 'constraintRegulatory', self.mandatory, selection[mandatory], x, lower=1.0, upper=1.0)
+    lp.addConstraints(prefix + 'constraintX', investments, selection, x, lower=1.0 if self.nonSelection else -np.inf, upper=1.0)
+    if self.uncertainties is None:
+      return variables
+    # constraint (1c)
+    if self.optionalConstraints['consistentConstraintI']:
+      self.addMatrixConsistentConstraint(lp, prefix + 'consistentConstraintI',
+                                         self.matrixSelection(investments, optionsOut, self.nonSelection), x, firstStage, variables)
+    # constraint (1j), i.e. x[ip,j] + y[i,ip] - 1 <= sum(x[i,jp] for jp in optionsOut[i] up to j)
+    if self.optionalConstraints['consistentConstraintII']:
+      n = len(investments)
+      indices, rows, cols, vals = [], [], [], []
+      for a, i in enumerate(investments):
+        names = list(options[pos][1] for pos in optionsOut[i])
+        for b, ip in enumerate(investments):
+          if a == b:
+            continue
+          positions = optionsOut[ip]
+          if self.nonSelection and (self.mandatory is None or ip not in self.mandatory):
+            positions = positions[:-1]
+          for pos in positions:
+            j = options[pos][1]
+            # we assume options are in order and their priority are also in order, i.e. from high to low
+            higher = optionsOut[i][:names.index(j) + 1] if j in names else optionsOut[i]
+            rows.extend([len(indices)] * (len(higher) + 2))
+            cols.extend([pos, len(options) + a*n + b])
+            cols.extend(higher)
+            vals.extend([1.0, 1.0])
+            vals.extend([-1.0] * len(higher))
+            indices.append((i, ip, j))
+      lp.addConstraints(prefix + 'consistentConstraintII', indices, (np.asarray(vals), (np.asarray(rows, dtype=int), np.asarray(cols, dtype=int))),
+                        np.concatenate([x, firstStage['y'][1]]), upper=1.0, lazy=self.lazyConstraints)
+    return variables
+
+  def printMatrixSolution(self, lp, values, duals):
+    """
+      Output the optimization solution of the matrix backend to screen
+      @ In, lp, matrixUtils.LinearProgram, the mixed integer linear program
+      @ In, values, numpy.array, the values of the variables
+      @ In, duals, numpy.array, the duals of the constraints
+      @ Out, outputDict, dict, dictionary stores the outputs
+    """
+    outputDict = KnapsackBase.printMatrixSolution(self, lp, values, duals)
+    if self.uncertainties is not None:
+      return outputDict
+    msg = "Selected investments include:"
+    logger.info(msg)
+    _, _, variables, _, _ = self._matrixScenarios[0]
+    solution = dict(zip(variables['x'][0], values[variables['x'][1]]))
+    for item in self.sets['investments']:
+      for (i, opt), numSelected in solution.items():
+        if i != item:
+          continue
+        outputName = '__'.join([item,opt])
+        outputDict[outputName] = [numSelected]
+        if numSelected == 1:
+          msg = "Investment: " + str(item) + " with option: " + str(opt) + " is selected!"
+          logger.info(msg)
+    self.addRemovedOptionsOutput(outputDict)
+    outputDict['MaxNPV'] = lp.objectiveValue(values)
+    logger.info("Maximum NPV: %16.4f" %(outputDict['MaxNPV']))
+    if self.solver in ['cbc', 'highs_inprocess']:
+      logger.info("Duals Information for Constraint Capacity:")
+      print("Resources|Time_Periods      Capacity_Margin")
+      for index, row in zip(*lp.constraintBlock('constraintCapacity')):
+        print("{0:20s} {1:10.1f}".format(str(index), duals[row]))
+    return outputDict
@@ -9,16 +9,25 @@
 import abc
 import logging
 import copy
+import os
+import tempfile
+import time
+import numpy as np
 import pyomo.environ as pyomo
 from pyomo.opt import SolverFactory, TerminationCondition
+from pyomo.version import version_info as pyomoVersion
+from pyomo.repn import generate_standard_repn
+from pyomo.core.expr.current import identify_mutable_parameters
 #External Modules End--------------------------------------------------------------------------------
 
 #Internal Modules------------------------------------------------------------------------------------
 try:
   from LOGOS.src.CapitalInvestments.investment_utils import investmentUtils as utils
+  from LOGOS.src.CapitalInvestments.investment_utils import matrixUtils
   from LOGOS.src.CapitalInvestments.PyomoModels.PyomoWrapper import PyomoWrapper
 except ImportError:
   from CapitalInvestments.investment_utils import investmentUtils as utils
+  from CapitalInvestments.investment_utils import matrixUtils
   from .PyomoWrapper import PyomoWrapper
 #Internal Modules End--------------------------------------------------------------------------------
 
@@ -32,6 +41,9 @@ class ModelBase:
   """
     Base class for methods used to solving optimization problem
   """
+  # outputs that describe how the solution of a run is obtained, which are not part of the solution
+  solveOutputs = ('WarmStarted', 'CutoffApplied', 'CutoffMethod', 'StabilityReused', 'StabilityReuseRate', 'StabilityMethod')
+
   def __init__(self):
     """
       Constructor
@@ -59,6 +71,23 @@ class ModelBase:
     self.externalConstModules = {} # Store the loaded module of user provided constraints
     self.workingDir = None # working directory
     self.executable = None      # specify the path to the solver
+    self.concreteModel = True   # construct pyomo ConcreteModel directly from the input data if True, otherwise AbstractModel
+    self._modelData = None      # input data of the ConcreteModel that is being constructed
+    self.backend = 'pyomo'      # model backend, i.e. 'pyomo' for pyomo model, 'matrix' for the sparse matrix form
+    self.modelFile = None       # file that the matrix model is written to, i.e. model.lp or model.mps
+    self.lazyConstraints = False # add the priority and consistent constraints of the matrix model only when they are violated
+    self._instance = None       # constructed pyomo instance, kept across runs and updated when only the parameter values change
+    self._structure = None      # input data except the parameter values, which defines the structure of the instance
+    self.warmStart = False      # pass the last incumbent to the solver as the MIP start if True
+    self.objectiveCutoff = False # bound the objective by the value of the last incumbent on the new data if True
+    self._incumbent = None      # values of the variables of the last solution, {varName:{index:value}}
+    self.stabilityReuse = False # reuse the last solution without solving if it is certified to be still optimal
+    self._stability = None      # objective coefficients, values and bounds of the variables of the last solution
+    self._changedParams = None  # parameters that are changed by the last update of the instance
+    self._constraintParams = None # names of the mutable parameters used by the constraints of the instance
+    self._numRuns = 0           # number of runs
+    self._numReused = 0         # number of runs that reuse the last solution
+    self.dualsAvailable = True  # False if the solution of the instance is not loaded from the solver, i.e. no duals
 
   def initialize(self, initDict):
     """
@@ -73,6 +102,12 @@ class ModelBase:
         }
       @ Out, None
     """
+    self._structure = self.structureData(initDict)
+    # the settings are consumed by self.setSettings
+    self._structure['Settings'] = copy.deepcopy(self._structure.get('Settings', None))
+    self._instance = None
+    self._stability = None
+    self._changedParams = None
     self.settings = initDict.pop('Settings', None)
     self.sets = initDict.pop('Sets', None)
     self.params = initDict.pop('Parameters', None)
@@ -81,6 +116,69 @@ class ModelBase:
     if self.settings is not None:
       self.setSettings()
 
+  @staticmethod
+  def structureData(initDict):
+    """
+      Get the input data that defines the structure of the model, i.e. everything but the parameter values
+      @ In, initDict, dict, dictionary of preprocessed input data, see self.initialize
+      @ Out, structure, dict, the input data that defines the structure of the model
+    """
+    structure = dict((key, val) for key, val in initDict.items() if key != 'Parameters')
+    structure['Parameters'] = sorted(initDict.get('Parameters', None) or {})
+    return structure
+
+  def update(self, initDict):
+    """
+      Method to update the model with a new input, i.e. a new sample of RAVEN. If the new input only changes the
+      values of the parameters, the constructed instance is kept and the changed parameters are pushed into it
+      with store_values, otherwise the model is initialized again and the instance is rebuilt by the next run
+      @ In, initDict, dict, dictionary of preprocessed input data, see self.initialize
+      @ Out, None
+    """
+    instance = self.reusableInstance()
+    if instance is None or not self.instanceReusable() or not utils.isSameData(self.structureData(initDict), self._structure):
+      self.initialize(initDict)
+      return
+    params = initDict['Parameters']
+    changed = list(paramName for paramName, val in params.items() if not utils.isSameData(val, self.params[paramName]))
+    for paramName in changed:
+      component = instance.component(paramName)
+      if not isinstance(component, pyomo.Param) or not component.mutable:
+        # the parameter is not a mutable parameter of the instance, i.e. it is only used to build the model
+        logger.info('Parameter "%s" can not be updated in the instance of %s, rebuild the instance', paramName, self.name)
+        self.initialize(initDict)
+        return
+    for paramName in changed:
+      self.params[paramName] = params[paramName]
+    self._changedParams = changed
+    for paramName in changed:
+      # only the changed parameters are converted
+      data = self.componentData(paramName)
+      component = instance.component(paramName)
+      if component.is_indexed():
+        component.store_values(data)
+      else:
+        component.value = data[None] if isinstance(data, dict) else data
+    logger.info('Reuse the instance of %s, %d changed parameters are updated: %s', self.name, len(changed), ', '.join(changed))
+
+  def reusableInstance(self):
+    """
+      Get the constructed pyomo instance that is reused by the next run
+      @ In, None
+      @ Out, instance, pyomo.instance, instance of pyomo model, None if it is not constructed
+    """
+    return self._instance
+
+  def instanceReusable(self):
+    """
+      Check if the constructed instance can be reused when only the parameter values are changed, i.e. the
+      structure of the instance does not depend on the parameter values
+      @ In, None
+      @ Out, instanceReusable, bool, True if the instance can be reused
+    """
+    # the external constraints can modify the parameters and build the constraints from the parameter values
+    return self.backend == 'pyomo' and not self.externalConstraints
+
   def setSettings(self):
     """
       Method to process the settings of pyomo solver
@@ -92,6 +190,25 @@ class ModelBase:
     self.solver = self.settings.pop('solver', 'cbc')
     self.workingDir = self.settings.pop('workingDir')
     self.tee = self.settings.pop('tee',False)
+    self.concreteModel = utils.convertStringToBool(self.settings.pop('concreteModel', 'True'))
+    self.backend = self.settings.pop('backend', 'pyomo').strip().lower()
+    if self.backend not in ['pyomo', 'matrix']:
+      raise IOError('Unrecognized backend "{}", valid backends are "pyomo" and "matrix"!'.format(self.backend))
+    if self.solver == 'highs_inprocess' and self.backend != 'matrix':
+      # the in-process solver works on the matrix form of the problem
+      logger.info('Solver "highs_inprocess" is used, switch to backend "matrix"')
+      self.backend = 'matrix'
+    self.modelFile = self.settings.pop('modelFile', None)
+    self.lazyConstraints = utils.convertStringToBool(self.settings.pop('lazyConstraints', 'False'))
+    if self.lazyConstraints and self.backend != 'matrix':
+      raise IOError('"lazyConstraints" is only supported by backend "matrix"!')
+    self.warmStart = utils.convertStringToBool(self.settings.pop('warmStart', 'False'))
+    self.objectiveCutoff = utils.convertStringToBool(self.settings.pop('objectiveCutoff', 'False'))
+    if (self.warmStart or self.objectiveCutoff) and self.backend != 'pyomo':
+      logger.warning('"warmStart" and "objectiveCutoff" are only supported by backend "pyomo", and will be ignored!')
+    self.stabilityReuse = utils.convertStringToBool(self.settings.pop('stabilityReuse', 'False'))
+    if self.stabilityReuse and self.backend != 'pyomo':
+      logger.warning('"stabilityReuse" is only supported by backend "pyomo", and will be ignored!')
     lowerBounds, upperBounds = self.settings.pop('lowerBounds', None), self.settings.pop('upperBounds', None)
     if lowerBounds is not None:
       self.lowerBounds = utils.convertNodeTextToFloatList(lowerBounds)
@@ -113,6 +230,35 @@ class ModelBase:
     """
     pass
 
+  def componentData(self, name):
+    """
+      Get the input data of given component in the format of self.generateModelInputData, i.e. {None:[setValues]}
+      for Set and {index:paramVal} for Param
+      @ In, name, str, name of pyomo component
+      @ Out, data, dict, data of the component, None if the data is not provided
+    """
+    return self.generateModelInputData()[None].get(name, None)
+
+  def requiresModelData(self):
+    """
+      Check if the full input data is required to construct the instance, i.e. the presolves that use or rewrite
+      the data of several components at the same time
+      @ In, None
+      @ Out, requiresModelData, bool, True if the data of the instance is generated by self.generateModelInputData
+    """
+    return False
+
+  def instanceData(self):
+    """
+      Get the input data that is used to construct the instance, see self.createInstance
+      @ In, None
+      @ Out, data, dict, input data for pyomo model, None if the data of each component of ConcreteModel is
+        converted when the component is constructed, see self.modelData
+    """
+    if self.concreteModel and not self.requiresModelData():
+      return None
+    return self.generateModelInputData()
+
   def processInputSets(self, indexName, required = False):
     """
       Method to generate Set input for pyomo model
@@ -127,11 +273,37 @@ class ModelBase:
     else:
       return {None:self.sets[indexName]}
 
+  def newModel(self):
+    """
+      Create an empty pyomo model, the components added to a ConcreteModel are constructed immediately with
+      the data returned by self.modelData
+      @ In, None
+      @ Out, model, pyomo.ConcreteModel or pyomo.AbstractModel, empty pyomo model
+    """
+    return pyomo.ConcreteModel() if self.concreteModel else pyomo.AbstractModel()
+
+  def modelData(self, name):
+    """
+      Get the input data of given component, which is used to initialize the component of ConcreteModel, the
+      data is converted by self.componentData when the component is constructed
+      @ In, name, str, name of pyomo component
+      @ Out, data, object, data of the component, i.e. list for Set, dict for indexed Param, float for scalar Param,
+        None if the model is not constructed as ConcreteModel or the data is not provided
+    """
+    if self._modelData is None:
+      return None
+    if name not in self._modelData:
+      self._modelData[name] = self.componentData(name)
+    data = self._modelData[name]
+    if isinstance(data, dict) and len(data) == 1 and None in data:
+      data = data[None]
+    return data
+
   def createModel(self):
     """
       This method is used to create pyomo model.
       @ In, None
-      @ Out, model, pyomo.AbstractModel, abstract pyomo model
+      @ Out, model, pyomo.AbstractModel or pyomo.ConcreteModel, pyomo model
     """
     model = self.initializeModel()
     model = self.addAdditionalSets(model)
@@ -263,15 +435,25 @@ class ModelBase:
           pyomoWrapper.addConstraintSet(constrKey, externalConstraint[0], externalConstraint[1:])
     return model
 
-  def createInstance(self, data):
+  def createInstance(self, data=None):
     """
       This method is used to instantiate the pyomo model
-      @ In, data, dict, dictionary to initialize pyomo abstract model
+      @ In, data, dict, optional, dictionary to initialize pyomo abstract model, see self.instanceData. If it is
+        not provided, the data of each component of ConcreteModel is converted from self.sets and self.params when
+        the component is constructed, and it is generated by self.generateModelInputData for AbstractModel
       @ Out, model, pyomo.instance, instance of pyomo model
     """
-    model = self.createModel()
+    if self.concreteModel:
+      # the components are constructed when they are added to the model, without create_instance
+      self._modelData = dict(data[None]) if data is not None else {}
+      try:
+        model = self.createModel()
+      finally:
+        self._modelData = None
+    else:
+      model = self.createModel()
     if not model.is_constructed():
-      model = model.create_instance(data)
+      model = model.create_instance(data if data is not None else self.generateModelInputData())
       # model.pprint()
     if self.externalConstraints:
       model = self.addExternalConstraints(model)
@@ -284,22 +466,492 @@ class ModelBase:
       @ In, None
       @ Out, None
     """
+    if self.backend == 'matrix':
+      return self.runMatrix()
     outputDict = {}
-    inputData = self.generateModelInputData()
+    model = self.constructInstance()
+    self._numRuns += 1
+    if self.stableSolution(model):
+      self._numReused += 1
+      logger.info('Solution of %s is reused without solving, certified by coefficient monotonicity, %d of %d runs are reused',
+                  self.name, self._numReused, self._numRuns)
+      self.dualsAvailable = False
+      outputDict.update(self.printSolution(model))
+      outputDict.update(self.stabilityOutputs('monotonicity'))
+      outputDict.update(self.incumbentOutputs(False, 'none'))
+      self.output.update(outputDict)
+      return outputDict
+    feasible = self.loadIncumbent(model)
     # specifying the path to a solver
     # with SolverFactory(self.solver, executable=self.executable) as opt:
     with SolverFactory(self.solver) as opt:
       opt.options.update(self.sopts) # add solver options
-      model = self.createInstance(inputData)
-      results = opt.solve(model, load_solutions=False, tee=self.tee, **{'use_signal_handling':False})
+      solveOptions = {'use_signal_handling':False}
+      warmStarted = False
+      if self.warmStart and self._incumbent is not None:
+        if opt.warm_start_capable():
+          solveOptions['warmstart'] = True
+          warmStarted = True
+        else:
+          logger.info('Solver "%s" does not accept the MIP start, solve %s from scratch', self.solver, self.name)
+      cutoffMethod = 'none'
+      if self.objectiveCutoff and feasible:
+        cutoffMethod = self.addObjectiveCutoff(model, opt)
+      try:
+        results = opt.solve(model, load_solutions=False, tee=self.tee, **solveOptions)
+      finally:
+        if model.component('objectiveCutoff') is not None:
+          model.del_component('objectiveCutoff')
       if results.solver.termination_condition != TerminationCondition.optimal:
         raise RuntimeError("Solver did not report optimality:\n%s" %(results.solver))
       model.solutions.load_from(results)
+      self.dualsAvailable = True
+      self.storeIncumbent(model)
+      self.storeStability(model)
       outputDict.update(self.printSolution(model))
+      outputDict.update(self.stabilityOutputs('solver'))
+      outputDict.update(self.incumbentOutputs(warmStarted, cutoffMethod))
       self.output.update(outputDict)
       # TODO: Add collect output and return a dictionary for raven to retrieve information
     return outputDict
 
+  def constructInstance(self):
+    """
+      Get the pyomo instance of the current input, the instance is constructed if it is not constructed yet
+      @ In, None
+      @ Out, instance, pyomo.instance, instance of pyomo model
+    """
+    if self._instance is None:
+      self._instance = self.createInstance(self.instanceData())
+      self._constraintParams = None
+    return self._instance
+
+  def solutionValues(self):
+    """
+      Get the values of the variables of the last solution, which can be evaluated on other inputs with
+      self.evaluateSolution
+      @ In, None
+      @ Out, solution, dict, {varName:{index:value}}, None if the solution is not available
+    """
+    if self.backend != 'pyomo' or self._instance is None:
+      return None
+    return self.variableValues(self._instance)
+
+  @staticmethod
+  def variableValues(model):
+    """
+      Get the values of the variables of the model
+      @ In, model, pyomo.instance, instance of pyomo model
+      @ Out, values, dict, {varName:{index:value}}
+    """
+    values = {}
+    for var in model.component_objects(pyomo.Var, active=True):
+      values[var.name] = dict((index, var[index].value) for index in var)
+    return values
+
+  def evaluateSolution(self, solution):
+    """
+      Evaluate the given solution on the current input, i.e. the solution is loaded into the instance, and the
+      outputs are computed if the solution is feasible for the current input
+      @ In, solution, dict, {varName:{index:value}}, the values of the variables, see self.solutionValues
+      @ Out, outputDict, dict, dictionary stores the outputs, None if the solution can not be evaluated or it is
+        not feasible for the current input
+    """
+    if solution is None or self.backend != 'pyomo':
+      return None
+    model = self.constructInstance()
+    if not self.loadSolution(model, solution):
+      return None
+    if not self.incumbentFeasible(model):
+      logger.info('Given solution is not feasible for the input of %s', self.name)
+      return None
+    self.dualsAvailable = False
+    outputDict = self.printSolution(model)
+    self.output.update(outputDict)
+    return outputDict
+
+  @staticmethod
+  def loadSolution(model, solution):
+    """
+      Load the given solution into the variables of the model
+      @ In, model, pyomo.instance, instance of pyomo model
+      @ In, solution, dict, {varName:{index:value}}, the values of the variables, see self.solutionValues
+      @ Out, loaded, bool, True if the solution is loaded, False if it does not provide all the variables
+    """
+    for var in model.component_objects(pyomo.Var, active=True):
+      values = solution.get(var.name, {})
+      if any(index not in values for index in var):
+        return False
+      for index in var:
+        if not var[index].fixed:
+          ModelBase.setVariableValue(var[index], values[index])
+    return True
+
+  def adoptCachedSolution(self, solution, exact):
+    """
+      Adopt the cached solution as the solution of the current input, which is not solved: the solution becomes
+      the last incumbent, and the baseline of the solution reuse if it is the solution of the exact same problem,
+      otherwise the baseline is discarded since the solution is not certified to be optimal for the current input
+      @ In, solution, dict, {varName:{index:value}}, the values of the variables, see self.solutionValues,
+        None if the values are not cached
+      @ In, exact, bool, True if the cached solution is the solution of the exact same problem
+      @ Out, outputDict, dict, the outputs of the run that is neither solved nor reused by the solution reuse,
+        see self.incumbentOutputs and self.stabilityOutputs
+    """
+    if self.backend != 'pyomo':
+      return {}
+    self._numRuns += 1
+    self._stability = None
+    if solution is not None and (self.warmStart or self.objectiveCutoff or self.stabilityReuse):
+      model = self.constructInstance()
+      if self.loadSolution(model, solution):
+        self.dualsAvailable = False
+        self.storeIncumbent(model)
+        if exact:
+          self.storeStability(model)
+          # the parameters are changed with respect to the new baseline only by the next update
+          self._changedParams = []
+    outputDict = {}
+    outputDict.update(self.stabilityOutputs('cache'))
+    outputDict.update(self.incumbentOutputs(False, 'none'))
+    return outputDict
+
+  @staticmethod
+  def setVariableValue(var, value):
+    """
+      Set the value of the variable without checking its domain and bounds, i.e. the values from the solver can be
+      slightly out of the bounds. The keyword is "valid" before pyomo 6, and "skip_validation" since pyomo 6
+      @ In, var, pyomo.Var, the variable data, i.e. one index of the variable
+      @ In, value, float, the value of the variable
+      @ Out, None
+    """
+    if pyomoVersion[0] >= 6:
+      var.set_value(value, skip_validation=True)
+    else:
+      var.set_value(value, valid=True)
+
+  def storeIncumbent(self, model):
+    """
+      Store the values of the variables of the solution, which are used as the MIP start and the objective cutoff
+      of the next solve, see self.loadIncumbent
+      @ In, model, pyomo.instance, instance of pyomo model with the solution loaded
+      @ Out, None
+    """
+    if not self.warmStart and not self.objectiveCutoff:
+      return
+    self._incumbent = self.variableValues(model)
+
+  def loadIncumbent(self, model):
+    """
+      Load the last incumbent into the variables of the model, the variables of the new model that are not in the
+      last incumbent are left unchanged, i.e. the instance is rebuilt with different sets
+      @ In, model, pyomo.instance, instance of pyomo model
+      @ Out, feasible, bool, True if the last incumbent is complete and feasible for the new data
+    """
+    if self._incumbent is None or (not self.warmStart and not self.objectiveCutoff):
+      return False
+    for var in model.component_objects(pyomo.Var, active=True):
+      values = self._incumbent.get(var.name, {})
+      for index in var:
+        if index in values and not var[index].fixed:
+          self.setVariableValue(var[index], values[index])
+    return self.incumbentFeasible(model)
+
+  @staticmethod
+  def incumbentFeasible(model, tol=1.0e-6):
+    """
+      Check if the current values of the variables satisfy the bounds and the constraints of the model
+      @ In, model, pyomo.instance, instance of pyomo model
+      @ In, tol, float, optional, the absolute feasibility tolerance
+      @ Out, feasible, bool, True if the values are feasible
+    """
+    for var in model.component_data_objects(pyomo.Var, active=True):
+      if var.value is None:
+        return False
+      if (var.lb is not None and var.value < var.lb - tol) or (var.ub is not None and var.value > var.ub + tol):
+        return False
+    for con in model.component_data_objects(pyomo.Constraint, active=True):
+      body = pyomo.value(con.body, exception=False)
+      if body is None:
+        return False
+      if (con.has_lb() and body < pyomo.value(con.lower) - tol) or (con.has_ub() and body > pyomo.value(con.upper) + tol):
+        return False
+    return True
+
+  def addObjectiveCutoff(self, model, opt, tol=1.0e-6):
+    """
+      Bound the objective by its value at the last incumbent, which is feasible for the new data, so that the
+      branches that can not improve on the last incumbent are pruned by the solver. The cutoff option of the
+      solver is used if it is available, see self.nativeCutoffOptions, otherwise the bound is added to the model
+      as the constraint "objectiveCutoff", which should be deleted after the solve
+      @ In, model, pyomo.instance, instance of pyomo model with the last incumbent loaded, see self.loadIncumbent
+      @ In, opt, pyomo.solver, the solver that is used to solve the model
+      @ In, tol, float, optional, the relative tolerance of the cutoff
+      @ Out, method, str, 'native' if the cutoff option of the solver is used, 'constraint' if the bound is
+        added to the model, 'none' if the cutoff is provided by the user through the solver options
+    """
+    objective = next(model.component_data_objects(pyomo.Objective, active=True))
+    cutoff = pyomo.value(objective)
+    slack = tol * max(1.0, abs(cutoff))
+    # relax the cutoff, since the last incumbent can be the optimal solution of the new data
+    bound = cutoff - slack if objective.sense == pyomo.maximize else cutoff + slack
+    options = self.nativeCutoffOptions(bound, objective.sense)
+    if options is not None:
+      if any(key in self.sopts for key in options):
+        logger.info('Cutoff of %s is provided by the solver options, the last incumbent is not used', self.name)
+        return 'none'
+      opt.options.update(options)
+      logger.info('Objective of %s is bounded by the last incumbent with the solver options %s', self.name, options)
+      return 'native'
+    if objective.sense == pyomo.maximize:
+      model.objectiveCutoff = pyomo.Constraint(expr=objective.expr >= bound)
+    else:
+      model.objectiveCutoff = pyomo.Constraint(expr=objective.expr <= bound)
+    logger.info('Objective of %s is bounded by the last incumbent with a constraint: %s', self.name, cutoff)
+    return 'constraint'
+
+  def nativeCutoffOptions(self, cutoff, sense):
+    """
+      Get the solver options that prune the branches which can not improve on the given objective value
+      @ In, cutoff, float, the objective value
+      @ In, sense, int, the sense of the objective, i.e. pyomo.minimize or pyomo.maximize
+      @ Out, options, dict, the solver options, None if the solver does not provide a cutoff option
+    """
+    solver = self.solver.split('_')[0]
+    if solver == 'cbc':
+      # cbc applies the cutoff to the objective in the minimization sense
+      return {'cutoff': -cutoff if sense == pyomo.maximize else cutoff}
+    elif solver == 'gurobi':
+      return {'Cutoff': cutoff}
+    elif solver == 'cplex':
+      if sense == pyomo.maximize:
+        return {'mip_tolerances_lowercutoff': cutoff}
+      return {'mip_tolerances_uppercutoff': cutoff}
+    return None
+
+  def incumbentOutputs(self, warmStarted, cutoffMethod):
+    """
+      Get the outputs of the use of the last incumbent, i.e. whether it is passed as the MIP start, and how the
+      objective is bounded by it
+      @ In, warmStarted, bool, True if the last incumbent is passed to the solver as the MIP start
+      @ In, cutoffMethod, str, 'native', 'constraint' or 'none', see self.addObjectiveCutoff
+      @ Out, outputDict, dict, {'WarmStarted':float, 'CutoffApplied':float, 'CutoffMethod':str}, empty if
+        neither "warmStart" nor "objectiveCutoff" is enabled
+    """
+    if not self.warmStart and not self.objectiveCutoff:
+      return {}
+    outputDict = {}
+    outputDict['WarmStarted'] = 1.0 if warmStarted else 0.0
+    outputDict['CutoffApplied'] = 0.0 if cutoffMethod == 'none' else 1.0
+    outputDict['CutoffMethod'] = cutoffMethod
+    return outputDict
+
+  def storeStability(self, model):
+    """
+      Store the objective coefficients, the values and the bounds of the variables of the solution, which are used
+      to certify that the solution is still optimal for the next run, see self.stableSolution
+      @ In, model, pyomo.instance, instance of pyomo model with the solution loaded
+      @ Out, None
+    """
+    self._stability = None
+    if not self.stabilityReuse:
+      return
+    objective = next(model.component_data_objects(pyomo.Objective, active=True))
+    repn = generate_standard_repn(objective.expr)
+    if not repn.is_linear():
+      return
+    coefs = dict((id(var), coef) for var, coef in zip(repn.linear_vars, repn.linear_coefs))
+    variables = list(model.component_data_objects(pyomo.Var, active=True))
+    self._stability = {'sense':objective.sense, 'coefs':coefs, 'variables':variables,
+                       'values':dict((id(var), var.value) for var in variables)}
+    if logger.isEnabledFor(logging.DEBUG):
+      for var in variables:
+        low, high = self.stabilityRange(var, coefs.get(id(var), 0.0), objective.sense)
+        logger.debug('Objective coefficient of %s keeps the solution optimal in range [%s, %s]', var.name, low, high)
+
+  def stabilityOutputs(self, method):
+    """
+      Get the outputs of the solution reuse, i.e. whether the solution of the run is reused, the reuse rate
+      over the runs, and the method that certifies the solution
+      @ In, method, str, 'monotonicity' if the solution is reused and certified by the monotonicity of the
+        objective coefficients, 'solver' if the solution is obtained from the solver, 'cache' if the solution
+        is obtained from the solution cache, see self.adoptCachedSolution
+      @ Out, outputDict, dict, {'StabilityReused':float, 'StabilityReuseRate':float, 'StabilityMethod':str},
+        empty if "stabilityReuse" is not enabled
+    """
+    if not self.stabilityReuse:
+      return {}
+    outputDict = {}
+    outputDict['StabilityReused'] = 1.0 if method == 'monotonicity' else 0.0
+    outputDict['StabilityReuseRate'] = self._numReused / self._numRuns
+    outputDict['StabilityMethod'] = method
+    return outputDict
+
+  @staticmethod
+  def stabilityRange(var, coef, sense, tol=1.0e-6):
+    """
+      Get the range of the objective coefficient of the variable, in which the solution is certified to be still
+      optimal when the other coefficients are not changed, i.e. the coefficient can increase (decrease for
+      minimization) if the variable is at its upper bound, and decrease (increase for minimization) if the
+      variable is at its lower bound
+      @ In, var, pyomo.Var, the variable with the value of the solution
+      @ In, coef, float, the objective coefficient of the variable
+      @ In, sense, int, the sense of the objective, i.e. pyomo.maximize or pyomo.minimize
+      @ In, tol, float, optional, the tolerance to compare the value with the bounds
+      @ Out, (low, high), tuple, the range of the objective coefficient
+    """
+    atUpper = var.fixed or (var.ub is not None and var.value >= var.ub - tol)
+    atLower = var.fixed or (var.lb is not None and var.value <= var.lb + tol)
+    if sense == pyomo.minimize:
+      atUpper, atLower = atLower, atUpper
+    return (coef if not atLower else -np.inf, coef if not atUpper else np.inf)
+
+  def constraintParameters(self, model):
+    """
+      Get the names of the mutable parameters that are used by the constraints of the instance
+      @ In, model, pyomo.instance, instance of pyomo model
+      @ Out, constraintParams, set, the names of the parameters
+    """
+    if self._constraintParams is None:
+      self._constraintParams = set()
+      for con in model.component_data_objects(pyomo.Constraint, active=True):
+        for expr in (con.body, con.lower, con.upper):
+          if expr is not None:
+            self._constraintParams.update(param.parent_component().name for param in identify_mutable_parameters(expr))
+    return self._constraintParams
+
+  def stableSolution(self, model, tol=1.0e-9):
+    """
+      Check if the last solution is still optimal for the updated instance, i.e. only the objective coefficients
+      are changed, and each change does not favor moving the variable away from its value, i.e. for maximization,
+      the coefficient is increased only if the variable is at its upper bound, and decreased only if the variable
+      is at its lower bound. In this case, no feasible solution can gain more than the last solution from the
+      change, and the last solution is loaded into the instance
+      @ In, model, pyomo.instance, instance of pyomo model
+      @ In, tol, float, optional, the tolerance of the certification
+      @ Out, stableSolution, bool, True if the last solution is certified to be still optimal
+    """
+    stability = self._stability
+    if not self.stabilityReuse or stability is None or self._changedParams is None:
+      return False
+    if set(self._changedParams) & self.constraintParameters(model):
+      return False
+    objective = next(model.component_data_objects(pyomo.Objective, active=True))
+    repn = generate_standard_repn(objective.expr)
+    if not repn.is_linear() or objective.sense != stability['sense']:
+      return False
+    coefs = dict((id(var), coef) for var, coef in zip(repn.linear_vars, repn.linear_coefs))
+    sign = 1.0 if objective.sense == pyomo.maximize else -1.0
+    gain = 0.0
+    for var in stability['variables']:
+      value = stability['values'][id(var)]
+      change = sign * (coefs.pop(id(var), 0.0) - stability['coefs'].get(id(var), 0.0))
+      if change > tol:
+        if var.ub is None and not var.fixed:
+          return False
+        gain += change * ((value if var.fixed else var.ub) - value)
+      elif change < -tol:
+        if var.lb is None and not var.fixed:
+          return False
+        gain += -change * (value - (value if var.fixed else var.lb))
+    # the objective contains variables that are not in the last solution
+    if coefs or gain > tol * max(1.0, abs(pyomo.value(objective))):
+      return False
+    for var in stability['variables']:
+      self.setVariableValue(var, stability['values'][id(var)])
+    self._changedParams = []
+    return True
+
+  def buildLinearProgram(self):
+    """
+      This method is used to assemble the optimization problem in the matrix form from the input data
+      @ In, None
+      @ Out, lp, matrixUtils.LinearProgram, the mixed integer linear program
+    """
+    raise IOError('Backend "matrix" is not supported by "{}"!'.format(self.name))
+
+  def runMatrix(self):
+    """
+      This method execute the optimization with the matrix backend, i.e. the problem is assembled as sparse
+      matrices without pyomo model
+      @ In, None
+      @ Out, outputDict, dict, dictionary stores the outputs
+    """
+    start = time.time()
+    lp = self.buildLinearProgram()
+    logger.info('Matrix model of %s is assembled in %.4f seconds: %d variables, %d constraints, %d nonzeros',
+                self.name, time.time() - start, lp.numVariables, lp.numConstraints, lp.assemble()['A'].nnz)
+    if self.modelFile is not None:
+      modelFile = self.modelFile if os.path.isabs(self.modelFile) else os.path.join(self.workingDir, self.modelFile)
+      lp.write(modelFile)
+      logger.info('Matrix model is written to: %s', modelFile)
+    values, duals = self.solveLinearProgram(lp)
+    # separation loop, the violated lazy constraints are added and the problem is solved again until the
+    # solution satisfies all the lazy constraints
+    while lp.numLazyConstraints > 0:
+      numAdded = lp.addViolatedConstraints(values)
+      if numAdded == 0:
+        break
+      logger.info('%d violated lazy constraints are added, resolve the matrix model with %d constraints', numAdded, lp.numConstraints)
+      values, duals = self.solveLinearProgram(lp)
+    outputDict = self.printMatrixSolution(lp, values, duals)
+    self.output.update(outputDict)
+    return outputDict
+
+  def solveLinearProgram(self, lp):
+    """
+      Solve the linear program with the solver, the linear program is passed to the solver through LP file,
+      or solved in memory if the solver is 'highs_inprocess'
+      @ In, lp, matrixUtils.LinearProgram, the mixed integer linear program
+      @ Out, (values, duals), tuple, numpy.array of the values of the variables, and numpy.array of the duals
+        of the constraints (zeros if they are not provided by the solver)
+    """
+    if self.solver == 'highs_inprocess':
+      options = matrixUtils.highsOptions(self.sopts, utils.convertStringToBool(str(self.tee)))
+      result = matrixUtils.solveHighs(lp, options)
+      if result['status'] != 'optimal':
+        raise RuntimeError("Solver did not report optimality:\n%s" %(result['message']))
+      return result['values'], result['duals']
+    fd, lpFile = tempfile.mkstemp(suffix='.lp', prefix='logos_')
+    os.close(fd)
+    try:
+      # the short labels, i.e. 'x1' and 'c1', are used to avoid the truncation of long labels by the solvers
+      lp.writeLP(lpFile, symbolic=False)
+      with SolverFactory(self.solver) as opt:
+        opt.options.update(self.sopts) # add solver options
+        results = opt.solve(lpFile, load_solutions=False, tee=self.tee, suffixes=['dual'], **{'use_signal_handling':False})
+    finally:
+      os.remove(lpFile)
+    if results.solver.termination_condition != TerminationCondition.optimal:
+      raise RuntimeError("Solver did not report optimality:\n%s" %(results.solver))
+    solution = results.solution(0)
+    values = np.zeros(lp.numVariables)
+    for label, info in solution.variable.items():
+      if label.startswith('x') and label[1:].isdigit():
+        values[int(label[1:]) - 1] = info['Value']
+    integrality = lp.assemble()['integrality']
+    values[integrality] = np.round(values[integrality])
+    duals = np.zeros(lp.numConstraints)
+    for label, info in solution.constraint.items():
+      # the labels are in the form of prefix + 'c' + str(row + 1) + '_', see matrixUtils.LinearProgram.writeLP
+      row = label[5:-1]
+      if 'Dual' in info and row.isdigit():
+        # the two sides of a range constraint, i.e. 'r_l_' and 'r_u_', are the same row, at most one of them
+        # is active, and the dual of the row is the sum of the duals of both sides
+        duals[int(row) - 1] += info['Dual']
+    return values, duals
+
+  def printMatrixSolution(self, lp, values, duals):
+    """
+      Output the optimization solution of the matrix backend to screen
+      @ In, lp, matrixUtils.LinearProgram, the mixed integer linear program
+      @ In, values, numpy.array, the values of the variables
+      @ In, duals, numpy.array, the duals of the constraints
+      @ Out, outputDict, dict, dictionary stores the outputs
+    """
+    outputDict = {}
+    return outputDict
+
   def printSolution(self, model):
     """
       Output optimization solution to screen
@@ -13,7 +13,9 @@ warnings.simplefilter('default',DeprecationWarning)
 
 #External Modules------------------------------------------------------------------------------------
 import numpy as np
+import scipy.sparse as sparse
 import itertools
+import collections
 import logging
 import pyomo.environ as pyomo
 #External Modules End--------------------------------------------------------------------------------
@@ -60,37 +62,22 @@ class MultipleKnapsack(KnapsackBase):
     if 'capitals' not in self.sets.keys():
       raise IOError('Set capitals is required for %s problem' %self.name)
 
-  def setScenarioData(self):
+  def processScenarioData(self, paramName, scenarioData):
     """
-      Method to setup the scenario data for scenario tree construction
-      @ In, None
-      @ Out, None
+      Method to process the scenario data of given uncertain parameter before it is added to the scenario space
+      @ In, paramName, str, name of the uncertain parameter
+      @ In, scenarioData, list, list of scenario data, i.e. [{setIndex:uncertaintyVal}]
+      @ Out, dataList, list, list of processed scenario data, i.e. [{setIndex:uncertaintyVal}]
     """
-    # uncertainties for multiple parameters
-    logger.info('Initialize Uncertainties for Optimization Instance: %s', self.name)
-    self.scenarios = {}
-    scenarioList = []
-    scenarioNameList = []
-    scenarioProbList = []
-    paramList = []
-    for paramName, scenarioDict in self.uncertainties.items():
-      if paramName == 'available_capitals':
-        dataList = []
-        for scenarioData in scenarioDict['scenarios'].values():
-          indices = [list(scenarioData.keys()), ['None']]
-          indices = list(itertools.product(*indices))
-          paramDict = dict(zip(indices, list(scenarioData.values())))
-          dataList.append(paramDict)
-        scenarioList.append(dataList)
-      else:
-        scenarioList.append(list(scenarioDict['scenarios'].values()))
-      scenarioNameList.append(list(scenarioDict['scenarios'].keys()))
-      scenarioProbList.append(scenarioDict['probabilities'])
-      paramList.append(paramName)
-    self.scenarios['params'] = paramList
-    self.scenarios['scenario_name'] = dict(('scenario_' + str(i), name) for i, name in enumerate(list(itertools.product(*scenarioNameList)), 1))
-    self.scenarios['probabilities'] = dict(('scenario_' + str(i), float(np.product(list(prob)))) for i, prob in enumerate(list(itertools.product(*scenarioProbList)), 1))
-    self.scenarios['scenario_data'] = dict(('scenario_' + str(i), dict(zip(paramList, data))) for i, data in enumerate(list(itertools.product(*scenarioList)), 1))
+    if paramName != 'available_capitals':
+      return scenarioData
+    dataList = []
+    for paramData in scenarioData:
+      indices = [list(paramData.keys()), ['None']]
+      indices = list(itertools.product(*indices))
+      paramDict = dict(zip(indices, list(paramData.values())))
+      dataList.append(paramDict)
+    return dataList
 
   def initializeModel(self):
     """
@@ -99,10 +86,10 @@ class MultipleKnapsack(KnapsackBase):
       @ Out, model, pyomo model instance, pyomo abstract model
     """
     model = KnapsackBase.initializeModel(self)
-    model.capitals = pyomo.Set()
-    model.net_present_values = pyomo.Param(model.investments, mutable=True)
-    model.available_capitals = pyomo.Param(model.capitals, model.time_periods, mutable=True)
-    model.costs = pyomo.Param(model.investments, model.time_periods, mutable=True)
+    model.capitals = pyomo.Set(initialize=self.modelData('capitals'))
+    model.net_present_values = pyomo.Param(model.investments, mutable=True, initialize=self.modelData('net_present_values'))
+    model.available_capitals = pyomo.Param(model.capitals, model.time_periods, mutable=True, initialize=self.modelData('available_capitals'))
+    model.costs = pyomo.Param(model.investments, model.time_periods, mutable=True, initialize=self.modelData('costs'))
     return model
 
   def addConstraints(self, model):
@@ -114,7 +101,8 @@ class MultipleKnapsack(KnapsackBase):
     model = KnapsackBase.addConstraints(self, model)
     def constraintX(model,i):
       """ sum of investments over knapsacks should less or equal than bounds """
-      return (self.lowerBounds[i], sum(model.x[i,m] for m in model.capitals), self.upperBounds[i])
+      lower, upper = self.investmentBounds(i)
+      return (lower, sum(model.x[i,m] for m in model.capitals), upper)
     model.constraintX = pyomo.Constraint(model.investments, rule=constraintX)
 
     def constraintCapacity(model, m, t):
@@ -128,7 +116,12 @@ class MultipleKnapsack(KnapsackBase):
         return sum(model.x[i,m] for m in model.capitals) == 1
       model.constraintRegulatory = pyomo.Constraint(model.mandatory, rule=constraintRegulatory)
 
-    if self.uncertainties is not None:
+    if self.uncertainties is not None and self.priorityFormulation == 'rank':
+      def consistentConstraintI(model, i):
+        """Constraint for variable rank if priority project selection is required"""
+        return self.rankConsistentConstraint(model, i, sum(model.x[i,m] for m in model.capitals))
+      model.consistentConstraintI = pyomo.Constraint(model.investments, rule=consistentConstraintI)
+    elif self.uncertainties is not None:
       def consistentConstraintI(model, i, j):
         """Constraint for variable y if priority project selection is required"""
         if i == j:
@@ -148,7 +141,7 @@ class MultipleKnapsack(KnapsackBase):
     model = KnapsackBase.addVariables(self, model)
     def boundsExpression(model, i, j):
       """ set the bounds for solution variable x using lowerBounds and upperBounds"""
-      return (self.lowerBounds[i], self.upperBounds[i])
+      return self.investmentBounds(i)
     model.x = pyomo.Var(model.investments, model.capitals, domain=pyomo.NonNegativeIntegers, bounds=boundsExpression)
     return model
 
@@ -221,12 +214,14 @@ class MultipleKnapsack(KnapsackBase):
     outputDict = KnapsackBase.printSolution(self, model)
     msg = "Selected investments include:"
     logger.info(msg)
-    outputDict.update({item:list() for item in model.investments})
-    outputDict['capitals'] = list(cap for cap in model.capitals)
-    for cap in model.capitals:
-      for item in model.investments:
-        numSelected = pyomo.value(model.x[item, cap])
-        outputDict[item].append(numSelected)
+    capitals = list(cap for cap in model.capitals)
+    solution = collections.OrderedDict((item, list(pyomo.value(model.x[item, cap]) for cap in capitals)) for item in model.investments)
+    solution = self.disaggregateSolution(solution)
+    outputDict.update(solution)
+    outputDict['capitals'] = capitals
+    for pos, cap in enumerate(capitals):
+      for item in solution:
+        numSelected = solution[item][pos]
         if numSelected == 1:
           msg = "Investment: " + str(item) + " is selected for capitals: " + str(cap)
           logger.info(msg)
@@ -240,7 +235,8 @@ class MultipleKnapsack(KnapsackBase):
     # In some cases, a solver plugin will raise an exception if it encounters a Suffix type that it does not handle
     # One should be careful in verifying that Suffix declarations are being handled as expected when switching
     # to a different solver or solver interface.
-    if self.solver == 'cbc':
+    # the duals are not available if the solution is reused without solving
+    if self.solver == 'cbc' and self.dualsAvailable:
       logger.info("Duals Information for Constraint Capacity:")
       print("Capitals|Time_Periods      Capacity_Margin")
       for const in model.component_objects(pyomo.Constraint, active=True):
@@ -249,6 +245,102 @@ class MultipleKnapsack(KnapsackBase):
             print("{0:20s} {1:10.1f}".format(str(index), model.dual[const[index]]))
     return outputDict
 
+  def matrixIndexLists(self, data):
+    """
+      Get the index lists of the parameters that are used by the matrix model
+      @ In, data, dict, input data for pyomo model, i.e. self.generateModelInputData()[None]
+      @ Out, indexLists, dict, {paramName: list of index lists}
+    """
+    indexLists = KnapsackBase.matrixIndexLists(self, data)
+    investments, timePeriods = data['investments'][None], data['time_periods'][None]
+    indexLists['net_present_values'] = [investments]
+    indexLists['available_capitals'] = [data['capitals'][None], timePeriods]
+    indexLists['costs'] = [investments, timePeriods]
+    return indexLists
+
+  def addMatrixScenario(self, lp, data, params, firstStage, prefix=''):
+    """
+      Add the variables and constraints of one scenario to the matrix model, the variables 'x[i,m]' are ordered
+      by investments first, and then by capitals
+      @ In, lp, matrixUtils.LinearProgram, the mixed integer linear program
+      @ In, data, dict, input data for pyomo model, i.e. self.generateModelInputData()[None]
+      @ In, params, dict, {paramName: numpy.array}, the parameter arrays of this scenario
+      @ In, firstStage, collections.OrderedDict, {varName: (indices, columns)} of the first stage variables
+      @ In, prefix, str, optional, prefix of the names of the variables and constraints, i.e. the scenario name
+      @ Out, variables, collections.OrderedDict, {varName: (indices, columns)} of the second stage variables
+    """
+    variables = KnapsackBase.addMatrixScenario(self, lp, data, params, firstStage, prefix)
+    investments, capitals, timePeriods = data['investments'][None], data['capitals'][None], data['time_periods'][None]
+    n, m, t = len(investments), len(capitals), len(timePeriods)
+    lower, upper = (np.asarray(bounds, dtype=float) for bounds in zip(*(self.investmentBounds(i) for i in investments)))
+    indices = list(itertools.product(investments, capitals))
+    x = lp.addVariables(prefix + 'x', indices, lower=np.repeat(lower, m), upper=np.repeat(upper, m), integer=True)
+    variables['x'] = (indices, x)
+    # selection of the investments, i.e. sum of x[i,m] over capitals
+    selection = sparse.kron(sparse.identity(n), np.ones((1, m)))
+    lp.addConstraints(prefix + 'constraintX', investments, selection, x, lower=lower, upper=upper)
+    i, k, l = (index.ravel() for index in np.indices((n, m, t)))
+    coeffs = (params['costs'][i, l], (k*t + l, i*m + k))
+    lp.addConstraints(prefix + 'constraintCapacity', list(itertools.product(capitals, timePeriods)), coeffs, x,
+                      upper=params['available_capitals'].ravel())
+    if self.mandatory is not None:
+      positions = dict((i, pos) for pos, i in enumerate(investments))
+      mandatory = list(positions[i] for i in self.mandatory)
+      lp.addConstraints(prefix + 'constraintRegulatory', self.mandatory, sparse.csr_matrix(selection)[mandatory], x, lower=1.0, upper=1.0)
+    if self.uncertainties is not None and self.optionalConstraints['consistentConstraintI']:
+      self.addMatrixConsistentConstraint(lp, prefix + 'consistentConstraintI', selection, x, firstStage, variables)
+    return variables
+
+  def npvCoefficients(self, params, variables):
+    """
+      Get the coefficients of the total NPV of one scenario, i.e. sum of the NPVs over capitals
+      @ In, params, dict, {paramName: numpy.array}, the parameter arrays of this scenario
+      @ In, variables, collections.OrderedDict, {varName: (indices, columns)} of the second stage variables
+      @ Out, (columns, coefficients), tuple, the columns and coefficients of the total NPV
+    """
+    indices, x = variables['x']
+    return x, np.repeat(params['net_present_values'], len(x) // len(params['net_present_values']))
+
+  def printMatrixSolution(self, lp, values, duals):
+    """
+      Output the optimization solution of the matrix backend to screen
+      @ In, lp, matrixUtils.LinearProgram, the mixed integer linear program
+      @ In, values, numpy.array, the values of the variables
+      @ In, duals, numpy.array, the duals of the constraints
+      @ Out, outputDict, dict, dictionary stores the outputs
+    """
+    outputDict = KnapsackBase.printMatrixSolution(self, lp, values, duals)
+    if self.uncertainties is not None:
+      return outputDict
+    msg = "Selected investments include:"
+    logger.info(msg)
+    _, _, variables, _, _ = self._matrixScenarios[0]
+    indices, x = variables['x']
+    investments = list(dict.fromkeys(item for item, _ in indices))
+    capitals = list(dict.fromkeys(cap for _, cap in indices))
+    solution = dict(zip(indices, values[x]))
+    solution = collections.OrderedDict((item, list(solution[item, cap] for cap in capitals)) for item in investments)
+    solution = self.disaggregateSolution(solution)
+    outputDict.update(solution)
+    outputDict['capitals'] = capitals
+    for pos, cap in enumerate(capitals):
+      for item in solution:
+        numSelected = solution[item][pos]
+        if numSelected == 1:
+          msg = "Investment: " + str(item) + " is selected for capitals: " + str(cap)
+          logger.info(msg)
+        elif numSelected > 1:
+          msg = "Investment: " + str(item) + " is selected with limit " + str(int(numSelected)) + " for capitals " + str(cap)
+          logger.info(msg)
+    outputDict['MaxNPV'] = lp.objectiveValue(values)
+    logger.info("Maximum NPV: %16.4f" %(outputDict['MaxNPV']))
+    if self.solver in ['cbc', 'highs_inprocess']:
+      logger.info("Duals Information for Constraint Capacity:")
+      print("Capitals|Time_Periods      Capacity_Margin")
+      for index, row in zip(*lp.constraintBlock('constraintCapacity')):
+        print("{0:20s} {1:10.1f}".format(str(index), duals[row]))
+    return outputDict
+
   @staticmethod
   def computeSecondStageCost(model):
     """Second stage cost of stochastic programming, i.e. maximum NPVs"""
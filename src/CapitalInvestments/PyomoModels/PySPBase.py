@@ -12,6 +12,8 @@ import numpy as np
 import logging
 import copy
 import collections
+import time
+import multiprocessing
 import six
 from six import iterkeys, iteritems, itervalues
 import pyomo.environ as pyomo
@@ -20,19 +22,25 @@ from pyomo.opt import SolverFactory, TerminationCondition
 try:
   import pyomo.pysp.util.rapper as rapper
   from pyomo.pysp.scenariotree.tree_structure_model import CreateAbstractScenarioTreeModel
+  from pyomo.pysp.computeconf import t_table_values
 except ImportError:
   import pysp.util.rapper as rapper
   from pysp.scenariotree.tree_structure_model import CreateAbstractScenarioTreeModel
+  from pysp.computeconf import t_table_values
 #External Modules End--------------------------------------------------------------------------------
 
 #Internal Modules------------------------------------------------------------------------------------
 try:
   from CapitalInvestments.investment_utils import investmentUtils as utils
   from CapitalInvestments.investment_utils import distanceUtils
+  from CapitalInvestments.investment_utils import scenarioUtils
+  from CapitalInvestments.investment_utils.scenarioUtils import ScenarioSpace
   from .ModelBase import ModelBase
 except ImportError:
   from LOGOS.src.CapitalInvestments.investment_utils import investmentUtils as utils
   from LOGOS.src.CapitalInvestments.investment_utils import distanceUtils
+  from LOGOS.src.CapitalInvestments.investment_utils import scenarioUtils
+  from LOGOS.src.CapitalInvestments.investment_utils.scenarioUtils import ScenarioSpace
   from LOGOS.src.CapitalInvestments.PyomoModels.ModelBase import ModelBase
 #Internal Modules End--------------------------------------------------------------------------------
 
@@ -46,6 +54,17 @@ if version >= 57:
 
 logger = logging.getLogger(__name__)
 
+# model used by the forked worker processes of sample average approximation
+_saaModel = None
+
+def _solveSAAReplication(args):
+  """
+    Solve one replication of sample average approximation in a worker process
+    @ In, args, tuple, (indices, probabilities, xhat) passed to PySPBase.solveSAAReplication
+    @ Out, _solveSAAReplication, tuple, (optimal objective, objective given xhat) of the sampled problem
+  """
+  return _saaModel.solveSAAReplication(*args)
+
 class PySPBase(ModelBase):
   """
     Base class for methods used to solving optimization problem
@@ -61,14 +80,29 @@ class PySPBase(ModelBase):
     self.meta = None            # additional info
     self.scenariosData = None   # containers for scenarios/uncertainties input data
     self.uncertainties = None   # uncertainty info provided by users
-    self.scenarios = {}         # dictionary contains scenarios information generated from self.uncertainties
+    self.scenarios = None       # ScenarioSpace generated from self.uncertainties
     self.optionalConstraints = {} # dictionary of optional constraints that users can turn on or off, i.e. {consistentConstraintI:True}
     self.phopts = {} # options for progressive hedging method
     self.phopts['--output-solver-log'] = None
     self.phopts['--max-iterations'] = 3
     self.phopts['--linearize-nonbinary-penalty-terms'] = 4
     self.phRho = 1
-    self.stochSolver = 'ef'     # stochastic solver, default runef, can be switched to runph method in pyomo.
+    self.stochSolver = 'ef'     # stochastic solver, default runef, can be switched to runph or saa method
+    ## used for sample average approximation
+    self.saaSamples = 10        # number of sampled scenarios for each replication
+    self.saaReplications = 10   # number of replications to estimate the optimality gap
+    self.saaSeed = None         # seed of the random number generator
+    self.saaWorkers = 1         # number of worker processes to solve the replications
+    self.saaStatistics = None   # statistics of sample average approximation, i.e. optimality gap and its confidence interval
+    self._fixedFirstStage = None # first stage solution {(varName, index):value} that is fixed in each scenario instance
+    self._saaSpace = None       # the scenario space that the samples are drawn from
+    self.saaCandidate = None    # ScenarioSubspace of the sampled problem that gives the candidate solution
+    self._templateInstance = None # fully constructed model instance, built once per run and cloned for each scenario
+    self.constructionTime = {}  # time (in seconds) spent to construct the instance of each scenario
+    self.mergeScenarios = False # merge the duplicated scenarios if True
+    self.probabilityThreshold = 0.0 # the scenarios with probabilities below the threshold are dropped
+    self.scenarioReduction = None # options for scenario reduction, i.e. {'method':'fast_forward', 'number':10}
+    self.reductionError = None  # Kantorovich distance between the original and the reduced scenarios
     ## used for distributionally robust optimization
     self.epsilon = 0.0 # specify the radius of radius ambiguity for distributionally robust optimization
     self.sigma = [] # list of scenario names
@@ -92,40 +126,76 @@ class PySPBase(ModelBase):
       @ Out, None
     """
     super().initialize(initDict)
+    self._templateInstance = None
+    self.saaCandidate = None
+    self.saaStatistics = None
+    self.reductionError = None
     self.uncertainties = initDict.pop('Uncertainties', None)
     if self.uncertainties is not None:
       self.setScenarioData()
+      self.mergeScenarioData()
+      if self.scenarioReduction is not None:
+        self.reduceScenarioData()
       if 'DRO' in self.name:
-        self.distData = distanceUtils.computeDist('minkowski', self.scenarios['scenario_data'])
-        ## Add distance scenario data into self.scenarios
-        distData = copy.copy(self.distData)
-        smIndices = list(self.scenarios['probabilities'].keys())
-        for sm, paramDict in self.scenarios['scenario_data'].items():
-          i = int(sm.split('_')[-1]) - 1
-          paramDict['dist'] = dict(zip(smIndices, np.ravel(distData[i,:])))
+        self.distData = distanceUtils.computeDist('minkowski', self.scenarios.matrix())
 
   def setScenarioData(self):
     """
-      Method to setup the scenario data for scenario tree construction
+      Method to setup the scenario data for scenario tree construction. The scenario space is not materialized,
+      the scenarios are decoded on demand from the scenarios of each uncertain parameter.
       @ In, None
       @ Out, None
     """
     # uncertainties for multiple parameters
     logger.info('Initialize Uncertainties for Optimization Instance: %s', self.name)
-    self.scenarios = {}
-    scenarioList = []
-    scenarioNameList = []
-    scenarioProbList = []
-    paramList = []
+    self.scenarios = ScenarioSpace()
     for paramName, scenarioDict in self.uncertainties.items():
-      scenarioList.append(list(scenarioDict['scenarios'].values()))
-      scenarioNameList.append(list(scenarioDict['scenarios'].keys()))
-      scenarioProbList.append(scenarioDict['probabilities'])
-      paramList.append(paramName)
-    self.scenarios['params'] = paramList
-    self.scenarios['scenario_name'] = dict(('scenario_' + str(i), name) for i, name in enumerate(list(itertools.product(*scenarioNameList)), 1))
-    self.scenarios['probabilities'] = dict(('scenario_' + str(i), float(np.product(list(prob)))) for i, prob in enumerate(list(itertools.product(*scenarioProbList)), 1))
-    self.scenarios['scenario_data'] = dict(('scenario_' + str(i), dict(zip(paramList, data))) for i, data in enumerate(list(itertools.product(*scenarioList)), 1))
+      if paramName == 'jointScenarios':
+        # joint scenarios of multiple parameters
+        scenarioData = [dict() for _ in scenarioDict['scenarios']]
+        for param in scenarioDict['params']:
+          paramData = self.processScenarioData(param, [data[param] for data in scenarioDict['scenarios'].values()])
+          for data, val in zip(scenarioData, paramData):
+            data[param] = val
+        self.scenarios.addJointParameters(scenarioDict['params'], list(scenarioDict['scenarios'].keys()), scenarioDict['probabilities'], scenarioData)
+        continue
+      scenarioData = self.processScenarioData(paramName, list(scenarioDict['scenarios'].values()))
+      self.scenarios.addParameter(paramName, list(scenarioDict['scenarios'].keys()), scenarioDict['probabilities'], scenarioData)
+    logger.info('Total number of scenarios: %d', len(self.scenarios))
+
+  def mergeScenarioData(self):
+    """
+      Method to merge the duplicated scenarios and drop the scenarios with zero or negligible probabilities
+      @ In, None
+      @ Out, None
+    """
+    nScenarios = len(self.scenarios)
+    scenarios = scenarioUtils.mergeScenarios(self.scenarios, merge=self.mergeScenarios, threshold=self.probabilityThreshold)
+    if len(scenarios) < nScenarios:
+      self.scenarios = scenarios
+      logger.info('Merge duplicated scenarios and drop scenarios with probabilities below %s: from %d to %d scenarios',
+                  self.probabilityThreshold, nScenarios, len(self.scenarios))
+
+  def reduceScenarioData(self):
+    """
+      Method to reduce the scenarios before the scenario tree is constructed
+      @ In, None
+      @ Out, None
+    """
+    nScenarios = len(self.scenarios)
+    start = time.time()
+    self.scenarios, self.reductionError = scenarioUtils.reduceScenarios(self.scenarios, **self.scenarioReduction)
+    logger.info('Scenario reduction (%s) from %d to %d scenarios in %.4f seconds, reduction error (Kantorovich distance): %.6g',
+                self.scenarioReduction['method'], nScenarios, len(self.scenarios), time.time() - start, self.reductionError)
+
+  def processScenarioData(self, paramName, scenarioData):
+    """
+      Method to process the scenario data of given uncertain parameter before it is added to the scenario space
+      @ In, paramName, str, name of the uncertain parameter
+      @ In, scenarioData, list, list of scenario data, i.e. [{setIndex:uncertaintyVal}]
+      @ Out, scenarioData, list, list of processed scenario data, i.e. [{setIndex:uncertaintyVal}]
+    """
+    return scenarioData
 
   def setSettings(self):
     """
@@ -145,7 +215,36 @@ class PySPBase(ModelBase):
     ## used for CVaR
     self._lambda = float(solverOptions.pop('risk_aversion', 0.0))
     self.alpha = float(solverOptions.pop('confidence_level', 0.95))
+    ## used for sample average approximation
+    self.saaSamples = int(solverOptions.pop('saa_samples', self.saaSamples))
+    self.saaReplications = int(solverOptions.pop('saa_replications', self.saaReplications))
+    seed = solverOptions.pop('saa_seed', None)
+    self.saaSeed = int(seed) if seed is not None else None
+    self.saaWorkers = int(solverOptions.pop('saa_workers', self.saaWorkers))
+    if self.stochSolver == 'saa':
+      if 'DRO' in self.name:
+        raise IOError('StochSolver "saa" is not supported by "{}", since the ambiguity set is defined on the full scenario set!'.format(self.name))
+      if self.saaSamples < 1 or self.saaReplications < 2:
+        raise IOError('StochSolver "saa" requires "saa_samples" >= 1 and "saa_replications" >= 2!')
+    if self.backend == 'matrix' and self.stochSolver != 'ef':
+      raise IOError('StochSolver "{}" is not supported by backend "matrix", only "EF" is supported!'.format(self.stochSolver))
     self.sopts.update(solverOptions)
+    self.mergeScenarios = utils.convertStringToBool(self.settings.pop('mergeScenarios', 'False'))
+    self.probabilityThreshold = float(self.settings.pop('probabilityThreshold', 0.0))
+    scenarioReduction = self.settings.pop('scenarioReduction', None)
+    if scenarioReduction is not None:
+      self.scenarioReduction = {}
+      self.scenarioReduction['method'] = scenarioReduction.pop('method', 'fast_forward').lower()
+      self.scenarioReduction['metric'] = scenarioReduction.pop('metric', 'minkowski').lower()
+      number = scenarioReduction.pop('number', None)
+      self.scenarioReduction['number'] = int(number) if number is not None else None
+      tolerance = scenarioReduction.pop('tolerance', None)
+      self.scenarioReduction['tolerance'] = float(tolerance) if tolerance is not None else None
+      self.scenarioReduction['maxMemory'] = float(scenarioReduction.pop('maxMemory', 4096))
+      if self.scenarioReduction['method'] not in ['fast_forward', 'kmedoids']:
+        raise IOError('Unrecognized scenario reduction method "{}", valid methods are "fast_forward" and "kmedoids"!'.format(self.scenarioReduction['method']))
+      if self.scenarioReduction['number'] is None and self.scenarioReduction['tolerance'] is None:
+        raise IOError('Either "number" or "tolerance" is required by node "scenarioReduction"!')
     for optCon in self.optionalConstraints:
       if optCon == 'consistentConstraintI':
         self.optionalConstraints[optCon] = utils.convertStringToBool(self.settings.pop(optCon, 'True'))
@@ -161,10 +260,10 @@ class PySPBase(ModelBase):
     model = super().createModel()
     return model
 
-  def createInstance(self, data):
+  def createInstance(self, data=None):
     """
       This method is used to instantiate the pyomo model
-      @ In, data, dict, dictionary to initialize pyomo abstract model
+      @ In, data, dict, optional, dictionary to initialize pyomo abstract model, see ModelBase.createInstance
       @ Out, model, pyomo.instance, instance of pyomo model
     """
     model = super().createInstance(data)
@@ -172,7 +271,7 @@ class PySPBase(ModelBase):
     if len(self.optionalConstraints) > 0 and self.uncertainties is not None:
       # if 'consistentConstraintI' in self.optionalConstraints:
       #   model.consistentConstraint.deactivate()
-      if 'consistentConstraintII' in self.optionalConstraints:
+      if 'consistentConstraintII' in self.optionalConstraints and hasattr(model, 'consistentConstraintII'):
         model.consistentConstraintII.deactivate()
         logger.debug('Default to deactivate consistent constraint II')
       for optCon, decision in self.optionalConstraints.items():
@@ -196,7 +295,7 @@ class PySPBase(ModelBase):
     treeModel.Stages.add('FirstStage')
     treeModel.Stages.add('SecondStage')
     treeModel.Nodes.add('RootNode')
-    for i in self.scenarios['scenario_name']:
+    for i in self.scenarios:
       leafNode = 'leaf_' + i
       treeModel.Nodes.add(leafNode)
       treeModel.Scenarios.add(i)
@@ -209,7 +308,7 @@ class PySPBase(ModelBase):
         treeModel.NodeStage[node] = 'SecondStage'
         treeModel.Children['RootNode'].add(node)
         treeModel.Children[node].clear()
-        treeModel.ConditionalProbability[node] = self.scenarios['probabilities'][node.replace('leaf_','')]
+        treeModel.ConditionalProbability[node] = self.scenarios.probability(node.replace('leaf_',''))
         treeModel.ScenarioLeafNode[node.replace('leaf_','')] = node
 
     return treeModel
@@ -223,6 +322,20 @@ class PySPBase(ModelBase):
     """
     pass
 
+  def getTemplateInstance(self):
+    """
+      Build the template instance that is shared by all scenarios. The template is fully constructed,
+      including external constraints and the activation of optional constraints, and it is only rebuilt
+      when the model is initialized again, see self.update.
+      @ In, None
+      @ Out, self._templateInstance, instance, pyomo model instance
+    """
+    if self._templateInstance is None:
+      start = time.time()
+      self._templateInstance = self.createInstance(self.instanceData())
+      logger.info('Template instance of %s is constructed in %.4f seconds', self.name, time.time() - start)
+    return self._templateInstance
+
   def pysp_instance_creation_callback(self, scenario_name, node_names):
     """
       Clone a new instance and update the stochastic parameters from the sampled scenario
@@ -230,15 +343,109 @@ class PySPBase(ModelBase):
       @ node_names, str, not used
       @ instance, instance, pyomo model instance
     """
-    inputData = self.generateModelInputData()
-    model = self.createInstance(inputData)
-    instance = model.clone()
-    for key, val in self.scenarios['scenario_data'][scenario_name].items():
+    template = self.getTemplateInstance()
+    start = time.time()
+    instance = template.clone()
+    k = self.scenarios.index(scenario_name)
+    for key, indices, val in self.scenarioValues(k):
       # instance.component(key).value = val
-      instance.component(key).store_values(val)
+      instance.component(key).store_values(dict(zip(indices, val.tolist())))
+    ## distance between this scenario and the other scenarios, used by DRO
+    if self.distData is not None:
+      instance.dist.store_values(dict(zip(self.scenarios, np.ravel(self.distData[k,:]))))
+    if self._fixedFirstStage is not None:
+      for (varName, index), val in self._fixedFirstStage.items():
+        instance.component(varName)[index].fix(val)
     # instance.pprint()
+    self.constructionTime[scenario_name] = time.time() - start
     return instance
 
+  def reusableInstance(self):
+    """
+      Get the constructed pyomo instance that is reused by the next run, i.e. the template instance of the
+      scenarios with uncertainties
+      @ In, None
+      @ Out, instance, pyomo.instance, instance of pyomo model, None if it is not constructed
+    """
+    if self.uncertainties is not None:
+      return self._templateInstance
+    return super().reusableInstance()
+
+  def solutionValues(self):
+    """
+      Get the values of the variables of the last solution, the solutions of the stochastic programs are not
+      evaluated on other inputs
+      @ In, None
+      @ Out, solution, dict, {varName:{index:value}}, None if the solution is not available
+    """
+    if self.uncertainties is not None:
+      return None
+    return super().solutionValues()
+
+  def evaluateSolution(self, solution):
+    """
+      Evaluate the given solution on the current input, which is not supported by the stochastic programs
+      @ In, solution, dict, {varName:{index:value}}, the values of the variables
+      @ Out, outputDict, dict, dictionary stores the outputs, None if the solution can not be evaluated or it is
+        not feasible for the current input
+    """
+    if self.uncertainties is not None:
+      return None
+    return super().evaluateSolution(solution)
+
+  def adoptCachedSolution(self, solution, exact):
+    """
+      Adopt the cached solution as the solution of the current input, the stochastic programs do not use the
+      last incumbent or the solution reuse
+      @ In, solution, dict, {varName:{index:value}}, the values of the variables, None if they are not cached
+      @ In, exact, bool, True if the cached solution is the solution of the exact same problem
+      @ Out, outputDict, dict, the outputs of the run that is not solved
+    """
+    if self.uncertainties is not None:
+      return {}
+    return super().adoptCachedSolution(solution, exact)
+
+  def instanceReusable(self):
+    """
+      Check if the constructed instance can be reused when only the parameter values are changed, the scenarios
+      are replaced by the sampled scenarios in sample average approximation
+      @ In, None
+      @ Out, instanceReusable, bool, True if the instance can be reused
+    """
+    return super().instanceReusable() and (self.uncertainties is None or self.stochSolver != 'saa')
+
+  def scenarioValues(self, k):
+    """
+      Get the values of the uncertain parameters of given scenario
+      @ In, k, int, the position of the scenario in the scenario space
+      @ Out, scenarioValues, generator, generator of (paramName, indices, numpy.array of values)
+    """
+    return self.scenarios.values(k)
+
+  def reportConstructionTime(self):
+    """
+      Report the time spent to construct the scenario instances
+      @ In, None
+      @ Out, None
+    """
+    if not self.constructionTime:
+      return
+    times = np.asarray(list(self.constructionTime.values()))
+    logger.info('Constructed %d scenario instances in %.4f seconds (%.6f seconds per scenario, max %.6f seconds)',
+                len(times), times.sum(), times.mean(), times.max())
+    for scenarioName, elapsed in self.constructionTime.items():
+      logger.debug('Construction time of %s: %.6f seconds', scenarioName, elapsed)
+
+  def reportModelSize(self, model):
+    """
+      Report the size of the extensive form
+      @ In, model, instance, pyomo model instance of the extensive form
+      @ Out, None
+    """
+    numVars = sum(1 for _ in model.component_data_objects(pyomo.Var, descend_into=True))
+    numCons = sum(1 for _ in model.component_data_objects(pyomo.Constraint, active=True, descend_into=True))
+    logger.info('Extensive form of %s: %d variables, %d constraints', self.name, numVars, numCons)
+
   def run(self):
     """
       This method execute the optimization on the knapsack problem.
@@ -246,15 +453,19 @@ class PySPBase(ModelBase):
       @ Out, None
     """
     outputDict = {}
-    if self.uncertainties is None:
+    if self.uncertainties is None or self.backend == 'matrix':
+      # the extensive form is assembled directly by the matrix backend
       outputDict = super().run()
     else:
+      self.constructionTime = {}
       tree_model = self.pysp_scenario_tree_model_callback()
       if self.stochSolver == 'ef':
         # fsfct the callback function for pysp_instance_creation_callback
         # tree_model generated by pysp_scenario_tree_model_callback
         stsolver = rapper.StochSolver("", fsfct=self.pysp_instance_creation_callback, tree_model=tree_model)
+        self.reportConstructionTime()
         ef_sol = stsolver.solve_ef(self.solver, sopts=self.sopts, tee=self.tee)
+        self.reportModelSize(stsolver.ef_instance)
         if ef_sol.solver.termination_condition != TerminationCondition.optimal:
           raise RuntimeError("Solver did not report optimality:\n%s" %(ef_sol.solver))
         # TODO: Add collect output and return a dictionary for raven to retrieve information
@@ -265,6 +476,7 @@ class PySPBase(ModelBase):
         # fsfct the callback function for pysp_instance_creation_callback
         # tree_model generated by pysp_scenario_tree_model_callback
         stsolver = rapper.StochSolver("", fsfct=self.pysp_instance_creation_callback, tree_model=tree_model, phopts=self.phopts)
+        self.reportConstructionTime()
         ph_sol = stsolver.solve_ph(subsolver=self.solver, default_rho=self.phRho, phopts=self.phopts, sopts=self.sopts, tee=self.tee)
         # TODO: Add collect output and return a dictionary for raven to retrieve information
         # first retrieve the xhat solution from solver, then print the solution
@@ -277,9 +489,137 @@ class PySPBase(ModelBase):
         self.printScenarioSolution(stsolver)
         outputDict.update(self.getScenarioSolution(stsolver.scenario_tree))
         self.output.update(outputDict)
+      elif self.stochSolver == 'saa':
+        outputDict.update(self.runSAA())
+        self.output.update(outputDict)
 
     return outputDict
 
+  def solveSampledEF(self, scenarios, xhat=None):
+    """
+      Solve the extensive form of the stochastic program over the given scenarios, the scenarios are only used
+      by the scenario tree and the instance creation callbacks during the solve, and self.scenarios is restored
+      afterwards, even if the solve fails
+      @ In, scenarios, ScenarioSubspace, the scenarios used to build the extensive form
+      @ In, xhat, dict, optional, first stage solution {(varName, index):value} to fix in each scenario instance
+      @ Out, (stsolver, obj), tuple, the pyomo stochastic programming solver instance and the optimal objective
+    """
+    original, self.scenarios = self.scenarios, scenarios
+    self._fixedFirstStage = xhat
+    try:
+      tree_model = self.pysp_scenario_tree_model_callback()
+      stsolver = rapper.StochSolver("", fsfct=self.pysp_instance_creation_callback, tree_model=tree_model)
+      ef_sol = stsolver.solve_ef(self.solver, sopts=self.sopts, tee=self.tee)
+    finally:
+      self.scenarios = original
+      self._fixedFirstStage = None
+    if ef_sol.solver.termination_condition != TerminationCondition.optimal:
+      raise RuntimeError("Solver did not report optimality:\n%s" %(ef_sol.solver))
+    obj = pyomo.value(stsolver.ef_instance.MASTER)
+    return stsolver, obj
+
+  def solveSAAReplication(self, indices, probabilities, xhat):
+    """
+      Solve one replication of sample average approximation, i.e. solve the sampled problem and evaluate the
+      candidate solution on the same samples
+      @ In, indices, numpy.array, sampled scenario indices of the original scenario space
+      @ In, probabilities, numpy.array, empirical probabilities of the sampled scenarios
+      @ In, xhat, dict, candidate first stage solution {(varName, index):value}
+      @ Out, (obj, objXhat), tuple, optimal objective and objective given xhat of the sampled problem
+    """
+    scenarios = self._saaSpace.subspace(indices, probabilities)
+    _, obj = self.solveSampledEF(scenarios)
+    _, objXhat = self.solveSampledEF(scenarios, xhat=xhat)
+    return obj, objXhat
+
+  def firstStageDecisions(self):
+    """
+      Get the names of the first stage variables that define the candidate solution of sample average
+      approximation, i.e. the priority variables, the auxiliary first stage variables (i.e. 'u' of CVaR) are
+      optimized in each replication
+      @ In, None
+      @ Out, firstStageDecisions, list, names of the first stage decision variables
+    """
+    return ['y']
+
+  def getFirstStageSolution(self, stsolver):
+    """
+      Get the solution of the first stage decision variables from the root node of the scenario tree
+      @ In, stsolver, instance, pyomo stochastic programming solver instance
+      @ Out, xhat, dict, first stage solution {(varName, index):value}
+    """
+    xhat = {}
+    names = self.firstStageDecisions()
+    rootNode = stsolver.scenario_tree._stages[0]._tree_nodes[0]
+    for varId, (varName, index) in rootNode._variable_ids.items():
+      if varName in names:
+        xhat[(varName, index)] = round(rootNode._solution[varId])
+    if not xhat:
+      # the replications would be solved without the candidate solution, i.e. the optimality gap is always zero
+      raise RuntimeError('First stage decisions "{}" are not found in the scenario tree of {}!'.format(', '.join(names), self.name))
+    return xhat
+
+  def runSAA(self):
+    """
+      Sample average approximation with the multiple replication procedure, i.e. a candidate solution xhat is
+      obtained from one sampled problem, and the optimality gap of xhat is estimated with independent replications
+      @ In, None
+      @ Out, outputDict, dict, the scenario solution of the candidate sampled problem
+    """
+    global _saaModel
+    scenarios = self.scenarios
+    self.saaCandidate = None
+    rng = np.random.default_rng(self.saaSeed)
+    logger.info('Sample average approximation with %d samples and %d replications', self.saaSamples, self.saaReplications)
+    # candidate solution, the scenario info is reported for the candidate sampled problem
+    candidate = scenarios.sample(self.saaSamples, rng)
+    self.saaCandidate = candidate
+    # the samples are always subspaces of the original scenario space
+    self._saaSpace = candidate.space
+    stsolver, candidateObj = self.solveSampledEF(candidate)
+    xhat = self.getFirstStageSolution(stsolver)
+    self.printScenarioSolution(stsolver)
+    outputDict = self.getScenarioSolution(stsolver.scenario_tree)
+    # replications for the optimality gap
+    samples = [scenarios.sample(self.saaSamples, rng) for _ in range(self.saaReplications)]
+    args = [(sample.indices, sample.probabilities(), xhat) for sample in samples]
+    start = time.time()
+    if self.saaWorkers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+      _saaModel = self
+      try:
+        with multiprocessing.get_context('fork').Pool(self.saaWorkers) as pool:
+          results = pool.map(_solveSAAReplication, args)
+      finally:
+        _saaModel = None
+    else:
+      results = [self.solveSAAReplication(*arg) for arg in args]
+    logger.info('Solved %d replications in %.4f seconds', self.saaReplications, time.time() - start)
+    results = np.asarray(results)
+    # the optimal objective of sampled problem is an upper bound of the objective given xhat for maximization
+    sign = 1.0 if self.sense == pyomo.maximize else -1.0
+    gaps = sign * (results[:,0] - results[:,1])
+    nRep = self.saaReplications
+    gapMean = float(np.mean(gaps))
+    gapStd = float(np.std(gaps, ddof=1))
+    self.saaStatistics = collections.OrderedDict()
+    self.saaStatistics['samples'] = self.saaSamples
+    self.saaStatistics['replications'] = nRep
+    self.saaStatistics['candidate_objective'] = candidateObj
+    self.saaStatistics['objective_mean'] = float(np.mean(results[:,0]))
+    self.saaStatistics['objective_given_xhat_mean'] = float(np.mean(results[:,1]))
+    self.saaStatistics['gap_mean'] = gapMean
+    self.saaStatistics['gap_stddev'] = gapStd
+    logger.info('Estimated optimality gap of candidate solution: %.6g (standard deviation %.6g)', gapMean, gapStd)
+    # one sided confidence interval [0, gapMean + t * gapStd / sqrt(nRep)] with nRep - 1 degrees of freedom
+    if nRep - 1 in t_table_values:
+      for alpha, tValue in sorted(t_table_values[nRep - 1].items()):
+        width = gapMean + tValue * gapStd / np.sqrt(nRep)
+        self.saaStatistics['gap_ci_alpha_' + str(alpha)] = width
+        logger.info('Confidence interval of optimality gap for alpha=%s: [0, %.6g]', alpha, width)
+    else:
+      logger.warning('No built-in t-table entries for %d degrees of freedom, the confidence interval is not computed', nRep - 1)
+    return outputDict
+
 
   def printScenarioSolution(self, stsolver):
     """
@@ -299,14 +639,30 @@ class PySPBase(ModelBase):
       @ Out, None
     """
     fileObj = open(filename,"w")
+    if self.reductionError is not None:
+      fileObj.write("Scenario reduction error: %10.4f\n" % self.reductionError)
+    if self.saaStatistics is not None:
+      fileObj.write("Sample average approximation: \n")
+      for key, val in self.saaStatistics.items():
+        fileObj.write("\t%s: %s\n" % (key, val))
+    # the scenarios of the candidate sampled problem of sample average approximation
+    scenarios = self.saaCandidate if self.saaCandidate is not None else self.scenarios
     fileObj.write("Scenarios: \n")
-    for scenarioName, scenarioInfo in self.scenarios['scenario_data'].items():
+    for k, (scenarioName, scenarioInfo) in enumerate(scenarios.items()):
       fileObj.write("\t%s:\n" %scenarioName)
       for var, valDict in scenarioInfo.items():
         fileObj.write("\t\t%s:" % var)
         for val in valDict.values():
           fileObj.write("%10.4f" % val)
         fileObj.write("\n")
+      members = scenarios.members(k) if getattr(scenarios, 'factorMembers', None) is not None else None
+      if members is not None:
+        fileObj.write("\t\tmerged from: %s\n" % ", ".join(scenarios.space.scenarioName(i) for i in members))
+      if self.distData is not None:
+        fileObj.write("\t\tdist:")
+        for val in np.ravel(self.distData[k,:]):
+          fileObj.write("%10.4f" % val)
+        fileObj.write("\n")
     fileObj.close()
 
   def getScenarioSolution(self, ts):
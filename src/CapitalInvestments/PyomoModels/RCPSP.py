@@ -78,24 +78,30 @@ class RCPSP(ModelBase):
       @ In, None
       @ Out, data, dict, input data for pyomo model
     """
-    data = {}
-    # Generate input set data
-    indexList = ['tasks', 'resources', 'predecessors', 'successors']
-    for indexName in indexList:
-      data[indexName] = self.processInputSets(indexName, required=True)
-
-    data['makespan_upperbound'] = {None: self.makespanUpperbound}
-    # set the Parameters with the extended indices
-    for paramName, paramInfo in self.paramsAuxInfo.items():
-      options = paramInfo['options']
-      maxDim = paramInfo['maxDim']
-      if paramName not in self.params.keys():
-        raise IOError('Required node ' + paramName + ' is not found in input file, please specify it under node "Parameters"!')
-      else:
-        data[paramName] = self.setParameters(paramName, options, maxDim, self.params[paramName])
+    # Generate input set data and the Parameters with the extended indices
+    names = ['tasks', 'resources', 'predecessors', 'successors', 'makespan_upperbound'] + list(self.paramsAuxInfo.keys())
+    data = dict((name, self.componentData(name)) for name in names)
     data = {None:data}
     return data
 
+  def componentData(self, name):
+    """
+      Get the input data of given component, the sets and the parameters are taken from the index-to-value maps
+      of self.sets and self.params, see self.setParameters
+      @ In, name, str, name of pyomo component
+      @ Out, data, dict, data of the component, None if the data is not provided
+    """
+    if name in ['tasks', 'resources', 'predecessors', 'successors']:
+      return self.processInputSets(name, required=True)
+    elif name == 'makespan_upperbound':
+      return {None: self.makespanUpperbound}
+    elif name in self.paramsAuxInfo:
+      if name not in self.params.keys():
+        raise IOError('Required node ' + name + ' is not found in input file, please specify it under node "Parameters"!')
+      paramInfo = self.paramsAuxInfo[name]
+      return self.setParameters(name, paramInfo['options'], paramInfo['maxDim'], self.params[name])
+    return None
+
   def setParameters(self, paramName, options, maxDim, initParamDict):
     """
       Method to generate Parameter input for pyomo model
@@ -148,18 +154,18 @@ class RCPSP(ModelBase):
       @ In, None
       @ Out, model, pyomo model instance, pyomo abstract model
     """
-    model = pyomo.AbstractModel()
+    model = self.newModel()
     ### Sets
-    model.tasks = pyomo.Set()
-    model.resources = pyomo.Set()
-    model.predecessors = pyomo.Set()
-    model.successors = pyomo.Set(dimen=2)
+    model.tasks = pyomo.Set(initialize=self.modelData('tasks'))
+    model.resources = pyomo.Set(initialize=self.modelData('resources'))
+    model.predecessors = pyomo.Set(initialize=self.modelData('predecessors'))
+    model.successors = pyomo.Set(dimen=2, initialize=self.modelData('successors'))
     ### Params
-    model.makespan_upperbound = pyomo.Param(within=pyomo.NonNegativeIntegers)
-    model.available_resources = pyomo.Param(model.resources)
-    model.task_resource_consumption = pyomo.Param(model.tasks, model.resources)
-    model.task_duration = pyomo.Param(model.tasks)
-    model.task_successors = pyomo.Param(model.successors)
+    model.makespan_upperbound = pyomo.Param(within=pyomo.NonNegativeIntegers, initialize=self.modelData('makespan_upperbound'))
+    model.available_resources = pyomo.Param(model.resources, initialize=self.modelData('available_resources'))
+    model.task_resource_consumption = pyomo.Param(model.tasks, model.resources, initialize=self.modelData('task_resource_consumption'))
+    model.task_duration = pyomo.Param(model.tasks, initialize=self.modelData('task_duration'))
+    model.task_successors = pyomo.Param(model.successors, initialize=self.modelData('task_successors'))
     model.time_periods = pyomo.RangeSet(1, model.makespan_upperbound)
     return model
 
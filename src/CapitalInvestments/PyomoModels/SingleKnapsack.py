@@ -13,7 +13,9 @@ warnings.simplefilter('default',DeprecationWarning)
 
 #External Modules------------------------------------------------------------------------------------
 import numpy as np
+import scipy.sparse as sparse
 import itertools
+import collections
 import logging
 import pyomo.environ as pyomo
 #External Modules End--------------------------------------------------------------------------------
@@ -73,9 +75,9 @@ class SingleKnapsack(KnapsackBase):
       @ Out, model, pyomo model instance, pyomo abstract model
     """
     model = KnapsackBase.initializeModel(self)
-    model.net_present_values = pyomo.Param(model.investments, mutable=True)
-    model.available_capitals = pyomo.Param(model.time_periods, mutable=True)
-    model.costs = pyomo.Param(model.investments, model.time_periods, mutable=True)
+    model.net_present_values = pyomo.Param(model.investments, mutable=True, initialize=self.modelData('net_present_values'))
+    model.available_capitals = pyomo.Param(model.time_periods, mutable=True, initialize=self.modelData('available_capitals'))
+    model.costs = pyomo.Param(model.investments, model.time_periods, mutable=True, initialize=self.modelData('costs'))
     return model
 
   def addConstraints(self, model):
@@ -96,7 +98,12 @@ class SingleKnapsack(KnapsackBase):
         return model.x[i] == 1
       model.constraintRegulatory = pyomo.Constraint(model.mandatory, rule=constraintRegulatory)
 
-    if self.uncertainties is not None:
+    if self.uncertainties is not None and self.priorityFormulation == 'rank':
+      def consistentConstraintI(model, i):
+        """Constraint for variable rank if priority project selection is required"""
+        return self.rankConsistentConstraint(model, i, model.x[i])
+      model.consistentConstraintI = pyomo.Constraint(model.investments, rule=consistentConstraintI)
+    elif self.uncertainties is not None:
       def consistentConstraintI(model, i, j):
         """Constraint for variable y if priority project selection is required"""
         if i == j:
@@ -116,7 +123,7 @@ class SingleKnapsack(KnapsackBase):
     model = KnapsackBase.addVariables(self, model)
     def boundsExpression(model, i):
       """ set the bounds for soluion variable x using lowerBounds and upperBounds"""
-      return (self.lowerBounds[i], self.upperBounds[i])
+      return self.investmentBounds(i)
     model.x = pyomo.Var(model.investments, domain=pyomo.NonNegativeIntegers, bounds=boundsExpression)
     return model
 
@@ -189,17 +196,15 @@ class SingleKnapsack(KnapsackBase):
     outputDict = KnapsackBase.printSolution(self, model)
     msg = "Selected investments include:"
     logger.info(msg)
-    for var in model.component_objects(pyomo.Var, active=True):
-      if var.name == 'x':
-        for index in var:
-          numSelected = pyomo.value(var[index])
-          outputDict[str(index)] = [numSelected]
-          if numSelected == 1:
-            msg = "Investment: " + str(index) + " is selected"
-            logger.info(msg)
-          elif numSelected > 1:
-            msg = "Investment: " + str(index) + " is selected with limit " + str(int(numSelected))
-            logger.info(msg)
+    solution = collections.OrderedDict((str(index), [pyomo.value(model.x[index])]) for index in model.x)
+    for index, (numSelected,) in self.disaggregateSolution(solution).items():
+      outputDict[index] = [numSelected]
+      if numSelected == 1:
+        msg = "Investment: " + str(index) + " is selected"
+        logger.info(msg)
+      elif numSelected > 1:
+        msg = "Investment: " + str(index) + " is selected with limit " + str(int(numSelected))
+        logger.info(msg)
     # for item in model.investments:
     #   numSelected = pyomo.value(model.x[item])
     #   if numSelected == 1:
@@ -214,7 +219,8 @@ class SingleKnapsack(KnapsackBase):
     # In some cases, a solver plugin will raise an exception if it encounters a Suffix type that it does not handle
     # One should be careful in verifying that Suffix declarations are being handled as expected when switching
     # to a different solver or solver interface.
-    if self.solver == 'cbc':
+    # the duals are not available if the solution is reused without solving
+    if self.solver == 'cbc' and self.dualsAvailable:
       logger.info("Duals Information for Constraint Capacity:")
       print("Time_Periods      Capacity_Margin")
       for const in model.component_objects(pyomo.Constraint, active=True):
@@ -223,3 +229,74 @@ class SingleKnapsack(KnapsackBase):
             print("{0:10s} {1:10.1f}".format(index, model.dual[const[index]]))
 
     return outputDict
+
+  def matrixIndexLists(self, data):
+    """
+      Get the index lists of the parameters that are used by the matrix model
+      @ In, data, dict, input data for pyomo model, i.e. self.generateModelInputData()[None]
+      @ Out, indexLists, dict, {paramName: list of index lists}
+    """
+    indexLists = KnapsackBase.matrixIndexLists(self, data)
+    investments, timePeriods = data['investments'][None], data['time_periods'][None]
+    indexLists['net_present_values'] = [investments]
+    indexLists['available_capitals'] = [timePeriods]
+    indexLists['costs'] = [investments, timePeriods]
+    return indexLists
+
+  def addMatrixScenario(self, lp, data, params, firstStage, prefix=''):
+    """
+      Add the variables and constraints of one scenario to the matrix model
+      @ In, lp, matrixUtils.LinearProgram, the mixed integer linear program
+      @ In, data, dict, input data for pyomo model, i.e. self.generateModelInputData()[None]
+      @ In, params, dict, {paramName: numpy.array}, the parameter arrays of this scenario
+      @ In, firstStage, collections.OrderedDict, {varName: (indices, columns)} of the first stage variables
+      @ In, prefix, str, optional, prefix of the names of the variables and constraints, i.e. the scenario name
+      @ Out, variables, collections.OrderedDict, {varName: (indices, columns)} of the second stage variables
+    """
+    variables = KnapsackBase.addMatrixScenario(self, lp, data, params, firstStage, prefix)
+    investments = data['investments'][None]
+    n = len(investments)
+    lower, upper = (np.asarray(bounds, dtype=float) for bounds in zip(*(self.investmentBounds(i) for i in investments)))
+    x = lp.addVariables(prefix + 'x', investments, lower=lower, upper=upper, integer=True)
+    variables['x'] = (investments, x)
+    lp.addConstraints(prefix + 'constraintCapacity', data['time_periods'][None], params['costs'].T, x, upper=params['available_capitals'])
+    if self.mandatory is not None:
+      positions = dict((i, pos) for pos, i in enumerate(investments))
+      mandatory = np.asarray(list(positions[i] for i in self.mandatory), dtype=int)
+      coeffs = (np.ones(len(mandatory)), (np.arange(len(mandatory)), mandatory))
+      lp.addConstraints(prefix + 'constraintRegulatory', self.mandatory, coeffs, x, lower=1.0, upper=1.0)
+    if self.uncertainties is not None and self.optionalConstraints['consistentConstraintI']:
+      self.addMatrixConsistentConstraint(lp, prefix + 'consistentConstraintI', sparse.identity(n), x, firstStage, variables)
+    return variables
+
+  def printMatrixSolution(self, lp, values, duals):
+    """
+      Output the optimization solution of the matrix backend to screen
+      @ In, lp, matrixUtils.LinearProgram, the mixed integer linear program
+      @ In, values, numpy.array, the values of the variables
+      @ In, duals, numpy.array, the duals of the constraints
+      @ Out, outputDict, dict, dictionary stores the outputs
+    """
+    outputDict = KnapsackBase.printMatrixSolution(self, lp, values, duals)
+    if self.uncertainties is not None:
+      return outputDict
+    msg = "Selected investments include:"
+    logger.info(msg)
+    _, _, variables, _, _ = self._matrixScenarios[0]
+    solution = collections.OrderedDict((str(index), [values[col]]) for index, col in zip(*variables['x']))
+    for index, (numSelected,) in self.disaggregateSolution(solution).items():
+      outputDict[index] = [numSelected]
+      if numSelected == 1:
+        msg = "Investment: " + str(index) + " is selected"
+        logger.info(msg)
+      elif numSelected > 1:
+        msg = "Investment: " + str(index) + " is selected with limit " + str(int(numSelected))
+        logger.info(msg)
+    outputDict['MaxNPV'] = lp.objectiveValue(values)
+    logger.info("Maximum NPV: %16.4f" %(outputDict['MaxNPV']))
+    if self.solver in ['cbc', 'highs_inprocess']:
+      logger.info("Duals Information for Constraint Capacity:")
+      print("Time_Periods      Capacity_Margin")
+      for index, row in zip(*lp.constraintBlock('constraintCapacity')):
+        print("{0:10s} {1:10.1f}".format(index, duals[row]))
+    return outputDict
@@ -1,2 +1,4 @@
 # Copyright 2020, Battelle Energy Alliance, LLC
 # ALL RIGHTS RESERVED
+
+__version__ = '0.0.1'
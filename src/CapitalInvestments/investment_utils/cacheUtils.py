@@ -0,0 +1,358 @@
+# Copyright 2020, Battelle Energy Alliance, LLC
+# ALL RIGHTS RESERVED
+"""
+  Created on Oct. 18, 2026
+  @author: wangc, mandd
+"""
+#External Modules------------------------------------------------------------------------------------
+import collections
+import collections.abc
+import copy
+import glob
+import hashlib
+import logging
+import os
+import pickle
+import re
+import tempfile
+import xml.etree.ElementTree as ET
+import numpy as np
+#External Modules End--------------------------------------------------------------------------------
+
+#Internal Modules------------------------------------------------------------------------------------
+try:
+  from CapitalInvestments import __version__
+except ImportError:
+  from LOGOS.src.CapitalInvestments import __version__
+#Internal Modules End--------------------------------------------------------------------------------
+
+logger = logging.getLogger(__name__)
+
+# modules that are used to process the input, any change of them invalidates the cached inputs
+_readerModules = ['inputReader.py', 'investmentUtils.py']
+_readerVersion = None
+# modules that are used to solve the problem, any change of them invalidates the cached solutions
+_modelModules = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'PyomoModels', '*.py')
+_modelVersion = None
+# attribute "file" of the data nodes, i.e. the external data files that are referenced by the input
+_fileAttribPattern = re.compile(br'\sfile\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+
+def readerVersion():
+  """
+    Get the version of the input reader, i.e. the LOGOS version and the digest of the input reader source files
+    @ In, None
+    @ Out, readerVersion, str, the version of the input reader
+  """
+  global _readerVersion
+  if _readerVersion is None:
+    digest = hashlib.sha256(__version__.encode())
+    for module in _readerModules:
+      with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), module), 'rb') as moduleFile:
+        digest.update(moduleFile.read())
+    _readerVersion = digest.hexdigest()
+  return _readerVersion
+
+def modelVersion():
+  """
+    Get the version of the optimization models, i.e. the input reader version and the digest of the model source files
+    @ In, None
+    @ Out, modelVersion, str, the version of the optimization models
+  """
+  global _modelVersion
+  if _modelVersion is None:
+    digest = hashlib.sha256(readerVersion().encode())
+    for module in sorted(glob.glob(_modelModules)):
+      with open(module, 'rb') as moduleFile:
+        digest.update(moduleFile.read())
+    _modelVersion = digest.hexdigest()
+  return _modelVersion
+
+def _updateDigest(digest, data, decimals=None):
+  """
+    Update the digest with the canonical form of the data, i.e. the mappings are sorted by keys, and the numbers
+    are converted to floats and rounded to given decimals
+    @ In, digest, hashlib.sha256, the digest to update
+    @ In, data, object, nested mappings and lists of strings, numbers and numpy arrays
+    @ In, decimals, int, optional, the number of decimals that the numbers are rounded to, not rounded if None
+    @ Out, None
+  """
+  if isinstance(data, collections.abc.Mapping):
+    digest.update(b'{')
+    for key in sorted(data, key=repr):
+      _updateDigest(digest, key, decimals)
+      _updateDigest(digest, data[key], decimals)
+    digest.update(b'}')
+  elif isinstance(data, (list, tuple)):
+    digest.update(b'[')
+    for val in data:
+      _updateDigest(digest, val, decimals)
+    digest.update(b']')
+  elif isinstance(data, np.ndarray) and data.dtype.kind in 'biuf':
+    array = data.astype(float)
+    if decimals is not None:
+      array = np.round(array, decimals)
+    # -0.0 and 0.0 are the same value
+    array[array == 0.0] = 0.0
+    digest.update(str(array.shape).encode())
+    digest.update(np.ascontiguousarray(array).tobytes())
+  elif isinstance(data, np.ndarray):
+    _updateDigest(digest, data.tolist(), decimals)
+  elif isinstance(data, (int, float, np.number)) and not isinstance(data, (bool, np.bool_)):
+    val = float(data) if decimals is None else round(float(data), decimals)
+    digest.update(repr(val + 0.0).encode())
+  else:
+    digest.update(type(data).__name__.encode())
+    digest.update(repr(data).encode())
+  digest.update(b';')
+
+def computeSolutionKey(initDict, decimals=None):
+  """
+    Compute the cache key of the solution of given problem, i.e. the hash of the canonical form of the processed
+    input, the content of the external constraint modules and the version of the optimization models
+    @ In, initDict, dict, dictionary of preprocessed input data, see inputReader.readInput
+    @ In, decimals, int, optional, the number of decimals that the numbers are rounded to, so that the problems
+      that only differ below the rounding share the solution
+    @ Out, key, str, the cache key
+  """
+  digest = hashlib.sha256(modelVersion().encode())
+  _updateDigest(digest, initDict, decimals)
+  workingDir = (initDict.get('Settings', None) or {}).get('workingDir', '.')
+  for module in sorted((initDict.get('ExternalConstraints', None) or {}).values()):
+    filename = module if module.endswith('.py') else module + '.py'
+    filename = filename if os.path.isabs(filename) else os.path.join(workingDir, filename)
+    if os.path.isfile(filename):
+      with open(filename, 'rb') as moduleFile:
+        digest.update(moduleFile.read())
+  return digest.hexdigest()
+
+def computeKey(inputData, workingDir='.'):
+  """
+    Compute the cache key of given input, i.e. the hash of the input content, the content of the data files
+    referenced by the input, the working directory and the input reader version
+    @ In, inputData, str or xml.etree.ElementTree.Element or xml.etree.ElementTree.ElementTree, input filename or xml
+    @ In, workingDir, str, optional, the directory that is used to locate the data files
+    @ Out, key, str, the cache key
+  """
+  digest = hashlib.sha256(readerVersion().encode())
+  digest.update(os.path.abspath(workingDir).encode())
+  if isinstance(inputData, str):
+    with open(inputData, 'rb') as inputFile:
+      content = inputFile.read()
+    dataFiles = list((match[0] or match[1]).decode() for match in _fileAttribPattern.findall(content))
+  else:
+    root = inputData.getroot() if isinstance(inputData, ET.ElementTree) else inputData
+    content = ET.tostring(root)
+    dataFiles = list(node.get('file') for node in root.iter() if node.get('file') is not None)
+  digest.update(content)
+  for dataFile in dataFiles:
+    filename = dataFile if os.path.isabs(dataFile) else os.path.join(workingDir, dataFile)
+    digest.update(dataFile.encode())
+    if os.path.isfile(filename):
+      with open(filename, 'rb') as data:
+        for block in iter(lambda: data.read(1 << 20), b''):
+          digest.update(block)
+  return digest.hexdigest()
+
+class DiskCache(object):
+  """
+    On-disk cache of pickled data with least-recently-used eviction when the total size of the cache exceeds the
+    limit. The files are replaced atomically, so that the cache directory can be shared by several processes
+  """
+  description = 'data' # description of the cached data, used by the log messages
+
+  def __init__(self, cacheDir, maxSize=512):
+    """
+      Constructor
+      @ In, cacheDir, str, the cache directory
+      @ In, maxSize, float, optional, the maximum size of the cache in MB
+      @ Out, None
+    """
+    self.cacheDir = os.path.abspath(os.path.expanduser(cacheDir))
+    self.maxSize = int(float(maxSize) * 1024 * 1024)
+    os.makedirs(self.cacheDir, exist_ok=True)
+
+  def _path(self, key):
+    """
+      Get the cache file of given key
+      @ In, key, str, the cache key
+      @ Out, _path, str, the cache file
+    """
+    return os.path.join(self.cacheDir, key + '.pk')
+
+  def load(self, key):
+    """
+      Load the cached data
+      @ In, key, str, the cache key
+      @ Out, data, object, the cached data, None if it is not found
+    """
+    path = self._path(key)
+    try:
+      with open(path, 'rb') as cacheFile:
+        data = pickle.load(cacheFile)
+    except FileNotFoundError:
+      return None
+    except Exception as err:
+      logger.warning('Remove the invalid cache file %s: %s', path, err)
+      self._remove(path)
+      return None
+    # update the access time for the eviction
+    os.utime(path)
+    logger.info('Load the %s from cache: %s', self.description, path)
+    return data
+
+  def store(self, key, data):
+    """
+      Store the data
+      @ In, key, str, the cache key
+      @ In, data, object, the data to cache
+      @ Out, None
+    """
+    fd, tempPath = tempfile.mkstemp(dir=self.cacheDir, suffix='.tmp')
+    try:
+      with os.fdopen(fd, 'wb') as cacheFile:
+        pickle.dump(data, cacheFile, protocol=pickle.HIGHEST_PROTOCOL)
+      os.replace(tempPath, self._path(key))
+    except Exception as err:
+      logger.warning('Failed to cache the %s: %s', self.description, err)
+      self._remove(tempPath)
+      return
+    logger.info('Store the %s in cache: %s', self.description, self._path(key))
+    self.evict()
+
+  def evict(self):
+    """
+      Remove the least recently used cache files until the total size does not exceed the limit
+      @ In, None
+      @ Out, None
+    """
+    entries = []
+    for name in os.listdir(self.cacheDir):
+      if not name.endswith('.pk'):
+        continue
+      path = os.path.join(self.cacheDir, name)
+      try:
+        stat = os.stat(path)
+      except OSError:
+        continue
+      entries.append((stat.st_mtime, stat.st_size, path))
+    totalSize = sum(entry[1] for entry in entries)
+    for _, size, path in sorted(entries):
+      if totalSize <= self.maxSize:
+        break
+      logger.debug('Evict cache file: %s', path)
+      self._remove(path)
+      totalSize -= size
+
+  @staticmethod
+  def _remove(path):
+    """
+      Remove the file if it exists
+      @ In, path, str, the file to remove
+      @ Out, None
+    """
+    try:
+      os.remove(path)
+    except OSError:
+      pass
+
+class InputCache(DiskCache):
+  """
+    On-disk cache of the processed inputs, i.e. the initDict returned by inputReader.readInput
+  """
+  description = 'processed input'
+
+class SolutionCache(object):
+  """
+    Cache of the solutions (i.e. the outputDict returned by the run of the optimization models and the values of
+    the variables) keyed by the canonical form of the problem, with a least-recently-used in-memory tier and an
+    optional on-disk tier that can be shared by several processes
+  """
+  def __init__(self, maxEntries=128, cacheDir=None, maxSize=512, decimals=None):
+    """
+      Constructor
+      @ In, maxEntries, int, optional, the maximum number of solutions kept in memory
+      @ In, cacheDir, str, optional, the directory of the on-disk tier, not used if None
+      @ In, maxSize, float, optional, the maximum size of the on-disk tier in MB
+      @ In, decimals, int, optional, the number of decimals that the numbers of the problem are rounded to when
+        the cache key is computed, not rounded if None
+      @ Out, None
+    """
+    self.maxEntries = int(maxEntries)
+    self.decimals = None if decimals is None else int(decimals)
+    self.disk = SolutionDiskCache(cacheDir, maxSize) if cacheDir is not None else None
+    self.hits = 0
+    self.misses = 0
+    self._memory = collections.OrderedDict()
+
+  def computeKeys(self, initDict):
+    """
+      Compute the cache key of given problem, and the key of the exact problem, i.e. without rounding
+      @ In, initDict, dict, dictionary of preprocessed input data, see inputReader.readInput
+      @ Out, (key, exactKey), tuple, the cache key and the key of the exact problem
+    """
+    exactKey = computeSolutionKey(initDict)
+    key = computeSolutionKey(initDict, self.decimals) if self.decimals is not None else exactKey
+    return key, exactKey
+
+  def load(self, key):
+    """
+      Load the cached solution, from the memory first and then from the disk
+      @ In, key, str, the cache key
+      @ Out, entry, dict, a copy of the cached solution, {'exactKey':str, 'output':dict, 'solution':dict}, where
+        'exactKey' is the key of the exact problem that is solved, 'output' is the outputDict of the model, and
+        'solution' is the values of the variables, {varName:{index:value}} or None; None if it is not found
+    """
+    if key in self._memory:
+      self._memory.move_to_end(key)
+      entry = self._memory[key]
+    else:
+      entry = self.disk.load(key) if self.disk is not None else None
+      if entry is None:
+        return None
+      self._remember(key, entry)
+    return copy.deepcopy(entry)
+
+  def store(self, key, exactKey, outputDict, solution=None):
+    """
+      Store the solution
+      @ In, key, str, the cache key
+      @ In, exactKey, str, the key of the exact problem that is solved
+      @ In, outputDict, dict, the outputs of the solution
+      @ In, solution, dict, optional, the values of the variables, {varName:{index:value}}
+      @ Out, None
+    """
+    entry = copy.deepcopy({'exactKey':exactKey, 'output':outputDict, 'solution':solution})
+    self._remember(key, entry)
+    if self.disk is not None:
+      self.disk.store(key, entry)
+
+  def record(self, reused):
+    """
+      Record whether the cached solution is reused
+      @ In, reused, bool, True if the cached solution is reused
+      @ Out, None
+    """
+    if reused:
+      self.hits += 1
+      logger.info('Reuse the cached solution, %d hits and %d misses', self.hits, self.misses)
+    else:
+      self.misses += 1
+
+  def _remember(self, key, entry):
+    """
+      Keep the solution in memory, the least recently used solutions are removed when the number of solutions
+      exceeds the limit
+      @ In, key, str, the cache key
+      @ In, entry, dict, the solution
+      @ Out, None
+    """
+    self._memory[key] = entry
+    self._memory.move_to_end(key)
+    while len(self._memory) > self.maxEntries:
+      self._memory.popitem(last=False)
+
+class SolutionDiskCache(DiskCache):
+  """
+    On-disk cache of the solutions of the optimization models
+  """
+  description = 'solution'
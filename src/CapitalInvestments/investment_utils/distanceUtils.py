@@ -29,19 +29,24 @@ def preprocessData(scenarioDict):
     data.append(paramData)
   return data
 
-def computeDist(distName, scenarioDict, kwargs={}):
+def computeDist(distName, scenarioDict, kwargs={}, otherData=None):
   """
     Compute distance based on given distance metric name
     @ In, distName, str, the name of distance metric.
       i.e. euclidean, manhattan, chebyshev, minkowski, wminkowski, seuclidean and mahalanobis.
-    @ In, scenarioDict, dict, contains scenario data.
-      i.e. {'scenario_i':{'paramName':{index/indexTuple:value}}}
+    @ In, scenarioDict, dict or numpy.array, contains scenario data.
+      i.e. {'scenario_i':{'paramName':{index/indexTuple:value}}}, or 2-D array with shape (numberScenarios, paramsVariationSize)
     @ In, kwargs, dict, options for the distance metric
+    @ In, otherData, numpy.array, optional, 2-D array of other scenarios, if provided, the distance between the
+      scenarios of scenarioDict and otherData is computed
     @ Out, distData, numpy.array, 2-D numpy array contains the pairwise distance between scenarios
   """
   logger.debug('Compute "{}" distance for given scenarios'.format(distName))
   dist = DistanceMetric.get_metric(distName, **kwargs)
-  data = preprocessData(scenarioDict)
-  distData = dist.pairwise(data)
+  if isinstance(scenarioDict, np.ndarray):
+    data = scenarioDict
+  else:
+    data = preprocessData(scenarioDict)
+  distData = dist.pairwise(data) if otherData is None else dist.pairwise(data, otherData)
   # print("distance: ", distData)
   return distData
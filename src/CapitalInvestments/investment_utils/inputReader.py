@@ -12,9 +12,9 @@ warnings.simplefilter('default',DeprecationWarning)
 
 #External Modules------------------------------------------------------------------------------------
 import xml.etree.ElementTree as ET
+import copy
 import itertools
 import numpy as np
-import numpy_financial as npf
 import collections
 import logging
 import os
@@ -24,8 +24,10 @@ import pandas as pd
 #Internal Modules------------------------------------------------------------------------------------
 try:
   from LOGOS.src.CapitalInvestments.investment_utils import investmentUtils as utils
+  from LOGOS.src.CapitalInvestments.investment_utils import cacheUtils
 except ImportError:
   from CapitalInvestments.investment_utils import investmentUtils as utils
+  from CapitalInvestments.investment_utils import cacheUtils
 #Internal Modules End--------------------------------------------------------------------------------
 
 logger = logging.getLogger(__name__)
@@ -56,11 +58,64 @@ def computeIndices(indexNameList, setsDict):
     indices = list(itertools.product(*indices))
   return indices
 
-def readSets(root, nodeTag):
+def loadDataFile(node, workingDir='.', dtype=float):
+  """
+    Load the data of given xml node from the external file provided by the attribute "file".
+    Supported formats: CSV (.csv, .txt), NumPy (.npy, memory-mapped; .npz), Parquet (.parquet, requires pyarrow
+    or fastparquet) and HDF5 (.h5, .hdf5, requires h5py). The optional attribute "key" selects the array of .npz
+    and HDF5 files (default to the node tag) or the column of CSV (with header row) and Parquet files.
+    @ In, node, xml.etree.ElementTree.Element, xml element node
+    @ In, workingDir, str, optional, the directory that is used to locate the relative file path
+    @ In, dtype, type, optional, the data type of CSV files, float or str
+    @ Out, data, numpy.array, the data stored in the file (numpy.memmap for .npy files)
+  """
+  filename = node.get('file')
+  key = node.get('key')
+  if not os.path.isabs(filename):
+    filename = os.path.join(workingDir, filename)
+  if not os.path.isfile(filename):
+    raise IOError('The data file "' + filename + '" provided for node ' + node.tag + ' is not found!')
+  logger.debug('Load data of node %s from file %s', node.tag, filename)
+  ext = os.path.splitext(filename)[1].lower()
+  if ext == '.npy':
+    data = np.load(filename, mmap_mode='r')
+  elif ext == '.npz':
+    with np.load(filename) as npzFile:
+      if key is None:
+        key = node.tag if node.tag in npzFile.files or len(npzFile.files) != 1 else npzFile.files[0]
+      if key not in npzFile.files:
+        raise IOError('Array "' + key + '" is not found in the data file "' + filename + '"!')
+      data = npzFile[key]
+  elif ext in ['.csv', '.txt']:
+    header = None if key is None else 0
+    frame = pd.read_csv(filename, header=header, comment='#', skipinitialspace=True, dtype=dtype)
+    data = frame.values if key is None else frame[key].values
+  elif ext in ['.parquet', '.pq']:
+    try:
+      frame = pd.read_parquet(filename, columns=None if key is None else [key])
+    except ImportError:
+      raise IOError('Reading the Parquet file "' + filename + '" requires the package "pyarrow" or "fastparquet"!')
+    data = frame.values
+  elif ext in ['.h5', '.hdf5']:
+    try:
+      import h5py
+    except ImportError:
+      raise IOError('Reading the HDF5 file "' + filename + '" requires the package "h5py"!')
+    key = node.tag if key is None else key
+    with h5py.File(filename, 'r') as h5File:
+      if key not in h5File:
+        raise IOError('Dataset "' + key + '" is not found in the data file "' + filename + '"!')
+      data = h5File[key][()]
+  else:
+    raise IOError('Unsupported data file format "' + ext + '" is provided for node ' + node.tag + '!')
+  return data
+
+def readSets(root, nodeTag, workingDir='.'):
   """
     Read xml node "Sets" in the input file
     @ In, root, xml.etree.ElementTree.Element, root xml element node
     @ In, nodeTag, str, node tag that is used to find the node
+    @ In, workingDir, str, optional, the directory that is used to locate the data files
     @ Out, setsDict, dict, dictionary of input Sets, i.e. {setName: list of setValues}
   """
   logger.info('Read Sets information')
@@ -69,7 +124,11 @@ def readSets(root, nodeTag):
   metaDict = {}
   # read Sets information
   for subnode in sets:
-    if subnode.get('index') is None:
+    if subnode.get('file') is not None:
+      if subnode.get('index') is not None:
+        raise IOError('Attribute "file" is not supported by the dependent set ' + subnode.tag + '!')
+      setsDict[subnode.tag] = list(str(val).strip() for val in np.ravel(loadDataFile(subnode, workingDir, dtype=str)))
+    elif subnode.get('index') is None:
       setsDict[subnode.tag] = utils.convertNodeTextToList(subnode.text)
     else:
       setsDict[subnode.tag] = utils.convertNodeTextToList(subnode.text,sep=';')
@@ -93,12 +152,31 @@ def readSets(root, nodeTag):
     setsDict[setName] = requiredIndex
   return setsDict
 
-def readParameters(root, nodeTag, setsDict):
+def getFloatArray(node, arrays=None, workingDir='.'):
+  """
+    Get the numeric data of given xml node, either from the node text or from the data file
+    @ In, node, xml.etree.ElementTree.Element, xml element node
+    @ In, arrays, dict, optional, {xmlNode:numpy.array} numeric data that is already parsed by parseInput
+    @ In, workingDir, str, optional, the directory that is used to locate the data files
+    @ Out, arrayData, numpy.array, 1-D array of floats
+  """
+  if node.get('file') is not None:
+    arrayData = np.ravel(loadDataFile(node, workingDir))
+    if arrayData.dtype != np.float64:
+      arrayData = arrayData.astype(float)
+    return arrayData
+  if arrays is not None and node in arrays:
+    return arrays.pop(node)
+  return utils.convertNodeTextToFloatArray(node.text)
+
+def readParameters(root, nodeTag, setsDict, arrays=None, workingDir='.'):
   """
     Read xml node "Parameters" in the input file
     @ In, root, xml.etree.ElementTree.Element, root xml element node
     @ In, nodeTag, str, node tag that is used to find the node
     @ In, setsDict, dict, dictionary store the sets info
+    @ In, arrays, dict, optional, {xmlNode:numpy.array} numeric data that is already parsed by parseInput
+    @ In, workingDir, str, optional, the directory that is used to locate the data files
     @ Out, (paramsDict, metaDict), tuple, paramsDict: {paramName:{setsIndex:paramValue}} or {paramName:{'None':paramValue}}
       metaDict: {paramName:{setIndexName:indexDim}} or {paramName:None}
   """
@@ -111,11 +189,17 @@ def readParameters(root, nodeTag, setsDict):
     indexAttribName = subnode.get('index')
     indexType = subnode.get('type')
     if indexType == 'str':
-      contents = utils.convertNodeTextToList(subnode.text)
+      if subnode.get('file') is not None:
+        contents = list(str(val).strip() for val in np.ravel(loadDataFile(subnode, workingDir, dtype=str)))
+      else:
+        contents = utils.convertNodeTextToList(subnode.text)
     elif indexType == 'int':
-      contents = utils.convertNodeTextToIntList(subnode.text)
+      if subnode.get('file') is not None:
+        contents = list(int(val) for val in np.ravel(loadDataFile(subnode, workingDir, dtype=int)))
+      else:
+        contents = utils.convertNodeTextToIntList(subnode.text)
     else:
-      contents = utils.convertNodeTextToFloatList(subnode.text)
+      contents = getFloatArray(subnode, arrays, workingDir).tolist()
     if indexAttribName is not None:
       indexNameList = utils.convertNodeTextToList(indexAttribName)
       indexDimList = list(len(setsDict[indexName]) for indexName in indexNameList)
@@ -144,21 +228,33 @@ def readParameters(root, nodeTag, setsDict):
           raise IOError('Index is not provided, the text in node ' + tag + ' should be scalar!')
   return paramsDict, metaDict
 
-def readUncertainties(root, nodeTag, paramsDict):
+def readUncertainties(root, nodeTag, paramsDict, arrays=None, workingDir='.'):
   """
-    Read xml node "Uncertainties" in the input file
+    Read xml node "Uncertainties" in the input file, the data of each scenario is stored as a row of the
+    scenario array, and the set indices are shared by all the scenarios of the same parameter
     @ In, root, xml.etree.ElementTree.Element, root xml element node
     @ In, nodeTag, str, node tag that is used to find the node
     @ In, paramsDict, dict, paramsDict returned by readParameters() method
+    @ In, arrays, dict, optional, {xmlNode:numpy.array} numeric data that is already parsed by parseInput
+    @ In, workingDir, str, optional, the directory that is used to locate the data files
     @ Out, uncertaintiesDict, dict, dictionary store uncertainties' information
       uncertaintiesDict: {paramName:{'scenarios':{scenarioName:{setIndex:uncertaintyVal}}, 'probabilities': [ProbVals]}}
+      and the joint scenarios are stored under 'jointScenarios':
+      {'params':[paramNames], 'scenarios':{scenarioName:{paramName:{setIndex:uncertaintyVal}}}, 'probabilities': [ProbVals]}
   """
   logger.info('Read Uncertainties information')
   uncertainties = root.find(nodeTag)
   if uncertainties is not None:
     uncertaintiesDict = {}
+    jointNodes = uncertainties.findall('scenario')
+    if len(jointNodes) > 0:
+      uncertaintiesDict['jointScenarios'] = readJointScenarios(jointNodes, paramsDict, arrays, workingDir)
     for subnode in uncertainties:
+      if subnode.tag == 'scenario':
+        continue
       paramName = subnode.tag
+      if paramName in uncertaintiesDict.get('jointScenarios', {}).get('params', []):
+        raise IOError('Parameter ' + paramName + ' is already provided by the joint scenarios in Uncertainties!')
       if paramName not in paramsDict:
         raise IOError('Parameter ' + paramName + ' is not found in the Parameters list!')
 
@@ -168,25 +264,61 @@ def readUncertainties(root, nodeTag, paramsDict):
       if probabilities is None:
         uncertaintiesDict[paramName]['probabilities'] = [1.0/float(totalScenarios)] * totalScenarios
       else:
-        uncertaintiesDict[paramName]['probabilities'] = utils.convertNodeTextToFloatList(probabilities.text)
+        uncertaintiesDict[paramName]['probabilities'] = getFloatArray(probabilities, arrays, workingDir).tolist()
       scenarios = findRequiredNode(subnode, 'scenarios')
-      scenariosData = utils.convertNodeTextToFloatList(scenarios.text)
+      scenariosData = getFloatArray(scenarios, arrays, workingDir)
       indices = paramsDict[paramName].keys()
       if len(scenariosData) != len(indices) * totalScenarios:
         raise IOError('Provided length of scenarios data for ' + paramName + ': ' + str(len(scenariosData)) + \
          ' != "totalScenarios * dim(' + paramName + ')"' + ': ' + str(len(indices) * totalScenarios))
-      indexDim = len(indices)
-      scenariosNameList = []
+      indexMap = utils.IndexMap(indices)
+      scenariosData = scenariosData.reshape(totalScenarios, len(indexMap))
       uncertaintiesDict[paramName]['scenarios'] = collections.OrderedDict()
       for i in range(1, totalScenarios+1):
         scenarioName = 'scenario_' + paramName + '_' + str(i)
-        scenariosNameList.append(scenarioName)
-        data = scenariosData[indexDim * (i - 1):indexDim * i]
-        uncertaintiesDict[paramName]['scenarios'][scenarioName] = collections.OrderedDict(zip(indices, data))
+        uncertaintiesDict[paramName]['scenarios'][scenarioName] = utils.IndexedArray(indexMap, scenariosData[i-1], (scenariosData, i-1))
     return uncertaintiesDict
   else:
     return None
 
+def readJointScenarios(nodes, paramsDict, arrays=None, workingDir='.'):
+  """
+    Read the joint scenarios, i.e. xml nodes "scenario" in "Uncertainties"
+    @ In, nodes, list, list of xml.etree.ElementTree.Element "scenario" nodes
+    @ In, paramsDict, dict, paramsDict returned by readParameters() method
+    @ In, arrays, dict, optional, {xmlNode:numpy.array} numeric data that is already parsed by parseInput
+    @ In, workingDir, str, optional, the directory that is used to locate the data files
+    @ Out, jointDict, dict, dictionary store joint scenarios' information
+      jointDict: {'params':[paramNames], 'scenarios':{scenarioName:{paramName:{setIndex:uncertaintyVal}}}, 'probabilities': [ProbVals]}
+  """
+  jointDict = {'params':[child.tag for child in nodes[0]], 'scenarios':collections.OrderedDict(), 'probabilities':[]}
+  indexMaps = {}
+  probabilities = [node.attrib.get('probability') for node in nodes]
+  if all(prob is None for prob in probabilities):
+    jointDict['probabilities'] = [1.0/float(len(nodes))] * len(nodes)
+  elif any(prob is None for prob in probabilities):
+    raise IOError('Attribute "probability" is required by all joint scenarios in Uncertainties!')
+  else:
+    jointDict['probabilities'] = [float(prob) for prob in probabilities]
+  for i, node in enumerate(nodes, 1):
+    scenarioName = 'scenario_joint_' + str(i)
+    if sorted(child.tag for child in node) != sorted(jointDict['params']):
+      raise IOError('The joint scenario ' + str(i) + ' should provide the parameters: ' + ', '.join(jointDict['params']))
+    jointDict['scenarios'][scenarioName] = collections.OrderedDict()
+    for child in node:
+      paramName = child.tag
+      if paramName not in paramsDict:
+        raise IOError('Parameter ' + paramName + ' is not found in the Parameters list!')
+      if paramName not in indexMaps:
+        indexMaps[paramName] = utils.IndexMap(paramsDict[paramName].keys())
+      indices = indexMaps[paramName]
+      data = getFloatArray(child, arrays, workingDir)
+      if len(data) != len(indices):
+        raise IOError('Provided length of data for ' + paramName + ' in joint scenario ' + str(i) + ': ' + str(len(data)) + \
+         ' != "dim(' + paramName + ')"' + ': ' + str(len(indices)))
+      jointDict['scenarios'][scenarioName][paramName] = utils.IndexedArray(indices, data)
+  return jointDict
+
 def readSettings(root, nodeTag, workingDir):
   """
     Read xml node "Settings" in the input file
@@ -200,7 +332,7 @@ def readSettings(root, nodeTag, workingDir):
   for subnode in settings:
     if subnode.tag == 'mandatory':
       settingDict[subnode.tag] = subnode.text.strip()
-    elif subnode.tag == 'solverOptions':
+    elif subnode.tag in ['solverOptions', 'scenarioReduction']:
       settingDict[subnode.tag] = {}
       for child in subnode:
         settingDict[subnode.tag][child.tag] = child.text.strip()
@@ -246,14 +378,44 @@ def readExternalConstraints(root, nodeTag):
           raise IOError('Required attribute "name" for node "constraint" is not provided!')
   return constraintDict
 
-def readEconomics(root, nodeTag, setsDict):
+def readCashFlowScenarios(node, indexDimList, transposing, arrays=None, workingDir='.'):
+  """
+    Read xml node "CashFlowScenarios" of the Economics parameter
+    @ In, node, xml.etree.ElementTree.Element, xml node "CashFlowScenarios"
+    @ In, indexDimList, list, the dimensions of the cash flow of each scenario
+    @ In, transposing, bool, True if the cash flow is provided with indices "time_periods, investments"
+    @ In, arrays, dict, optional, {xmlNode:numpy.array} numeric data that is already parsed by parseInput
+    @ In, workingDir, str, optional, the directory that is used to locate the data files
+    @ Out, scenarioDict, dict, {'cashFlows':numpy.array with shape (totalScenarios, investments, time steps), 'probabilities':[ProbVals]}
+  """
+  totalScenarios = int(findRequiredNode(node, 'totalScenarios').text)
+  probabilities = node.find('probabilities')
+  if probabilities is None:
+    probabilities = [1.0/float(totalScenarios)] * totalScenarios
+  else:
+    probabilities = getFloatArray(probabilities, arrays, workingDir).tolist()
+    if len(probabilities) != totalScenarios:
+      raise IOError('Provided length of probabilities for node ' + node.tag + ': ' + str(len(probabilities)) + ' != totalScenarios: ' + str(totalScenarios))
+  cashFlows = getFloatArray(findRequiredNode(node, 'scenarios'), arrays, workingDir)
+  totDim = totalScenarios * indexDimList[0] * indexDimList[1]
+  if len(cashFlows) != totDim:
+    raise IOError('Provided length of scenarios data for node ' + node.tag + ': ' + str(len(cashFlows)) + ' != "totalScenarios * dim(CashFlow)": ' + str(totDim))
+  cashFlows = cashFlows.reshape([totalScenarios] + indexDimList)
+  if transposing:
+    cashFlows = cashFlows.swapaxes(1, 2)
+  return {'cashFlows':cashFlows, 'probabilities':probabilities}
+
+def readEconomics(root, nodeTag, setsDict, arrays=None, workingDir='.'):
   """
     Read xml node "Economics" in the input file
     @ In, root, xml.etree.ElementTree.Element, root xml element node
     @ In, nodeTag, str, node tag that is used to find the node
     @ In, setsDict, dict, dictionary store the sets info
+    @ In, arrays, dict, optional, {xmlNode:numpy.array} numeric data that is already parsed by parseInput
+    @ In, workingDir, str, optional, the directory that is used to locate the data files
     @ Out, economicsDict, dict, dictionary of economics
-      {paramName:{'CashFlow':pd.DataFrame, 'DiscountRate':float, 'tax':float, 'inflation':float}}
+      {paramName:{'CashFlow':pd.DataFrame, 'DiscountRate':float, 'tax':float, 'inflation':float}}, and the optional
+      scenarios of the cash flows are stored under 'CashFlowScenarios', see readCashFlowScenarios
   """
   logger.info('Read Economics information')
   economics = root.find(nodeTag)
@@ -265,7 +427,7 @@ def readEconomics(root, nodeTag, setsDict):
         node = paramNode.find(nodeTag)
         paramDict[nodeTag] = utils.convertStringToFloat(node) if node is not None else 0.0
       cashFlow = findRequiredNode(paramNode, 'CashFlow')
-      cashFlowVal = utils.convertNodeTextToFloatList(cashFlow.text)
+      cashFlowVal = utils.convertNodeTextToFloatArray(cashFlow.text)
       indexAttribName = cashFlow.get('index')
       transposing = False
       if indexAttribName is not None:
@@ -291,42 +453,125 @@ def readEconomics(root, nodeTag, setsDict):
       columns = ['inflow'] + setsDict[indexNameList[1]]
       cashFlowDF = pd.DataFrame(cashFlowVal, index=setsDict[indexNameList[0]], columns=columns)
       paramDict['CashFlow'] = cashFlowDF if not transposing else cashFlowDF.T
+      scenarioNode = paramNode.find('CashFlowScenarios')
+      if scenarioNode is not None:
+        paramDict['CashFlowScenarios'] = readCashFlowScenarios(scenarioNode, indexDimList, transposing, arrays, workingDir)
       economicsDict[paramNode.tag] = paramDict
     return economicsDict
   else:
     return None
 
+def computeNPVArray(cashFlows, discountRate, tax=0.0, inflation=0.0):
+  """
+    Compute Net Present Values of cash flows, i.e. the cash flows after tax and inflation are discounted by
+    the discount rate, the first time step (i.e. 'inflow') is not discounted.
+    The leading axes of cashFlows are batch axes, so that the NPVs of multiple parameters or multiple perturbations
+    of cash flows can be computed at once.
+    @ In, cashFlows, numpy.array, array of cash flows with shape (..., numberInvestments, numberTimeSteps)
+    @ In, discountRate, float or numpy.array, discount rate, array should be broadcastable to the batch shape of cashFlows
+    @ In, tax, float or numpy.array, optional, tax rate, array should be broadcastable to the batch shape of cashFlows
+    @ In, inflation, float or numpy.array, optional, inflation rate, array should be broadcastable to the batch shape of cashFlows
+    @ Out, npv, numpy.array, array of NPVs with shape (..., numberInvestments)
+  """
+  cashFlows = np.asarray(cashFlows, dtype=float)
+  timeSteps = np.arange(cashFlows.shape[-1])
+  # factors with shape (..., numberTimeSteps)
+  discount = (1.0 + np.asarray(discountRate, dtype=float)[..., np.newaxis]) * (1.0 + np.asarray(inflation, dtype=float)[..., np.newaxis])
+  factors = (1.0 - np.asarray(tax, dtype=float)[..., np.newaxis]) * discount ** (-timeSteps)
+  return np.einsum('...it,...t->...i', cashFlows, factors)
+
 def computeNPVs(economicsDict):
   """
-    Compute Net Present Values
+    Compute Net Present Values, the NPVs of all parameters with the same shape of cash flows are computed at once
     @ In, dict, dictionary of economics data
     @ Out, optionalParamDict, dict, store the calculated NPVs
   """
   logger.info('Compute NPVs')
   optionalParamDict = {}
+  groups = collections.OrderedDict()
   for paramName, paramDict in economicsDict.items():
-    discounted = paramDict['DiscountRate']
-    tax = paramDict['tax']
-    inflation = paramDict['inflation']
-    cashFlow = paramDict['CashFlow']
-    ## compute cashflow after tax and inflation
-    for ind, column in enumerate(cashFlow.columns):
-      cashFlow[column] = cashFlow[column] * (1-tax) * (1+inflation)**(-ind)
-    ## compute NPV
-    npv = [npf.npv(discounted, cashFlow.loc[ind]) for ind in cashFlow.index]
-    optionalParamDict[paramName] = collections.OrderedDict(zip(list(cashFlow.index), npv))
-    logger.debug('Computed npv for param %s: %s' %(paramName, str(npv)))
+    groups.setdefault(paramDict['CashFlow'].shape, []).append(paramName)
+  for paramNames in groups.values():
+    cashFlows = np.stack(list(economicsDict[paramName]['CashFlow'].values for paramName in paramNames))
+    rates = dict((key, np.asarray(list(economicsDict[paramName][key] for paramName in paramNames))) for key in ['DiscountRate', 'tax', 'inflation'])
+    npvs = computeNPVArray(cashFlows, rates['DiscountRate'], rates['tax'], rates['inflation'])
+    for paramName, npv in zip(paramNames, npvs):
+      npv = npv.tolist()
+      optionalParamDict[paramName] = collections.OrderedDict(zip(list(economicsDict[paramName]['CashFlow'].index), npv))
+      logger.debug('Computed npv for param %s: %s' %(paramName, str(npv)))
 
   return optionalParamDict
 
+def computeNPVScenarios(economicsDict):
+  """
+    Compute the NPV scenarios from the scenarios of cash flows, the cash flows of all scenarios are discounted at once
+    @ In, economicsDict, dict, dictionary of economics data returned by readEconomics() method
+    @ Out, uncertaintiesDict, dict, the NPV scenarios with the same structure as the one returned by readUncertainties() method
+      {paramName:{'scenarios':{scenarioName:{setIndex:npv}}, 'probabilities': [ProbVals]}}
+  """
+  uncertaintiesDict = {}
+  for paramName, paramDict in economicsDict.items():
+    if 'CashFlowScenarios' not in paramDict:
+      continue
+    logger.info('Compute NPV scenarios for param %s', paramName)
+    scenarioDict = paramDict['CashFlowScenarios']
+    npvs = computeNPVArray(scenarioDict['cashFlows'], paramDict['DiscountRate'], paramDict['tax'], paramDict['inflation'])
+    indexMap = utils.IndexMap(paramDict['CashFlow'].index)
+    uncertaintiesDict[paramName] = {'probabilities':scenarioDict['probabilities'], 'scenarios':collections.OrderedDict()}
+    for i in range(len(npvs)):
+      scenarioName = 'scenario_' + paramName + '_' + str(i+1)
+      uncertaintiesDict[paramName]['scenarios'][scenarioName] = utils.IndexedArray(indexMap, npvs[i], (npvs, i))
+  return uncertaintiesDict
+
 #####################################
 # Input XML Reader
 #####################################
-def readInput(filename, workingDir='.'):
+def isNumericNode(path, node):
+  """
+    Check if the given xml node contains the numeric data of Parameters or Uncertainties
+    @ In, path, list, list of tags of the parent nodes, starting from the root node
+    @ In, node, xml.etree.ElementTree.Element, xml element node
+    @ Out, isNumericNode, bool, True if the node text is a list of floats
+  """
+  if len(path) == 2 and path[1] == 'Parameters':
+    return node.get('type') not in ['str', 'int']
+  if len(path) == 3 and path[1] == 'Uncertainties':
+    return path[2] == 'scenario' or node.tag in ['probabilities', 'scenarios']
+  if len(path) == 4 and path[1] == 'Economics' and path[3] == 'CashFlowScenarios':
+    return node.tag in ['probabilities', 'scenarios']
+  return False
+
+def parseInput(filename):
+  """
+    Parse the input file incrementally, the numeric text of Parameters and Uncertainties is converted into
+    numpy arrays as soon as the node is parsed, and the text is released from the xml tree. The elements are
+    not cleared, since their attributes (i.e. index, type and name) and structure are used by the readers of
+    each section, and the memory of the input is dominated by the numeric text, not by the elements
+    @ In, filename, str, input filename
+    @ Out, (tree, arrays), tuple, xml.etree.ElementTree.ElementTree and {xmlNode:numpy.array}
+  """
+  arrays = {}
+  path = []
+  root = None
+  for event, node in ET.iterparse(filename, events=('start', 'end')):
+    if event == 'start':
+      if root is None:
+        root = node
+      path.append(node.tag)
+      continue
+    path.pop()
+    if node.get('file') is None and isNumericNode(path, node):
+      arrays[node] = utils.convertNodeTextToFloatArray(node.text)
+      node.text = None
+  return ET.ElementTree(root), arrays
+
+def readInput(filename, workingDir='.', cache=None):
   """
     process input file
     @ In, filename, str or xml.etree.ElementTree.ElementTree, input filename
     @ In, workingDir, str, the working directory, '.' indicate current input file directory
+    @ In, cache, cacheUtils.InputCache, optional, the on-disk cache of processed inputs, if it is provided, the
+      processed input is loaded from the cache when the input, its data files and the LOGOS version are unchanged
     @ Out, initDict, dict, dictionary of inputs
     {
       'Sets':{setName: list of setValues},
@@ -336,9 +581,16 @@ def readInput(filename, workingDir='.'):
       'Uncertainties':{paramName:{'scenarios':{scenarioName:{setIndex:uncertaintyVal}}, 'probabilities': [ProbVals]}}
     }
   """
+  if cache is not None:
+    cacheKey = cacheUtils.computeKey(filename, workingDir)
+    initDict = cache.load(cacheKey)
+    if initDict is not None:
+      utils.makeDir(initDict['Settings']['workingDir'])
+      return initDict
 
+  arrays = None
   if type(filename) == str:
-    tree = ET.parse(filename)
+    tree, arrays = parseInput(filename)
     root = tree.getroot()
   elif isinstance(filename, ET.ElementTree):
     root = filename.getroot()
@@ -351,18 +603,105 @@ def readInput(filename, workingDir='.'):
               'Uncertainties': None, 'ExternalConstraints': None}
   metaData = {'Parameters':None}
 
-  initDict['Sets'] = readSets(root, 'Sets')
-  initDict['Parameters'], metaData['Parameters'] = readParameters(root, 'Parameters', initDict['Sets'])
-  initDict['Uncertainties'] = readUncertainties(root, 'Uncertainties', initDict['Parameters'])
+  initDict['Sets'] = readSets(root, 'Sets', workingDir)
+  initDict['Parameters'], metaData['Parameters'] = readParameters(root, 'Parameters', initDict['Sets'], arrays, workingDir)
+  initDict['Uncertainties'] = readUncertainties(root, 'Uncertainties', initDict['Parameters'], arrays, workingDir)
   initDict['Settings'] = readSettings(root, 'Settings', workingDir)
   initDict['ExternalConstraints'] = readExternalConstraints(root, 'ExternalConstraints')
   initDict['Meta'] = metaData
 
-  economicsDict = readEconomics(root, 'Economics', initDict['Sets'])
+  economicsDict = readEconomics(root, 'Economics', initDict['Sets'], arrays, workingDir)
   if economicsDict is not None:
     logger.info('Update NPVs from CashFlows listed in node Economics')
     optionalParamDict = computeNPVs(economicsDict)
     initDict['Parameters'].update(optionalParamDict)
     logger.debug('Information for parameters %s is updated' %(','.join(optionalParamDict.keys())))
+    npvScenarios = computeNPVScenarios(economicsDict)
+    if len(npvScenarios) > 0:
+      if initDict['Uncertainties'] is None:
+        initDict['Uncertainties'] = {}
+      for paramName in npvScenarios:
+        if paramName in initDict['Uncertainties'] or paramName in initDict['Uncertainties'].get('jointScenarios', {}).get('params', []):
+          raise IOError('Parameter ' + paramName + ' is already provided in Uncertainties, CashFlowScenarios of Economics can not be used!')
+      initDict['Uncertainties'].update(npvScenarios)
 
+  if cache is not None:
+    cache.store(cacheKey, initDict)
   return initDict
+
+#####################################
+# Sampled Input
+#####################################
+def readSampledInput(root, variables, workingDir='.', cache=None):
+  """
+    Process the input whose Parameters are driven by the sampled variables, and compile the map from each variable
+    to the parameter entries it drives. A variable drives the whole parameter if it is the tag of the parameter
+    node, or one entry of the parameter if it is used as a placeholder in the node text. The placeholders are read
+    as zeros, and the values are filled in by applySampledValues for each sample.
+    @ In, root, xml.etree.ElementTree.Element, root xml element node, i.e. node "ModelData", not modified
+    @ In, variables, list, names of the variables that can be sampled
+    @ In, workingDir, str, optional, the working directory
+    @ In, cache, cacheUtils.InputCache, optional, the on-disk cache of processed inputs, see readInput
+    @ Out, (initDict, slots), tuple, initDict: dictionary of inputs returned by readInput, and
+      slots: {varName:[(paramName, indices, dtype)]}, the indices of the parameter entries driven by the variable
+  """
+  template = copy.deepcopy(root)
+  variables = set(variables)
+  economics = template.find('Economics')
+  # the NPVs computed from the cash flows replace the provided parameters
+  economics = set(child.tag for child in economics) if economics is not None else set()
+  positions = collections.OrderedDict()
+  for child in findRequiredNode(template, 'Parameters'):
+    dtype = {'str':str, 'int':int}.get(child.get('type'), float)
+    if child.tag in variables:
+      positions.setdefault(child.tag, []).append((child.tag, None, dtype))
+      continue
+    if child.get('file') is not None or child.text is None:
+      continue
+    listData = utils.convertNodeTextToList(child.text)
+    placeholders = list(pos for pos, val in enumerate(listData) if val in variables)
+    for pos in placeholders:
+      positions.setdefault(listData[pos], []).append((child.tag, pos, dtype))
+      listData[pos] = '0'
+    if placeholders:
+      child.text = ','.join(listData)
+  initDict = readInput(template, workingDir, cache)
+  slots = collections.OrderedDict()
+  for varName, paramSlots in positions.items():
+    for paramName, pos, dtype in paramSlots:
+      if paramName in economics:
+        logger.warning('Parameter %s is computed from node Economics, variable %s is not used', paramName, varName)
+        continue
+      indices = list(initDict['Parameters'][paramName].keys())
+      slots.setdefault(varName, []).append((paramName, indices if pos is None else [indices[pos]], dtype))
+  return initDict, slots
+
+def applySampledValues(initDict, slots, sampledVars):
+  """
+    Create the input of one sample, only the parameters that are driven by the sampled variables are copied and
+    updated, the other data are shared with the given input
+    @ In, initDict, dict, dictionary of inputs returned by readSampledInput, not modified
+    @ In, slots, dict, {varName:[(paramName, indices, dtype)]}, see readSampledInput
+    @ In, sampledVars, dict, {varName:value} the values of the sampled variables
+    @ Out, newDict, dict, dictionary of inputs of the sample
+  """
+  newDict = dict(initDict)
+  # the settings are consumed when the model is initialized
+  newDict['Settings'] = copy.deepcopy(initDict['Settings'])
+  params = collections.OrderedDict(initDict['Parameters'])
+  copied = set()
+  for varName, paramSlots in slots.items():
+    if varName not in sampledVars:
+      continue
+    values = np.ravel(sampledVars[varName])
+    for paramName, indices, dtype in paramSlots:
+      if len(values) != len(indices):
+        raise IOError('Provided data for node ' + paramName + ' from variable ' + varName + ' with length ' + str(len(values)) \
+                      + ' is not consistent with the required length ' + str(len(indices)))
+      if paramName not in copied:
+        params[paramName] = type(params[paramName])(params[paramName])
+        copied.add(paramName)
+      for index, val in zip(indices, values):
+        params[paramName][index] = dtype(val)
+  newDict['Parameters'] = params
+  return newDict
@@ -12,6 +12,8 @@ warnings.simplefilter('default',DeprecationWarning)
 
 #External Modules------------------------------------------------------------------------------------
 import numpy as np
+import collections
+import collections.abc
 import logging
 import os
 import errno
@@ -69,6 +71,137 @@ def convertNodeTextToFloatList(nodeText, sep=None):
     listData = list(float(elem.strip()) for elem in nodeText.split(sep))
   return listData
 
+def convertNodeTextToFloatArray(nodeText):
+  """
+    Convert space or comma separated string to numpy array of float, the text is parsed by numpy directly
+    without creating the intermediate list of strings
+    @ In, nodeText, str, string from xml node text
+    @ Out, arrayData, numpy.array, 1-D array of floats
+  """
+  if nodeText is None or not nodeText.strip():
+    return np.empty(0)
+  text = nodeText.replace(',', ' ')
+  try:
+    with warnings.catch_warnings():
+      # numpy only warns if the text can not be read to its end
+      warnings.simplefilter('error', DeprecationWarning)
+      arrayData = np.fromstring(text, sep=' ')
+  except (DeprecationWarning, ValueError):
+    # fall back to the python conversion to report the invalid value
+    arrayData = np.asarray(convertNodeTextToFloatList(nodeText), dtype=float)
+  return arrayData
+
+class IndexMap(object):
+  """
+    List of indices shared by the data of multiple scenarios, the position of each index is only computed
+    when it is required
+  """
+  def __init__(self, indices):
+    """
+      Constructor
+      @ In, indices, list, list of indices
+      @ Out, None
+    """
+    self.indices = list(indices)
+    self._position = None
+
+  def __len__(self):
+    """
+      Number of indices
+      @ In, None
+      @ Out, __len__, int, number of indices
+    """
+    return len(self.indices)
+
+  def position(self, index):
+    """
+      Get the position of given index
+      @ In, index, str or tuple, the index
+      @ Out, position, int, the position of the index
+    """
+    if self._position is None:
+      self._position = dict((ind, i) for i, ind in enumerate(self.indices))
+    return self._position[index]
+
+class IndexedArray(collections.abc.Mapping):
+  """
+    Read-only mapping {index:value} backed by a numpy array and a shared IndexMap
+  """
+  def __init__(self, indexMap, array, source=None):
+    """
+      Constructor
+      @ In, indexMap, IndexMap, the shared indices
+      @ In, array, numpy.array, 1-D array of values with the same length of indexMap
+      @ In, source, tuple, optional, (matrix, row) if the array is a row of a 2-D (possibly memory-mapped) array
+      @ Out, None
+    """
+    if len(indexMap) != len(array):
+      raise IOError('The number of indices and values are not consistent!')
+    self.indexMap = indexMap
+    self.array = array
+    self.source = source
+
+  def __getstate__(self):
+    """
+      Get the state for pickling, the row of the source matrix is not stored twice
+      @ In, None
+      @ Out, state, dict, the state of the object
+    """
+    state = self.__dict__.copy()
+    if self.source is not None:
+      state['array'] = None
+    return state
+
+  def __setstate__(self, state):
+    """
+      Restore the state after unpickling
+      @ In, state, dict, the state of the object
+      @ Out, None
+    """
+    self.__dict__.update(state)
+    if self.array is None:
+      self.array = self.source[0][self.source[1]]
+
+  def __getitem__(self, index):
+    """
+      Get the value of given index
+      @ In, index, str or tuple, the index
+      @ Out, __getitem__, float, the value
+    """
+    return float(self.array[self.indexMap.position(index)])
+
+  def __iter__(self):
+    """
+      Iterate over the indices
+      @ In, None
+      @ Out, __iter__, iterator, iterator of indices
+    """
+    return iter(self.indexMap.indices)
+
+  def __len__(self):
+    """
+      Number of indices
+      @ In, None
+      @ Out, __len__, int, number of indices
+    """
+    return len(self.array)
+
+  def values(self):
+    """
+      Get the list of values
+      @ In, None
+      @ Out, values, list, list of values in the order of indices
+    """
+    return self.array.tolist()
+
+  def items(self):
+    """
+      Get the list of (index, value)
+      @ In, None
+      @ Out, items, list, list of (index, value) in the order of indices
+    """
+    return list(zip(self.indexMap.indices, self.array.tolist()))
+
 def convertStringToFloat(xmlNode):
   """
     Convert xml node text to float
@@ -116,6 +249,24 @@ def convertStringToBool(nodeText):
     val = True
   return val
 
+def isSameData(data, other):
+  """
+    Check if two input data are the same, i.e. nested mappings and lists of strings, numbers and numpy arrays
+    @ In, data, object, the input data
+    @ In, other, object, the input data to compare with
+    @ Out, isSameData, bool, True if the data are the same
+  """
+  if isinstance(data, collections.abc.Mapping) and isinstance(other, collections.abc.Mapping):
+    return len(data) == len(other) and all(key in other and isSameData(val, other[key]) for key, val in data.items())
+  if isinstance(data, (list, tuple)) and isinstance(other, (list, tuple)):
+    return len(data) == len(other) and all(isSameData(val, otherVal) for val, otherVal in zip(data, other))
+  if isinstance(data, np.ndarray) or isinstance(other, np.ndarray):
+    return np.shape(data) == np.shape(other) and bool(np.all(np.asarray(data) == np.asarray(other)))
+  try:
+    return bool(data == other)
+  except (TypeError, ValueError):
+    return False
+
 def identifyIfExternalModuleExists(moduleIn, workingDir):
   """
     Method to check if a external module exists and in case return the module that needs to be loaded with
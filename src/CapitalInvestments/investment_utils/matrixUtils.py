@@ -0,0 +1,587 @@
+# Copyright 2020, Battelle Energy Alliance, LLC
+# ALL RIGHTS RESERVED
+"""
+  Created on Oct. 18, 2026
+  @author: wangc, mandd
+"""
+#External Modules------------------------------------------------------------------------------------
+import collections
+import collections.abc
+import itertools
+import logging
+import re
+import numpy as np
+import scipy.sparse as sparse
+#External Modules End--------------------------------------------------------------------------------
+
+logger = logging.getLogger(__name__)
+
+# characters that are not allowed in the names of LP and MPS files
+_invalidNameChars = re.compile(r'[^A-Za-z0-9_().]')
+
+def flattenIndex(index):
+  """
+    Flatten the nested tuple index, i.e. (('P1', 'A'), 'None', '1') to ('P1', 'A', 'None', '1')
+    @ In, index, object, the index of pyomo component
+    @ Out, index, object, the flattened index
+  """
+  if not isinstance(index, tuple):
+    return index
+  flat = []
+  for ind in index:
+    if isinstance(ind, tuple):
+      flat.extend(flattenIndex(ind))
+    else:
+      flat.append(ind)
+  return tuple(flat)
+
+def indexPositions(indexLists):
+  """
+    Compute the positions of the indices in the flattened array defined on the product of given index lists
+    @ In, indexLists, list, list of index lists, i.e. [investments, time_periods]
+    @ Out, positions, dict, {flattened index: position}
+  """
+  if len(indexLists) == 1:
+    keys = indexLists[0]
+  else:
+    keys = itertools.product(*indexLists)
+  return dict((flattenIndex(key), pos) for pos, key in enumerate(keys))
+
+def dictToArray(paramName, paramDict, indexLists, positions=None):
+  """
+    Convert the parameter dictionary into an array defined on the product of given index lists
+    @ In, paramName, str, name of the parameter
+    @ In, paramDict, dict, {index:paramVal}
+    @ In, indexLists, list, list of index lists, i.e. [investments, time_periods]
+    @ In, positions, dict, optional, the positions returned by indexPositions(indexLists)
+    @ Out, array, numpy.array, array with shape (len(indexList) for indexList in indexLists)
+  """
+  if positions is None:
+    positions = indexPositions(indexLists)
+  array = np.full(len(positions), np.nan)
+  try:
+    pos = list(positions[flattenIndex(key)] for key in paramDict)
+  except KeyError as err:
+    raise IOError('Index {} of parameter "{}" is not defined by the model!'.format(err, paramName))
+  array[pos] = list(paramDict.values())
+  if np.isnan(array).any():
+    raise IOError('The values of parameter "{}" are not provided for all indices of the model!'.format(paramName))
+  return array.reshape(tuple(len(indexList) for indexList in indexLists))
+
+def raggedRange(starts, counts):
+  """
+    Concatenate the ranges [start, start + count) for given starts and counts without loops
+    @ In, starts, numpy.array, the starts of the ranges
+    @ In, counts, numpy.array, the lengths of the ranges
+    @ Out, raggedRange, numpy.array, the concatenated ranges
+  """
+  starts = np.asarray(starts, dtype=int)
+  counts = np.asarray(counts, dtype=int)
+  offsets = np.repeat(np.cumsum(counts) - counts, counts)
+  return np.repeat(starts, counts) + np.arange(counts.sum()) - offsets
+
+class IndexArray(collections.abc.Sequence):
+  """
+    Read-only sequence of the indices defined by the positions in the given index lists, i.e. the row
+    [0, 2] of positions with index lists [investments, investments] is (investments[0], investments[2]).
+    It is used for the large blocks of constraints, so that the index tuples are only created when needed.
+  """
+  def __init__(self, positions, indexLists):
+    """
+      Constructor
+      @ In, positions, numpy.array, array with shape (size, len(indexLists)) of the positions in the index lists
+      @ In, indexLists, list, list of index lists, i.e. [investments, investments, investments]
+      @ Out, None
+    """
+    self.positions = np.asarray(positions, dtype=int).reshape(-1, len(indexLists))
+    self.indexLists = indexLists
+
+  def __len__(self):
+    """
+      Number of the indices
+      @ In, None
+      @ Out, __len__, int, the number of the indices
+    """
+    return len(self.positions)
+
+  def __getitem__(self, k):
+    """
+      Get the k-th index
+      @ In, k, int, the position in the sequence
+      @ Out, index, tuple, the index
+    """
+    return tuple(indexList[pos] for indexList, pos in zip(self.indexLists, self.positions[k]))
+
+def labelName(name, index=None):
+  """
+    Generate the label of a variable or a constraint that can be used in the LP and MPS files
+    @ In, name, str, name of the variable or constraint
+    @ In, index, object, optional, index of the variable or constraint
+    @ Out, label, str, the label
+  """
+  if index is not None:
+    index = flattenIndex(index)
+    index = index if isinstance(index, tuple) else (index,)
+    name += '(' + '_'.join(str(ind) for ind in index) + ')'
+  return _invalidNameChars.sub('_', name)
+
+class LinearProgram(object):
+  """
+    Mixed integer linear program in the matrix form, i.e.
+      optimize c^T x
+      subject to rowLower <= A x <= rowUpper, lower <= x <= upper, x[integrality] integer
+    The variables and constraints are added by blocks, and the constraint matrix A is assembled as
+    scipy sparse matrix, so that the model can be built directly from the parameter arrays.
+  """
+  def __init__(self, name='LOGOS', maximize=False):
+    """
+      Constructor
+      @ In, name, str, optional, name of the linear program
+      @ In, maximize, bool, optional, maximize the objective if True, otherwise minimize
+      @ Out, None
+    """
+    self.name = name
+    self.maximize = maximize
+    self.numVariables = 0     # number of variables
+    self.numConstraints = 0   # number of constraints
+    self._varBlocks = []      # list of (variableName, indices) of the variable blocks
+    self._conBlocks = collections.OrderedDict() # {constraintName: (first row, indices)}
+    self._lower = []          # list of arrays of variable lower bounds
+    self._upper = []          # list of arrays of variable upper bounds
+    self._integrality = []    # list of arrays of variable integrality
+    self._objective = []      # list of (columns, coefficients) of the objective
+    self._rows = []           # list of arrays of row indices of the constraint matrix
+    self._cols = []           # list of arrays of column indices of the constraint matrix
+    self._vals = []           # list of arrays of the entries of the constraint matrix
+    self._rowLower = []       # list of arrays of constraint lower bounds
+    self._rowUpper = []       # list of arrays of constraint upper bounds
+    self._lazyBlocks = collections.OrderedDict() # {constraintName: lazy constraints}, see self.addConstraints
+    self._lazyRounds = 0      # number of rounds that the violated lazy constraints are added
+    self._cache = None        # the assembled arrays
+
+  def addVariables(self, name, indices, lower=0.0, upper=np.inf, integer=False):
+    """
+      Add a block of variables
+      @ In, name, str, name of the variables
+      @ In, indices, list, list of variable indices, [None] for a scalar variable
+      @ In, lower, float or numpy.array, optional, lower bounds of the variables
+      @ In, upper, float or numpy.array, optional, upper bounds of the variables
+      @ In, integer, bool, optional, the variables are integers if True, otherwise continuous
+      @ Out, columns, numpy.array, the columns of the added variables
+    """
+    size = len(indices)
+    columns = np.arange(self.numVariables, self.numVariables + size)
+    self.numVariables += size
+    self._varBlocks.append((name, indices))
+    self._lower.append(np.broadcast_to(np.asarray(lower, dtype=float), (size,)))
+    self._upper.append(np.broadcast_to(np.asarray(upper, dtype=float), (size,)))
+    self._integrality.append(np.full(size, integer, dtype=bool))
+    self._cache = None
+    return columns
+
+  def addObjective(self, columns, coefficients):
+    """
+      Add terms to the objective
+      @ In, columns, numpy.array, the columns of the variables
+      @ In, coefficients, float or numpy.array, the coefficients of the variables
+      @ Out, None
+    """
+    columns = np.asarray(columns, dtype=int).ravel()
+    self._objective.append((columns, np.broadcast_to(np.asarray(coefficients, dtype=float).ravel(), columns.shape)))
+    self._cache = None
+
+  def addConstraints(self, name, indices, coefficients, columns, lower=-np.inf, upper=np.inf, lazy=False):
+    """
+      Add a block of constraints, i.e. lower <= coefficients * x[columns] <= upper. The lazy constraints are kept
+      in a pool, and only the ones that are violated by a solution are added to the model, see
+      self.addViolatedConstraints
+      @ In, name, str, name of the constraints
+      @ In, indices, list, list of constraint indices, [None] for a scalar constraint
+      @ In, coefficients, numpy.array or scipy.sparse matrix or tuple, the coefficient matrix with shape
+        (len(indices), len(columns)), or the entries of the matrix in the form of (values, (rows, columns)), where the
+        rows are the positions in indices and the columns are the positions in columns
+      @ In, columns, numpy.array, the columns of the variables that are used by the coefficient matrix
+      @ In, lower, float or numpy.array, optional, lower bounds of the constraints
+      @ In, upper, float or numpy.array, optional, upper bounds of the constraints
+      @ In, lazy, bool, optional, the constraints are added to the pool of lazy constraints if True
+      @ Out, rows, numpy.array, the rows of the added constraints, empty for lazy constraints
+    """
+    size = len(indices)
+    columns = np.asarray(columns, dtype=int).ravel()
+    if isinstance(coefficients, tuple):
+      coefficients = sparse.coo_matrix(coefficients, shape=(size, len(columns)))
+    else:
+      coefficients = sparse.coo_matrix(coefficients)
+    if coefficients.shape != (size, len(columns)):
+      raise ValueError('The shape of coefficient matrix of constraint "{}" is not consistent with the indices and columns!'.format(name))
+    if name in self._conBlocks or name in self._lazyBlocks:
+      raise ValueError('Constraint "{}" is already defined!'.format(name))
+    if lazy:
+      mask = coefficients.data != 0
+      self._lazyBlocks[name] = {'indices':indices,
+                                'A':sparse.csr_matrix((coefficients.data[mask].astype(float), (coefficients.row[mask], columns[coefficients.col[mask]])),
+                                                      shape=(size, self.numVariables)),
+                                'lower':np.broadcast_to(np.asarray(lower, dtype=float), (size,)),
+                                'upper':np.broadcast_to(np.asarray(upper, dtype=float), (size,)),
+                                'active':np.zeros(size, dtype=bool)}
+      return np.zeros(0, dtype=int)
+    rows = np.arange(self.numConstraints, self.numConstraints + size)
+    mask = coefficients.data != 0
+    self._rows.append(rows[coefficients.row[mask]])
+    self._cols.append(columns[coefficients.col[mask]])
+    self._vals.append(coefficients.data[mask].astype(float))
+    self._rowLower.append(np.broadcast_to(np.asarray(lower, dtype=float), (size,)))
+    self._rowUpper.append(np.broadcast_to(np.asarray(upper, dtype=float), (size,)))
+    self._conBlocks[name] = (self.numConstraints, indices)
+    self.numConstraints += size
+    self._cache = None
+    return rows
+
+  @property
+  def numLazyConstraints(self):
+    """
+      Number of the lazy constraints that are not added to the model yet
+      @ In, None
+      @ Out, numLazyConstraints, int, the number of inactive lazy constraints
+    """
+    return sum(int((~block['active']).sum()) for block in self._lazyBlocks.values())
+
+  def addViolatedConstraints(self, values, tol=1e-6):
+    """
+      Add the lazy constraints that are violated by the given solution to the model. The added constraints of each
+      round are named by the name of the lazy constraints and the round, i.e. 'constraintNoTie_1'
+      @ In, values, numpy.array, the values of the variables
+      @ In, tol, float, optional, the tolerance of the violation
+      @ Out, numAdded, int, the number of added constraints
+    """
+    self._lazyRounds += 1
+    numAdded = 0
+    for name, block in self._lazyBlocks.items():
+      A = block['A']
+      activity = A.dot(values[:A.shape[1]])
+      violated = np.flatnonzero(~block['active'] & ((activity > block['upper'] + tol) | (activity < block['lower'] - tol)))
+      if len(violated) == 0:
+        continue
+      block['active'][violated] = True
+      A = A[violated].tocoo()
+      self.addConstraints(name + '_' + str(self._lazyRounds), list(block['indices'][k] for k in violated),
+                          (A.data, (A.row, A.col)), np.arange(A.shape[1]),
+                          lower=block['lower'][violated], upper=block['upper'][violated])
+      logger.debug('%d violated constraints "%s" are added', len(violated), name)
+      numAdded += len(violated)
+    return numAdded
+
+  def constraintBlock(self, name):
+    """
+      Get the indices and rows of given block of constraints
+      @ In, name, str, name of the constraints
+      @ Out, (indices, rows), tuple, list of the constraint indices and numpy.array of the constraint rows
+    """
+    first, indices = self._conBlocks[name]
+    return indices, np.arange(first, first + len(indices))
+
+  def assemble(self):
+    """
+      Assemble the arrays of the linear program
+      @ In, None
+      @ Out, arrays, dict, {'c', 'A', 'rowLower', 'rowUpper', 'lower', 'upper', 'integrality'}, where 'A' is
+        scipy.sparse.csr_matrix with shape (numConstraints, numVariables)
+    """
+    if self._cache is None:
+      concat = lambda arrays, dtype: np.concatenate(arrays).astype(dtype) if arrays else np.zeros(0, dtype=dtype)
+      c = np.zeros(self.numVariables)
+      for columns, coefficients in self._objective:
+        np.add.at(c, columns, coefficients)
+      # duplicated entries of the constraint matrix are summed
+      A = sparse.csr_matrix((concat(self._vals, float), (concat(self._rows, int), concat(self._cols, int))),
+                            shape=(self.numConstraints, self.numVariables))
+      A.sum_duplicates()
+      self._cache = {'c':c, 'A':A,
+                     'rowLower':concat(self._rowLower, float), 'rowUpper':concat(self._rowUpper, float),
+                     'lower':concat(self._lower, float), 'upper':concat(self._upper, float),
+                     'integrality':concat(self._integrality, bool)}
+    return self._cache
+
+  def variableLabels(self, symbolic=True):
+    """
+      Get the unique labels of the variables
+      @ In, symbolic, bool, optional, the labels are generated from the names and indices of the variables if True,
+        otherwise the labels are 'x1', 'x2', ... in the order of the columns
+      @ Out, labels, list, list of variable labels
+    """
+    if not symbolic:
+      return list('x' + str(col + 1) for col in range(self.numVariables))
+    return self.uniqueLabels(list(labelName(name, index) for name, indices in self._varBlocks for index in indices))
+
+  def constraintLabels(self, symbolic=True):
+    """
+      Get the unique labels of the constraints
+      @ In, symbolic, bool, optional, the labels are generated from the names and indices of the constraints if
+        True, otherwise the labels are 'c1', 'c2', ... in the order of the rows
+      @ Out, labels, list, list of constraint labels
+    """
+    if not symbolic:
+      return list('c' + str(row + 1) for row in range(self.numConstraints))
+    return self.uniqueLabels(list(labelName(name, index) for name, (_, indices) in self._conBlocks.items() for index in indices))
+
+  @staticmethod
+  def uniqueLabels(labels):
+    """
+      Make the labels unique, the position is appended to the duplicated labels
+      @ In, labels, list, list of labels
+      @ Out, labels, list, list of unique labels
+    """
+    if len(set(labels)) == len(labels):
+      return labels
+    seen = set()
+    unique = []
+    for pos, label in enumerate(labels):
+      if label in seen:
+        label = label + '_' + str(pos)
+      seen.add(label)
+      unique.append(label)
+    return unique
+
+  def objectiveValue(self, values):
+    """
+      Evaluate the objective
+      @ In, values, numpy.array, the values of the variables
+      @ Out, objectiveValue, float, the value of the objective
+    """
+    return float(np.dot(self.assemble()['c'], values))
+
+  def write(self, filename, symbolic=True):
+    """
+      Write the linear program to file, the format is determined by the extension, i.e. '.mps' or '.lp'
+      @ In, filename, str, the file name
+      @ In, symbolic, bool, optional, use the names and indices of the variables and constraints as labels if True
+      @ Out, None
+    """
+    if filename.lower().endswith('.mps'):
+      self.writeMPS(filename, symbolic)
+    elif filename.lower().endswith('.lp'):
+      self.writeLP(filename, symbolic)
+    else:
+      raise IOError('Unrecognized model file "{}", the extension should be either ".lp" or ".mps"!'.format(filename))
+
+  @staticmethod
+  def _formatNumber(val):
+    """
+      Format the number for LP and MPS files
+      @ In, val, float, the number
+      @ Out, _formatNumber, str, the formatted number
+    """
+    return repr(float(val))
+
+  def writeLP(self, filename, symbolic=True):
+    """
+      Write the linear program to file in CPLEX LP format. The constraints are labeled with the prefix used by
+      pyomo, i.e. 'c_u_', 'c_l_', 'c_e_' for upper bound, lower bound and equality constraints, and 'r_l_', 'r_u_'
+      for the two sides of range constraints, so that the duals can be retrieved by pyomo solver plugins.
+      @ In, filename, str, the file name
+      @ In, symbolic, bool, optional, use the names and indices of the variables and constraints as labels if True,
+        otherwise the short labels 'x1', 'c1', ... are used, which are not truncated by the solvers
+      @ Out, None
+    """
+    arrays = self.assemble()
+    fmt = self._formatNumber
+    varLabels = self.variableLabels(symbolic)
+    conLabels = self.constraintLabels(symbolic)
+    A = arrays['A']
+    with open(filename, 'w') as lpFile:
+      lpFile.write('\\* Source LOGOS matrix model: {} *\\\n\n'.format(self.name))
+      lpFile.write('max\n' if self.maximize else 'min\n')
+      lpFile.write('obj:\n')
+      nonzeros = np.flatnonzero(arrays['c'])
+      if len(nonzeros) == 0 and self.numVariables > 0:
+        nonzeros = [0]
+      for col in nonzeros:
+        lpFile.write('{}{} {}\n'.format('+' if arrays['c'][col] >= 0 else '', fmt(arrays['c'][col]), varLabels[col]))
+      lpFile.write('\ns.t.\n\n')
+      for row in range(self.numConstraints):
+        lower, upper = arrays['rowLower'][row], arrays['rowUpper'][row]
+        if np.isinf(lower) and np.isinf(upper):
+          continue
+        start, end = A.indptr[row], A.indptr[row+1]
+        terms = ''.join('{}{} {}\n'.format('+' if val >= 0 else '', fmt(val), varLabels[col])
+                        for col, val in zip(A.indices[start:end], A.data[start:end]))
+        if not terms:
+          terms = '+0.0 {}\n'.format(varLabels[0])
+        if lower == upper:
+          lpFile.write('c_e_{}_:\n{}= {}\n\n'.format(conLabels[row], terms, fmt(upper)))
+        elif np.isinf(lower):
+          lpFile.write('c_u_{}_:\n{}<= {}\n\n'.format(conLabels[row], terms, fmt(upper)))
+        elif np.isinf(upper):
+          lpFile.write('c_l_{}_:\n{}>= {}\n\n'.format(conLabels[row], terms, fmt(lower)))
+        else:
+          lpFile.write('r_l_{}_:\n{}>= {}\n\n'.format(conLabels[row], terms, fmt(lower)))
+          lpFile.write('r_u_{}_:\n{}<= {}\n\n'.format(conLabels[row], terms, fmt(upper)))
+      lpFile.write('bounds\n')
+      for col in range(self.numVariables):
+        lower, upper = arrays['lower'][col], arrays['upper'][col]
+        lpFile.write('   {} <= {} <= {}\n'.format('-inf' if np.isinf(lower) else fmt(lower), varLabels[col],
+                                                  '+inf' if np.isinf(upper) else fmt(upper)))
+      integers = np.flatnonzero(arrays['integrality'])
+      if len(integers) > 0:
+        lpFile.write('general\n')
+        for col in integers:
+          lpFile.write('  {}\n'.format(varLabels[col]))
+      lpFile.write('end\n')
+
+  def writeMPS(self, filename, symbolic=True):
+    """
+      Write the linear program to file in free MPS format
+      @ In, filename, str, the file name
+      @ In, symbolic, bool, optional, use the names and indices of the variables and constraints as labels if True
+      @ Out, None
+    """
+    arrays = self.assemble()
+    fmt = self._formatNumber
+    varLabels = self.variableLabels(symbolic)
+    conLabels = self.constraintLabels(symbolic)
+    rowLower, rowUpper = arrays['rowLower'], arrays['rowUpper']
+    A = arrays['A'].tocsc()
+    with open(filename, 'w') as mpsFile:
+      mpsFile.write('NAME {}\n'.format(labelName(self.name)))
+      mpsFile.write('OBJSENSE\n    {}\n'.format('MAX' if self.maximize else 'MIN'))
+      mpsFile.write('ROWS\n N obj\n')
+      rowTypes = []
+      for row in range(self.numConstraints):
+        lower, upper = rowLower[row], rowUpper[row]
+        if lower == upper:
+          rowType = 'E'
+        elif np.isinf(lower) and np.isinf(upper):
+          rowType = 'N'
+        elif np.isinf(lower) or not np.isinf(upper):
+          rowType = 'L'
+        else:
+          rowType = 'G'
+        rowTypes.append(rowType)
+        mpsFile.write(' {} {}\n'.format(rowType, conLabels[row]))
+      mpsFile.write('COLUMNS\n')
+      integer = False
+      for col in range(self.numVariables):
+        if arrays['integrality'][col] != integer:
+          integer = arrays['integrality'][col]
+          mpsFile.write("    MARKER 'MARKER' '{}'\n".format('INTORG' if integer else 'INTEND'))
+        if arrays['c'][col] != 0:
+          mpsFile.write('    {} obj {}\n'.format(varLabels[col], fmt(arrays['c'][col])))
+        start, end = A.indptr[col], A.indptr[col+1]
+        for row, val in zip(A.indices[start:end], A.data[start:end]):
+          mpsFile.write('    {} {} {}\n'.format(varLabels[col], conLabels[row], fmt(val)))
+        if start == end and arrays['c'][col] == 0:
+          mpsFile.write('    {} obj 0.0\n'.format(varLabels[col]))
+      if integer:
+        mpsFile.write("    MARKER 'MARKER' 'INTEND'\n")
+      mpsFile.write('RHS\n')
+      for row, rowType in enumerate(rowTypes):
+        rhs = rowLower[row] if rowType == 'G' else rowUpper[row]
+        if rowType != 'N' and rhs != 0:
+          mpsFile.write('    RHS {} {}\n'.format(conLabels[row], fmt(rhs)))
+      ranges = list(row for row, rowType in enumerate(rowTypes) if rowType == 'L' and not np.isinf(rowLower[row]))
+      if ranges:
+        mpsFile.write('RANGES\n')
+        for row in ranges:
+          mpsFile.write('    RNG {} {}\n'.format(conLabels[row], fmt(rowUpper[row] - rowLower[row])))
+      mpsFile.write('BOUNDS\n')
+      for col in range(self.numVariables):
+        lower, upper = arrays['lower'][col], arrays['upper'][col]
+        if lower == upper:
+          mpsFile.write(' FX BND {} {}\n'.format(varLabels[col], fmt(lower)))
+          continue
+        if np.isinf(lower):
+          mpsFile.write(' MI BND {}\n'.format(varLabels[col]))
+        elif lower != 0 or arrays['integrality'][col]:
+          mpsFile.write(' LO BND {} {}\n'.format(varLabels[col], fmt(lower)))
+        if not np.isinf(upper):
+          mpsFile.write(' UP BND {} {}\n'.format(varLabels[col], fmt(upper)))
+        elif arrays['integrality'][col]:
+          mpsFile.write(' PL BND {}\n'.format(varLabels[col]))
+      mpsFile.write('ENDATA\n')
+
+# options of scipy.optimize.milp that can be provided through the solver options, {optionName: type}
+_highsOptions = {'time_limit':float, 'node_limit':int, 'mip_rel_gap':float, 'presolve':lambda val: str(val).strip().lower() in ['yes','y','true','t','on']}
+
+def highsOptions(solverOptions, tee=False):
+  """
+    Convert the solver options into the options of scipy.optimize.milp, the options that are not recognized by
+    HiGHS are ignored
+    @ In, solverOptions, dict, {optionName: optionVal}, the solver options
+    @ In, tee, bool, optional, print the output of the solver if True
+    @ Out, options, dict, the options of scipy.optimize.milp
+  """
+  options = {'disp':tee}
+  for name, val in solverOptions.items():
+    if name not in _highsOptions:
+      logger.warning('Solver option "%s" is not supported by solver "highs_inprocess", and will be ignored!', name)
+      continue
+    options[name] = _highsOptions[name](val)
+  return options
+
+def solveHighs(lp, options=None):
+  """
+    Solve the linear program in memory with HiGHS through scipy.optimize.milp. Since the duals are not available
+    for mixed integer problems, they are retrieved from the linear program with the integer variables fixed at
+    their optimal values, which is consistent with the duals reported by CBC.
+    @ In, lp, LinearProgram, the mixed integer linear program
+    @ In, options, dict, optional, the options of scipy.optimize.milp, see highsOptions
+    @ Out, result, dict, {'status': 'optimal', 'infeasible', 'unbounded', 'limit' or 'error', 'message': str,
+      'values': numpy.array, 'duals': numpy.array}
+  """
+  try:
+    from scipy.optimize import milp, LinearConstraint, Bounds
+  except ImportError:
+    raise IOError('Solver "highs_inprocess" requires scipy >= 1.9.0, please update scipy or use solver "cbc"!')
+  options = {} if options is None else dict(options)
+  arrays = lp.assemble()
+  sign = -1.0 if lp.maximize else 1.0
+  c = sign * arrays['c']
+  constraints = LinearConstraint(arrays['A'], arrays['rowLower'], arrays['rowUpper']) if lp.numConstraints > 0 else None
+  res = milp(c, constraints=constraints, integrality=arrays['integrality'].astype(int),
+             bounds=Bounds(arrays['lower'], arrays['upper']), options=options)
+  status = {0:'optimal', 1:'limit', 2:'infeasible', 3:'unbounded'}.get(res.status, 'error')
+  result = {'status':status, 'message':res.message, 'values':None, 'duals':np.zeros(lp.numConstraints)}
+  if res.x is None:
+    return result
+  values = np.asarray(res.x, dtype=float)
+  integrality = arrays['integrality']
+  values[integrality] = np.round(values[integrality])
+  result['values'] = values
+  if status == 'optimal' and lp.numConstraints > 0:
+    lower, upper = arrays['lower'].copy(), arrays['upper'].copy()
+    lower[integrality] = upper[integrality] = values[integrality]
+    result['duals'] = sign * _highsDuals(c, arrays['A'], arrays['rowLower'], arrays['rowUpper'], lower, upper)
+  return result
+
+def _highsDuals(c, A, rowLower, rowUpper, lower, upper):
+  """
+    Compute the duals of the constraints of the linear program, i.e. the sensitivity of the minimum of c^T x
+    subject to rowLower <= A x <= rowUpper and lower <= x <= upper with respect to the active bound of each row
+    @ In, c, numpy.array, the objective coefficients
+    @ In, A, scipy.sparse.csr_matrix, the constraint matrix
+    @ In, rowLower, numpy.array, the lower bounds of the constraints
+    @ In, rowUpper, numpy.array, the upper bounds of the constraints
+    @ In, lower, numpy.array, the lower bounds of the variables
+    @ In, upper, numpy.array, the upper bounds of the variables
+    @ Out, duals, numpy.array, the duals of the constraints, zeros if the linear program can not be solved
+  """
+  from scipy.optimize import linprog
+  duals = np.zeros(A.shape[0])
+  equal = np.flatnonzero(rowLower == rowUpper)
+  above = np.flatnonzero((rowLower != rowUpper) & np.isfinite(rowUpper))
+  below = np.flatnonzero((rowLower != rowUpper) & np.isfinite(rowLower))
+  # rowLower <= A x is written as -A x <= -rowLower
+  res = linprog(c, A_ub=sparse.vstack([A[above], -A[below]]).tocsr() if len(above) + len(below) else None,
+                b_ub=np.concatenate([rowUpper[above], -rowLower[below]]) if len(above) + len(below) else None,
+                A_eq=A[equal] if len(equal) else None, b_eq=rowUpper[equal] if len(equal) else None,
+                bounds=np.column_stack([lower, upper]), method='highs')
+  if res.status != 0:
+    logger.warning('Duals of the constraints are not available: %s', res.message)
+    return duals
+  if len(equal):
+    duals[equal] = res.eqlin.marginals
+  if len(above) + len(below):
+    marginals = res.ineqlin.marginals
+    np.add.at(duals, above, marginals[:len(above)])
+    np.add.at(duals, below, -marginals[len(above):])
+  return duals
@@ -0,0 +1,679 @@
+# Copyright 2020, Battelle Energy Alliance, LLC
+# ALL RIGHTS RESERVED
+"""
+  Created on Oct. 18, 2026
+  @author: wangc, mandd
+"""
+#External Modules------------------------------------------------------------------------------------
+import collections
+import collections.abc
+import logging
+import numpy as np
+#External Modules End--------------------------------------------------------------------------------
+
+#Internal Modules------------------------------------------------------------------------------------
+try:
+  from CapitalInvestments.investment_utils import distanceUtils
+except ImportError:
+  from LOGOS.src.CapitalInvestments.investment_utils import distanceUtils
+#Internal Modules End--------------------------------------------------------------------------------
+
+logger = logging.getLogger(__name__)
+
+# maximum number of elements of each chunk of the distance matrix that is computed at once
+_chunkElements = 1 << 22
+
+class ScenarioSpace(collections.abc.Mapping):
+  """
+    Index-addressable scenario space for stochastic optimization.
+    The scenario space is the Cartesian product of the scenarios of each factor, where a factor is either one
+    uncertain parameter with independent scenarios, or a group of uncertain parameters with joint scenarios.
+    Instead of materializing the product, scenario k is decoded on demand by mixed-radix indexing, where the last
+    added factor varies the fastest (i.e. the same ordering as itertools.product).
+    The scenario data of each uncertain parameter is stored in a 2-D array (scenarios of its factor x indices) with a
+    shared list of set indices. The space behaves as a read-only mapping {scenarioName: {paramName: {setIndex: uncertaintyVal}}},
+    where the scenario names are 'scenario_1', ..., 'scenario_N'.
+  """
+  def __init__(self):
+    """
+      Constructor
+      @ In, None
+      @ Out, None
+    """
+    self.params = []         # list of uncertain parameter names
+    self._factorOf = []      # index of the factor for each uncertain parameter
+    self._indices = []       # list of set indices for each uncertain parameter, shared by all its scenarios
+    self._matrices = []      # list of 2-D numpy arrays (scenarios x indices) for each uncertain parameter
+    self._names = []         # list of scenario names for each factor
+    self._probabilities = [] # list of numpy arrays of scenario probabilities for each factor
+    self._radix = []         # number of scenarios for each factor
+    self._strides = []       # mixed-radix strides used to decode the scenario index
+
+  @staticmethod
+  def dataToMatrix(paramName, scenarioData):
+    """
+      Convert the scenario data of an uncertain parameter into 2-D array
+      @ In, paramName, str, name of the uncertain parameter
+      @ In, scenarioData, list, list of scenario data, i.e. [{setIndex:uncertaintyVal}]
+      @ Out, (indices, matrix), tuple, list of set indices and 2-D array of scenario data (scenarios x indices)
+    """
+    indexMap = getattr(scenarioData[0], 'indexMap', None)
+    if indexMap is not None and all(getattr(paramData, 'indexMap', None) is indexMap for paramData in scenarioData):
+      # scenario data read by inputReader shares the set indices, the arrays can be stacked directly
+      sources = [paramData.source for paramData in scenarioData]
+      if sources[0] is not None and all(source is not None and source[0] is sources[0][0] and source[1] == i for i, source in enumerate(sources)):
+        # all the rows of the same (possibly memory-mapped) matrix, keep the matrix without copying it
+        matrix = sources[0][0]
+        if matrix.shape[0] == len(scenarioData):
+          return list(indexMap.indices), matrix
+      return list(indexMap.indices), np.vstack([paramData.array for paramData in scenarioData]).astype(float)
+    indices = list(scenarioData[0].keys())
+    matrix = np.empty((len(scenarioData), len(indices)))
+    for i, paramData in enumerate(scenarioData):
+      if len(paramData) != len(indices):
+        raise IOError('The scenarios of parameter "{}" are not defined on the same indices!'.format(paramName))
+      try:
+        matrix[i,:] = [paramData[index] for index in indices]
+      except KeyError:
+        raise IOError('The scenarios of parameter "{}" are not defined on the same indices!'.format(paramName))
+    return indices, matrix
+
+  def addParameter(self, paramName, scenarioNames, probabilities, scenarioData):
+    """
+      Add the independent scenarios of an uncertain parameter to the scenario space
+      @ In, paramName, str, name of the uncertain parameter
+      @ In, scenarioNames, list, list of scenario names for this parameter
+      @ In, probabilities, list, list of probabilities for this parameter
+      @ In, scenarioData, list, list of scenario data, i.e. [{setIndex:uncertaintyVal}]
+      @ Out, None
+    """
+    if len(scenarioNames) != len(probabilities) or len(scenarioNames) != len(scenarioData):
+      raise IOError('The number of probabilities and scenarios for parameter "{}" are not consistent!'.format(paramName))
+    indices, matrix = self.dataToMatrix(paramName, scenarioData)
+    self.addFactor([paramName], scenarioNames, probabilities, [indices], [matrix])
+
+  def addJointParameters(self, paramNames, scenarioNames, probabilities, scenarioData):
+    """
+      Add the joint scenarios of a group of uncertain parameters to the scenario space
+      @ In, paramNames, list, list of names of the uncertain parameters
+      @ In, scenarioNames, list, list of joint scenario names
+      @ In, probabilities, list, list of probabilities for the joint scenarios
+      @ In, scenarioData, list, list of joint scenario data, i.e. [{paramName:{setIndex:uncertaintyVal}}]
+      @ Out, None
+    """
+    if len(scenarioNames) != len(probabilities) or len(scenarioNames) != len(scenarioData):
+      raise IOError('The number of probabilities and joint scenarios for parameters "{}" are not consistent!'.format(', '.join(paramNames)))
+    indicesList, matrices = [], []
+    for paramName in paramNames:
+      indices, matrix = self.dataToMatrix(paramName, [data[paramName] for data in scenarioData])
+      indicesList.append(indices)
+      matrices.append(matrix)
+    self.addFactor(paramNames, scenarioNames, probabilities, indicesList, matrices)
+
+  def addFactor(self, paramNames, scenarioNames, probabilities, indicesList, matrices):
+    """
+      Add a factor to the scenario space from the 2-D arrays of scenario data
+      @ In, paramNames, list, list of names of the uncertain parameters in this factor
+      @ In, scenarioNames, list, list of scenario names for this factor
+      @ In, probabilities, list, list of probabilities for this factor
+      @ In, indicesList, list, list of set indices for each uncertain parameter
+      @ In, matrices, list, list of 2-D arrays of scenario data with shape (len(scenarioNames), len(indices))
+      @ Out, None
+    """
+    if len(scenarioNames) != len(probabilities):
+      raise IOError('The number of probabilities and scenarios for parameters "{}" are not consistent!'.format(', '.join(paramNames)))
+    for paramName, indices, matrix in zip(paramNames, indicesList, matrices):
+      if paramName in self.params:
+        raise IOError('The scenarios of parameter "{}" are defined more than once!'.format(paramName))
+      matrix = np.asarray(matrix, dtype=float)
+      if matrix.shape != (len(scenarioNames), len(indices)):
+        raise IOError('The number of scenarios and indices for parameter "{}" are not consistent!'.format(paramName))
+      self.params.append(paramName)
+      self._factorOf.append(len(self._radix))
+      self._indices.append(list(indices))
+      self._matrices.append(matrix)
+    self._names.append(list(scenarioNames))
+    self._probabilities.append(np.asarray(probabilities, dtype=float))
+    self._radix.append(len(scenarioNames))
+    # strides are recomputed, the last factor varies the fastest
+    self._strides = [int(np.prod(self._radix[i+1:], dtype=np.int64)) for i in range(len(self._radix))]
+
+  def __len__(self):
+    """
+      Total number of scenarios
+      @ In, None
+      @ Out, __len__, int, total number of scenarios
+    """
+    if not self._radix:
+      return 0
+    return int(np.prod(self._radix, dtype=np.int64))
+
+  def __iter__(self):
+    """
+      Iterate over the scenario names
+      @ In, None
+      @ Out, __iter__, generator, generator of scenario names
+    """
+    for k in range(len(self)):
+      yield self.scenarioName(k)
+
+  def __getitem__(self, scenarioName):
+    """
+      Get the data of given scenario
+      @ In, scenarioName, str, name of the scenario
+      @ Out, __getitem__, dict, {paramName:{setIndex:uncertaintyVal}}
+    """
+    return self.data(self.index(scenarioName))
+
+  def __contains__(self, scenarioName):
+    """
+      Check if given scenario is in the scenario space
+      @ In, scenarioName, str, name of the scenario
+      @ Out, __contains__, bool, True if the scenario is in the space
+    """
+    try:
+      self.index(scenarioName)
+    except (KeyError, ValueError, AttributeError):
+      return False
+    return True
+
+  @staticmethod
+  def scenarioName(k):
+    """
+      Get the name of scenario k
+      @ In, k, int, scenario index (0-based)
+      @ Out, scenarioName, str, name of the scenario
+    """
+    return 'scenario_' + str(k + 1)
+
+  def index(self, scenarioName):
+    """
+      Get the scenario index from the scenario name
+      @ In, scenarioName, str, name of the scenario
+      @ Out, k, int, scenario index (0-based)
+    """
+    k = int(scenarioName.split('_')[-1]) - 1
+    if k < 0 or k >= len(self):
+      raise KeyError('Scenario "{}" is not in the scenario space!'.format(scenarioName))
+    return k
+
+  def decode(self, k):
+    """
+      Decode the scenario index into the scenario position of each factor
+      @ In, k, int, scenario index (0-based)
+      @ Out, position, tuple, scenario position for each factor
+    """
+    return tuple((k // stride) % radix for stride, radix in zip(self._strides, self._radix))
+
+  def probability(self, k):
+    """
+      Get the probability of scenario k
+      @ In, k, int or str, scenario index (0-based) or scenario name
+      @ Out, probability, float, probability of the scenario
+    """
+    if isinstance(k, str):
+      k = self.index(k)
+    prob = 1.0
+    for pos, probs in zip(self.decode(k), self._probabilities):
+      prob *= probs[pos]
+    return float(prob)
+
+  def probabilities(self):
+    """
+      Get the probabilities of all scenarios, in the order of the scenario index
+      @ In, None
+      @ Out, probs, numpy.array, 1-D array of probabilities
+    """
+    probs = np.ones(1)
+    for paramProbs in self._probabilities:
+      probs = np.outer(probs, paramProbs).ravel()
+    return probs
+
+  def label(self, k):
+    """
+      Get the tuple of factor scenario names that are combined into scenario k
+      @ In, k, int, scenario index (0-based)
+      @ Out, label, tuple, tuple of factor scenario names
+    """
+    return tuple(names[pos] for pos, names in zip(self.decode(k), self._names))
+
+  def data(self, k):
+    """
+      Get the data of scenario k
+      @ In, k, int, scenario index (0-based)
+      @ Out, data, dict, {paramName:{setIndex:uncertaintyVal}}
+    """
+    return dict((param, collections.OrderedDict(zip(indices, row.tolist()))) for param, indices, row in self.values(k))
+
+  def values(self, k):
+    """
+      Get the data of scenario k as slices of the scenario data arrays
+      @ In, k, int, scenario index (0-based)
+      @ Out, values, list, list of (paramName, setIndices, 1-D numpy array of uncertaintyVal)
+    """
+    position = self.decode(k)
+    return [(param, indices, matrix[position[f]]) for param, indices, matrix, f in zip(self.params, self._indices, self._matrices, self._factorOf)]
+
+  def matrix(self, scenarios=None):
+    """
+      Get the scenario data of all uncertain parameters as one 2-D array, i.e. the data of each scenario is the
+      concatenation of the data of all uncertain parameters
+      @ In, scenarios, numpy.array, optional, scenario indices (0-based), default to all scenarios
+      @ Out, matrix, numpy.array, 2-D array with shape (numberScenarios, paramsVariationSize)
+    """
+    if scenarios is None:
+      scenarios = np.arange(len(self), dtype=np.int64)
+    scenarios = np.asarray(scenarios, dtype=np.int64)
+    positions = (scenarios[:,np.newaxis] // np.asarray(self._strides, dtype=np.int64)) % np.asarray(self._radix, dtype=np.int64)
+    return np.hstack([matrix[positions[:,f]] for matrix, f in zip(self._matrices, self._factorOf)])
+
+  def scenarios(self):
+    """
+      Stream over all scenarios
+      @ In, None
+      @ Out, scenarios, generator, generator of (scenarioName, probability, data)
+    """
+    for k in range(len(self)):
+      yield self.scenarioName(k), self.probability(k), self.data(k)
+
+  def sample(self, size, rng):
+    """
+      Sample scenarios from the scenario space, the scenarios of each factor are sampled independently
+      according to their probabilities, so that the scenario space is never enumerated
+      @ In, size, int, number of samples
+      @ In, rng, numpy.random.Generator, random number generator
+      @ Out, subspace, ScenarioSubspace, the sampled scenarios with their empirical probabilities
+    """
+    indices = np.zeros(size, dtype=np.int64)
+    for radix, stride, probs in zip(self._radix, self._strides, self._probabilities):
+      indices += rng.choice(radix, size=size, p=probs/probs.sum()) * stride
+    return sampleSubspace(self, indices)
+
+  def subspace(self, indices, probabilities, factorMembers=None):
+    """
+      Get the subspace composed of given scenarios, i.e. the scenarios kept by scenario reduction
+      @ In, indices, list, list of scenario indices (0-based) of this space
+      @ In, probabilities, list, list of probabilities for the given scenarios
+      @ In, factorMembers, list, optional, the scenarios of each factor that are merged into the kept scenarios of
+        the factor, see ScenarioSubspace
+      @ Out, subspace, ScenarioSubspace, the subspace of this space
+    """
+    return ScenarioSubspace(self, indices, probabilities, factorMembers)
+
+class ScenarioSubspace(collections.abc.Mapping):
+  """
+    Subset of a scenario space with its own probabilities. The kept scenarios retain their names in the
+    original scenario space, and scenario k of the subspace is scenario self.indices[k] of the original space.
+  """
+  def __init__(self, space, indices, probabilities, factorMembers=None):
+    """
+      Constructor
+      @ In, space, ScenarioSpace, the original scenario space
+      @ In, indices, list, list of scenario indices (0-based) of the original space
+      @ In, probabilities, list, list of probabilities for the given scenarios
+      @ In, factorMembers, list, optional, one entry for each factor of the original space, i.e.
+        {position: numpy array of the positions (0-based) of the factor scenarios merged into the scenario at
+        position}, or None if the scenarios of the factor are not merged. The original scenarios represented by
+        each given scenario are decoded on demand, see self.members
+      @ Out, None
+    """
+    if len(indices) != len(probabilities) or (factorMembers is not None and len(factorMembers) != len(space._radix)):
+      raise IOError('The number of probabilities and scenarios are not consistent!')
+    self.space = space
+    self.params = space.params
+    self.indices = np.asarray(indices, dtype=int)
+    self._probabilities = np.asarray(probabilities, dtype=float)
+    self.factorMembers = factorMembers
+    self._position = dict((space.scenarioName(idx), k) for k, idx in enumerate(self.indices))
+
+  def __len__(self):
+    """
+      Total number of scenarios
+      @ In, None
+      @ Out, __len__, int, total number of scenarios
+    """
+    return len(self.indices)
+
+  def __iter__(self):
+    """
+      Iterate over the scenario names
+      @ In, None
+      @ Out, __iter__, generator, generator of scenario names
+    """
+    for k in range(len(self)):
+      yield self.scenarioName(k)
+
+  def __getitem__(self, scenarioName):
+    """
+      Get the data of given scenario
+      @ In, scenarioName, str, name of the scenario
+      @ Out, __getitem__, dict, {paramName:{setIndex:uncertaintyVal}}
+    """
+    return self.data(self.index(scenarioName))
+
+  def __contains__(self, scenarioName):
+    """
+      Check if given scenario is in the scenario subspace
+      @ In, scenarioName, str, name of the scenario
+      @ Out, __contains__, bool, True if the scenario is in the subspace
+    """
+    return scenarioName in self._position
+
+  def members(self, k):
+    """
+      Get the original scenarios represented by scenario k, i.e. the combinations of the merged scenarios of
+      each factor, decoded in the same way as the data of the scenario
+      @ In, k, int, scenario index (0-based) of the subspace
+      @ Out, members, numpy.array, the indices (0-based) of the original scenarios, None if the scenarios are
+        not merged
+    """
+    if self.factorMembers is None:
+      return None
+    members = np.zeros(1, dtype=np.int64)
+    for pos, merged, stride in zip(self.space.decode(self.indices[k]), self.factorMembers, self.space._strides):
+      merged = np.asarray([pos], dtype=np.int64) if merged is None else merged[pos]
+      members = np.add.outer(members, merged * stride).ravel()
+    return members
+
+  def scenarioName(self, k):
+    """
+      Get the name of scenario k
+      @ In, k, int, scenario index (0-based) of the subspace
+      @ Out, scenarioName, str, name of the scenario
+    """
+    return self.space.scenarioName(self.indices[k])
+
+  def index(self, scenarioName):
+    """
+      Get the scenario index from the scenario name
+      @ In, scenarioName, str, name of the scenario
+      @ Out, k, int, scenario index (0-based) of the subspace
+    """
+    if scenarioName not in self._position:
+      raise KeyError('Scenario "{}" is not in the scenario space!'.format(scenarioName))
+    return self._position[scenarioName]
+
+  def probability(self, k):
+    """
+      Get the probability of scenario k
+      @ In, k, int or str, scenario index (0-based) of the subspace or scenario name
+      @ Out, probability, float, probability of the scenario
+    """
+    if isinstance(k, str):
+      k = self.index(k)
+    return float(self._probabilities[k])
+
+  def probabilities(self):
+    """
+      Get the probabilities of all scenarios, in the order of the scenario index
+      @ In, None
+      @ Out, probs, numpy.array, 1-D array of probabilities
+    """
+    return self._probabilities.copy()
+
+  def label(self, k):
+    """
+      Get the tuple of factor scenario names that are combined into scenario k
+      @ In, k, int, scenario index (0-based) of the subspace
+      @ Out, label, tuple, tuple of factor scenario names
+    """
+    return self.space.label(self.indices[k])
+
+  def data(self, k):
+    """
+      Get the data of scenario k
+      @ In, k, int, scenario index (0-based) of the subspace
+      @ Out, data, dict, {paramName:{setIndex:uncertaintyVal}}
+    """
+    return self.space.data(self.indices[k])
+
+  def values(self, k):
+    """
+      Get the data of scenario k as slices of the scenario data arrays
+      @ In, k, int, scenario index (0-based) of the subspace
+      @ Out, values, list, list of (paramName, setIndices, 1-D numpy array of uncertaintyVal)
+    """
+    return self.space.values(self.indices[k])
+
+  def matrix(self, scenarios=None):
+    """
+      Get the scenario data of all uncertain parameters as one 2-D array
+      @ In, scenarios, numpy.array, optional, scenario indices (0-based) of the subspace, default to all scenarios
+      @ Out, matrix, numpy.array, 2-D array with shape (numberScenarios, paramsVariationSize)
+    """
+    if scenarios is None:
+      return self.space.matrix(self.indices)
+    return self.space.matrix(self.indices[np.asarray(scenarios, dtype=int)])
+
+  def scenarios(self):
+    """
+      Stream over all scenarios
+      @ In, None
+      @ Out, scenarios, generator, generator of (scenarioName, probability, data)
+    """
+    for k in range(len(self)):
+      yield self.scenarioName(k), self.probability(k), self.data(k)
+
+  def subspace(self, indices, probabilities):
+    """
+      Get the subspace composed of given scenarios of this subspace. The merged scenarios of each factor are kept,
+      since they are stored by the positions of the factor scenarios in the original space, i.e. each scenario
+      of the subspace still represents the same duplicated scenarios, see self.members
+      @ In, indices, list, list of scenario indices (0-based) of this subspace
+      @ In, probabilities, list, list of probabilities for the given scenarios
+      @ Out, subspace, ScenarioSubspace, the subspace of the original scenario space
+    """
+    return self.space.subspace(self.indices[np.asarray(indices, dtype=int)], probabilities, self.factorMembers)
+
+  def sample(self, size, rng):
+    """
+      Sample scenarios from the scenario subspace according to their probabilities
+      @ In, size, int, number of samples
+      @ In, rng, numpy.random.Generator, random number generator
+      @ Out, subspace, ScenarioSubspace, the sampled scenarios with their empirical probabilities
+    """
+    probs = self._probabilities
+    indices = self.indices[rng.choice(len(self), size=size, p=probs/probs.sum())]
+    return sampleSubspace(self.space, indices, self.factorMembers)
+
+def sampleSubspace(space, indices, factorMembers=None):
+  """
+    Build the subspace of sampled scenarios, where the duplicated samples are merged and the probability of each
+    scenario is its frequency in the samples
+    @ In, space, ScenarioSpace, the original scenario space
+    @ In, indices, numpy.array, 1-D array of the sampled scenario indices (0-based) of the original space
+    @ In, factorMembers, list, optional, the scenarios of each factor that are merged into the sampled scenarios,
+      see ScenarioSubspace
+    @ Out, subspace, ScenarioSubspace, the sampled scenarios with their empirical probabilities
+  """
+  indices, counts = np.unique(indices, return_counts=True)
+  return space.subspace(indices, counts/counts.sum(), factorMembers)
+
+def mergeScenarios(space, merge=True, threshold=0.0):
+  """
+    Merge the duplicated scenarios and drop the scenarios with zero or negligible probabilities. Since the data
+    of a scenario is the concatenation of the data of each factor, two scenarios are identical if and only if the
+    scenarios of each factor are identical, so the duplicates are detected for each factor without enumerating the
+    scenario space.
+    @ In, space, ScenarioSpace, the scenario space
+    @ In, merge, bool, optional, True to merge the duplicated scenarios
+    @ In, threshold, float, optional, the scenarios with probabilities below the threshold are dropped, and the
+      probabilities of the kept scenarios are renormalized
+    @ Out, subspace, ScenarioSubspace, the kept scenarios with their probabilities, and the original scenarios
+      represented by each kept scenario
+  """
+  keptPositions = []
+  keptProbs = []
+  factorMembers = []
+  for f, probs in enumerate(space._probabilities):
+    if merge:
+      # hash the scenario data of this factor, the first occurrence is used to represent the duplicates
+      matrix = np.hstack([m for m, factor in zip(space._matrices, space._factorOf) if factor == f])
+      _, first, inverse = np.unique(matrix, axis=0, return_index=True, return_inverse=True)
+      inverse = np.ravel(inverse)
+      order = np.argsort(first)
+      positions = first[order]
+      paramProbs = np.bincount(inverse, weights=probs, minlength=len(first))[order]
+      keep = paramProbs > 0.0
+      # the members are stored for each factor, and combined on demand, see ScenarioSubspace.members
+      factorMembers.append(dict((int(first[i]), np.flatnonzero(inverse == i)) for i, k in zip(order, keep) if k))
+    else:
+      positions = np.arange(len(probs))
+      paramProbs = probs
+      keep = paramProbs > 0.0
+      factorMembers.append(None)
+    keptPositions.append(positions[keep])
+    keptProbs.append(paramProbs[keep])
+  # combine the kept scenarios of each factor, the ordering is the same as the original space
+  indices = np.zeros(1, dtype=np.int64)
+  probs = np.ones(1)
+  for positions, paramProbs, stride in zip(keptPositions, keptProbs, space._strides):
+    indices = np.add.outer(indices, positions * stride).ravel()
+    probs = np.outer(probs, paramProbs).ravel()
+  if threshold > 0.0:
+    keep = probs >= threshold
+    if not np.any(keep):
+      raise IOError('All scenarios have probabilities below the threshold {}!'.format(threshold))
+    indices, probs = indices[keep], probs[keep]
+    probs = probs / probs.sum()
+  return space.subspace(indices, probs, factorMembers)
+
+def fastForwardSelection(distData, probs, number=None, tolerance=None, overwrite=False):
+  """
+    Forward selection of scenarios (Heitsch and Roemisch, 2003). At each step, the scenario that minimizes the
+    Kantorovich distance between the original and the reduced distributions is added to the kept scenarios.
+    @ In, distData, numpy.array, 2-D array of the pairwise distance between scenarios
+    @ In, probs, numpy.array, 1-D array of the probabilities of scenarios
+    @ In, number, int, optional, target number of kept scenarios
+    @ In, tolerance, float, optional, the selection stops once the reduction error is below this tolerance
+    @ In, overwrite, bool, optional, if True, distData is used as the work array and overwritten, otherwise it is
+      copied, which doubles the memory
+    @ Out, selected, list, list of indices of kept scenarios, in the order of selection
+  """
+  nScenarios = len(probs)
+  number = nScenarios if number is None else min(number, nScenarios)
+  if overwrite and isinstance(distData, np.ndarray) and distData.dtype == float:
+    cost = distData
+  else:
+    cost = np.array(distData, dtype=float)
+  remaining = np.ones(nScenarios, dtype=bool)
+  selected = []
+  while len(selected) < number:
+    weights = np.where(remaining, probs, 0.0)
+    z = weights.dot(cost)
+    z[~remaining] = np.inf
+    u = int(np.argmin(z))
+    selected.append(u)
+    remaining[u] = False
+    # cost[k, j] = min(cost[k, j], cost[k, u]), i.e. distance from k to the closest kept scenario if j is kept
+    np.minimum(cost, cost[:, u:u+1], out=cost)
+    if tolerance is not None and np.where(remaining, probs, 0.0).dot(cost[:, u]) <= tolerance:
+      break
+  return selected
+
+def kMedoids(distance, probs, medoids, maxIter=100):
+  """
+    Probability weighted k-medoids clustering of scenarios, i.e. alternate the assignment of each scenario
+    to its closest medoid and the update of the medoid of each cluster
+    @ In, distance, numpy.array or function, 2-D array of the pairwise distance between scenarios, or function
+      distance(rows, columns) that returns the distance between the scenarios of given indices
+    @ In, probs, numpy.array, 1-D array of the probabilities of scenarios
+    @ In, medoids, list, list of indices of the initial medoids
+    @ In, maxIter, int, optional, maximum number of iterations
+    @ Out, medoids, list, list of indices of the medoids
+  """
+  if isinstance(distance, np.ndarray):
+    distData = distance
+    distance = lambda rows, columns: distData[np.ix_(rows, columns)]
+  allScenarios = np.arange(len(probs))
+  medoids = list(medoids)
+  for _ in range(maxIter):
+    assign, _ = _closest(distance, allScenarios, medoids)
+    newMedoids = []
+    for c, m in enumerate(medoids):
+      members = np.flatnonzero(assign == c)
+      if len(members) == 0:
+        newMedoids.append(m)
+        continue
+      # probability weighted distance from the members to each candidate medoid, accumulated over row chunks
+      cost = np.zeros(len(members))
+      for chunk in _chunks(len(members), len(members)):
+        cost += probs[members[chunk]].dot(distance(members[chunk], members))
+      newMedoids.append(int(members[np.argmin(cost)]))
+    if newMedoids == medoids:
+      break
+    medoids = newMedoids
+  return medoids
+
+def _chunks(nRows, nColumns, maxElements=_chunkElements):
+  """
+    Split the rows into chunks, so that each chunk of the distance matrix has at most maxElements elements
+    @ In, nRows, int, number of rows
+    @ In, nColumns, int, number of columns
+    @ In, maxElements, int, optional, maximum number of elements of each chunk
+    @ Out, _chunks, generator, generator of slices of the rows
+  """
+  step = max(1, maxElements // max(1, nColumns))
+  for start in range(0, nRows, step):
+    yield slice(start, min(start + step, nRows))
+
+def _closest(distance, rows, columns):
+  """
+    Get the closest column of each row, the distances are computed in row chunks
+    @ In, distance, function, distance(rows, columns) returns the distance between the scenarios of given indices
+    @ In, rows, numpy.array, indices of the scenarios
+    @ In, columns, list, indices of the candidate scenarios
+    @ Out, (closest, minDist), tuple, numpy.array of the position of the closest scenario in columns for each
+      row, and numpy.array of the distance to the closest scenario
+  """
+  closest = np.zeros(len(rows), dtype=np.int64)
+  minDist = np.zeros(len(rows))
+  for chunk in _chunks(len(rows), len(columns)):
+    distData = distance(rows[chunk], columns)
+    closest[chunk] = np.argmin(distData, axis=1)
+    minDist[chunk] = distData[np.arange(len(distData)), closest[chunk]]
+  return closest, minDist
+
+def reduceScenarios(space, method='fast_forward', number=None, tolerance=None, metric='minkowski', maxMemory=4096):
+  """
+    Reduce the scenario space, the probabilities of the removed scenarios are redistributed to their
+    closest kept scenarios. Only one dense matrix of the pairwise distance is kept in memory, which is filled in
+    row chunks and overwritten by the forward selection, the other distances are computed from the scenario data
+    @ In, space, ScenarioSpace, the scenario space to reduce
+    @ In, method, str, optional, the reduction method, i.e. fast_forward or kmedoids
+    @ In, number, int, optional, target number of kept scenarios
+    @ In, tolerance, float, optional, tolerance of the reduction error
+    @ In, metric, str, optional, the distance metric used by distanceUtils.computeDist
+    @ In, maxMemory, float, optional, the maximum memory of the distance matrix in MB
+    @ Out, (subspace, error), tuple, the reduced scenario space and the reduction error, i.e. the Kantorovich
+      distance between the original and reduced distributions. If the given space is a subspace of merged
+      scenarios, the kept scenarios still represent their merged scenarios, but not the removed scenarios whose
+      probabilities are redistributed to them
+  """
+  if number is None and tolerance is None:
+    raise IOError('Either the target number or the tolerance is required by scenario reduction!')
+  if method not in ['fast_forward', 'kmedoids']:
+    raise IOError('Unrecognized scenario reduction method "{}"!'.format(method))
+  probs = space.probabilities()
+  nScenarios = len(probs)
+  required = nScenarios * nScenarios * np.dtype(float).itemsize / 1024.0 / 1024.0
+  if required > float(maxMemory):
+    raise IOError('Scenario reduction of {} scenarios requires {:.1f} MB for the distance matrix, which exceeds '
+                  '"maxMemory" of {} MB! Please reduce the scenarios with "mergeScenarios" or "probabilityThreshold" '
+                  'first, or increase "maxMemory" of node "scenarioReduction".'.format(nScenarios, required, maxMemory))
+  data = space.matrix()
+  distance = lambda rows, columns: distanceUtils.computeDist(metric, data[rows], otherData=data[columns])
+  allScenarios = np.arange(nScenarios)
+  cost = np.empty((nScenarios, nScenarios))
+  for chunk in _chunks(nScenarios, nScenarios):
+    cost[chunk] = distance(allScenarios[chunk], allScenarios)
+  selected = fastForwardSelection(cost, probs, number=number, tolerance=tolerance, overwrite=True)
+  del cost
+  if method == 'kmedoids':
+    selected = kMedoids(distance, probs, selected)
+  selected = sorted(set(selected))
+  # redistribute the probabilities
+  assign, minDist = _closest(distance, allScenarios, selected)
+  newProbs = np.bincount(assign, weights=probs, minlength=len(selected))
+  error = float(probs.dot(minDist))
+  return space.subspace(selected, newProbs), error
@@ -24,6 +24,7 @@ else:
 #import PyomoModels
 from CapitalInvestments import PyomoModels
 from CapitalInvestments.investment_utils import inputReader
+from CapitalInvestments.investment_utils import cacheUtils
 #Internal Modules End--------------------------------------------------------------------------------
 
 logging.basicConfig(format='%(asctime)s %(name)-20s %(levelname)-8s %(message)s', datefmt='%d-%b-%y %H:%M:%S', level=logging.DEBUG)
@@ -44,6 +45,8 @@ if __name__ == "__main__":
   parser = argparse.ArgumentParser(description='Run LOGOS as a stand-alone code')
   parser.add_argument('-i', '--input', nargs=1, required=True, help='LOGOS input filename')
   parser.add_argument('-o', '--output', nargs=1, help='LOGOS output filename')
+  parser.add_argument('--cache-dir', nargs=1, help='Directory of the on-disk cache of processed inputs, the cache is disabled if not provided')
+  parser.add_argument('--cache-size', nargs=1, type=float, default=[512], help='Maximum size of the input cache in MB (default: 512)')
   args = parser.parse_args()
   args = vars(args)
   inFile = args['input'][0]
@@ -58,7 +61,11 @@ if __name__ == "__main__":
   # process input file
   logger.info('Starting to process input file: %s', inFile)
   inputDir = os.path.dirname(os.path.abspath(inFile))
-  initDict = inputReader.readInput(inFile, inputDir)
+  cache = None
+  if args['cache_dir'] is not None:
+    cache = cacheUtils.InputCache(args['cache_dir'][0], args['cache_size'][0])
+    logger.info('Input cache: %s', cache.cacheDir)
+  initDict = inputReader.readInput(inFile, inputDir, cache)
   logger.info('Input file is successfully processed')
   problemType = initDict['Settings'].pop('problem_type', 'SingleKnapsack')
   logger.info('Set problem type to default: %s', 'Knapsacks Problem')
@@ -0,0 +1,161 @@
+# Copyright 2020, Battelle Energy Alliance, LLC
+# ALL RIGHTS RESERVED
+"""
+  Unit tests of the on-disk cache of processed inputs, i.e. cacheUtils.computeKey, cacheUtils.InputCache and
+  inputReader.readInput with a cache: a cache hit skips the processing of the input, the key changes when the
+  input or the data files referenced by the input change, and the cache files are evicted by least recent use
+  Created on Oct. 19, 2026
+  @author: wangc, mandd
+"""
+#External Modules------------------------------------------------------------------------------------
+import os
+import sys
+import time
+import pickle
+import shutil
+import tempfile
+#External Modules End--------------------------------------------------------------------------------
+
+#Internal Modules------------------------------------------------------------------------------------
+srcLoc = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
+sys.path.append(srcLoc)
+sys.path.append(os.path.join(srcLoc, 'contrib'))
+from CapitalInvestments.investment_utils import inputReader
+from CapitalInvestments.investment_utils import cacheUtils
+from CapitalInvestments.investment_utils import investmentUtils as utils
+#Internal Modules End--------------------------------------------------------------------------------
+
+results = {'pass':0, 'fail':0}
+
+def checkTrue(comment, value):
+  """
+    Check if the value is True, and record the result
+    @ In, comment, str, the description of the check
+    @ In, value, bool, the value to check
+    @ Out, value, bool, the value to check
+  """
+  if value:
+    results['pass'] += 1
+  else:
+    print('checking', comment, '... FAILED')
+    results['fail'] += 1
+  return value
+
+def writeFile(filename, content):
+  """
+    Write the content into the file
+    @ In, filename, str, the file to write
+    @ In, content, str or bytes, the content of the file
+    @ Out, None
+  """
+  with open(filename, 'wb' if isinstance(content, bytes) else 'w') as fileObj:
+    fileObj.write(content)
+
+def countedRead(filename, workingDir, cache):
+  """
+    Process the input with the cache, and count whether the input is parsed, i.e. the sets are read
+    @ In, filename, str, the input file
+    @ In, workingDir, str, the working directory
+    @ In, cache, cacheUtils.InputCache, the on-disk cache of processed inputs
+    @ Out, (initDict, parsed), tuple, the processed input and True if the input is parsed
+  """
+  calls = []
+  readSets = inputReader.readSets
+  def readSetsCounted(*args, **kwargs):
+    """
+      Record the call of inputReader.readSets
+      @ In, args, list, the positional arguments of inputReader.readSets
+      @ In, kwargs, dict, the keyword arguments of inputReader.readSets
+      @ Out, sets, dict, the sets returned by inputReader.readSets
+    """
+    calls.append(True)
+    return readSets(*args, **kwargs)
+  inputReader.readSets = readSetsCounted
+  try:
+    initDict = inputReader.readInput(filename, workingDir, cache)
+  finally:
+    inputReader.readSets = readSets
+  return initDict, len(calls) > 0
+
+skpInput = """<Logos>
+  <Sets>
+    <investments>i1,i2,i3</investments>
+  </Sets>
+  <Parameters>
+    <net_present_values index="investments" file="parameters.csv" key="net_present_values"/>
+    <costs index="investments" file="parameters.csv" key="costs"/>
+    <available_capitals>CAPITAL</available_capitals>
+  </Parameters>
+  <Settings>
+    <solver>glpk</solver>
+    <sense>maximize</sense>
+  </Settings>
+</Logos>"""
+
+workingDir = tempfile.mkdtemp(prefix='logos_cache_test_')
+try:
+  inputFile = os.path.join(workingDir, 'skp.xml')
+  dataFile = os.path.join(workingDir, 'parameters.csv')
+  writeFile(inputFile, skpInput.replace('CAPITAL', '15'))
+  writeFile(dataFile, 'net_present_values,costs\n18,1\n20,3\n17,7\n')
+  cache = cacheUtils.InputCache(os.path.join(workingDir, 'cache'))
+
+  ## a repeated read is loaded from the cache, and it is the same as the processed input
+  first, parsed = countedRead(inputFile, workingDir, cache)
+  checkTrue('first read parses the input', parsed)
+  key = cacheUtils.computeKey(inputFile, workingDir)
+  checkTrue('processed input is cached', os.path.isfile(cache._path(key)))
+  second, parsed = countedRead(inputFile, workingDir, cache)
+  checkTrue('repeated read skips the parsing', not parsed)
+  checkTrue('cached input is the same as the processed input', utils.isSameData(first, second))
+  checkTrue('cached input is the same as the input processed without cache',
+            utils.isSameData(second, inputReader.readInput(inputFile, workingDir)))
+
+  ## the key changes when the data file referenced by the input changes
+  writeFile(dataFile, 'net_present_values,costs\n18,1\n21,3\n17,7\n')
+  dataKey = cacheUtils.computeKey(inputFile, workingDir)
+  checkTrue('edited data file gives a new key', dataKey != key)
+  third, parsed = countedRead(inputFile, workingDir, cache)
+  checkTrue('edited data file is parsed again', parsed)
+  checkTrue('edited data file is read', third['Parameters']['net_present_values']['i2'] == 21.0)
+
+  ## the key changes when the input changes
+  writeFile(inputFile, skpInput.replace('CAPITAL', '16'))
+  xmlKey = cacheUtils.computeKey(inputFile, workingDir)
+  checkTrue('edited input gives a new key', xmlKey not in [key, dataKey])
+  fourth, parsed = countedRead(inputFile, workingDir, cache)
+  checkTrue('edited input is parsed again', parsed)
+  checkTrue('edited input is read', not utils.isSameData(third['Parameters'], fourth['Parameters']))
+
+  ## the cache file that can not be unpickled is removed
+  writeFile(cache._path(xmlKey), b'not a pickle')
+  checkTrue('invalid cache file is not loaded', cache.load(xmlKey) is None)
+  checkTrue('invalid cache file is removed', not os.path.exists(cache._path(xmlKey)))
+
+  ## the least recently used files are evicted once the total size exceeds the limit
+  evictDir = os.path.join(workingDir, 'evict')
+  cache = cacheUtils.InputCache(evictDir)
+  now = time.time()
+  for age, name in enumerate(['newest', 'middle', 'oldest']):
+    writeFile(cache._path(name), b'0' * 400)
+    os.utime(cache._path(name), (now - 100 * age, now - 100 * age))
+  writeFile(os.path.join(evictDir, 'other.tmp'), b'0' * 4000)
+  cache.maxSize = 1000
+  cache.evict()
+  checkTrue('least recently used file is evicted', not os.path.exists(cache._path('oldest')))
+  checkTrue('recently used files are kept', all(os.path.exists(cache._path(name)) for name in ['newest', 'middle']))
+  checkTrue('files other than the cache files are kept', os.path.exists(os.path.join(evictDir, 'other.tmp')))
+  cache.maxSize = 100
+  # loading a file updates its access time, so that it becomes the most recently used file
+  writeFile(cache._path('middle'), pickle.dumps({'data':1}))
+  os.utime(cache._path('middle'), (now - 100, now - 100))
+  os.utime(cache._path('newest'), (now - 50, now - 50))
+  checkTrue('cache file is loaded', cache.load('middle') == {'data':1})
+  cache.evict()
+  checkTrue('file used by the last load is kept', os.path.exists(cache._path('middle')))
+  checkTrue('file not used by the last load is evicted', not os.path.exists(cache._path('newest')))
+finally:
+  shutil.rmtree(workingDir, ignore_errors=True)
+
+print(results)
+sys.exit(results['fail'])
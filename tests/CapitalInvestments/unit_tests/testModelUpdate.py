@@ -0,0 +1,158 @@
+# Copyright 2020, Battelle Energy Alliance, LLC
+# ALL RIGHTS RESERVED
+"""
+  Unit tests of ModelBase.update, i.e. the instance is updated in place when a new input only changes the values
+  of the mutable parameters, and it is rebuilt otherwise
+  Created on Oct. 18, 2026
+  @author: wangc, mandd
+"""
+#External Modules------------------------------------------------------------------------------------
+import os
+import sys
+import xml.etree.ElementTree as ET
+import pyomo.environ as pyomo
+#External Modules End--------------------------------------------------------------------------------
+
+#Internal Modules------------------------------------------------------------------------------------
+srcLoc = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
+sys.path.append(srcLoc)
+sys.path.append(os.path.join(srcLoc, 'contrib'))
+from CapitalInvestments.PyomoModels.SingleKnapsack import SingleKnapsack
+from CapitalInvestments.investment_utils import inputReader
+#Internal Modules End--------------------------------------------------------------------------------
+
+workingDir = os.path.dirname(os.path.abspath(__file__))
+results = {'pass':0, 'fail':0}
+
+def checkTrue(comment, value):
+  """
+    Check if the value is True, and record the result
+    @ In, comment, str, the description of the check
+    @ In, value, bool, the value to check
+    @ Out, value, bool, the value to check
+  """
+  if value:
+    results['pass'] += 1
+  else:
+    print('checking', comment, '... FAILED')
+    results['fail'] += 1
+  return value
+
+def skpInput(investments='i1,i2,i3,i4,i5', npvs='18,20,17,19,25', costs='1,3,7,4,8', capitals='15', solver='glpk'):
+  """
+    Process the input of a single knapsack problem
+    @ In, investments, str, optional, the investments
+    @ In, npvs, str, optional, the net present values of the investments
+    @ In, costs, str, optional, the costs of the investments
+    @ In, capitals, str, optional, the available capitals
+    @ In, solver, str, optional, the solver
+    @ Out, initDict, dict, dictionary of inputs, see inputReader.readInput
+  """
+  root = ET.fromstring("""
+  <Logos>
+    <Sets>
+      <investments>{}</investments>
+    </Sets>
+    <Parameters>
+      <net_present_values index="investments">{}</net_present_values>
+      <costs index="investments">{}</costs>
+      <available_capitals>{}</available_capitals>
+    </Parameters>
+    <Settings>
+      <solver>{}</solver>
+      <sense>maximize</sense>
+    </Settings>
+  </Logos>""".format(investments, npvs, costs, capitals, solver))
+  return inputReader.readInput(root, workingDir)
+
+def countInitialize(model):
+  """
+    Record the calls of the initialize method of the model
+    @ In, model, ModelBase, the model
+    @ Out, calls, list, the inputs of the calls of model.initialize
+  """
+  calls = []
+  initialize = model.initialize
+  def recordInitialize(initDict):
+    """
+      Record the call and initialize the model
+      @ In, initDict, dict, dictionary of inputs
+      @ Out, None
+    """
+    calls.append(initDict)
+    initialize(initDict)
+  model.initialize = recordInitialize
+  return calls
+
+def paramValues(instance, paramName):
+  """
+    Get the values of the parameter of the instance
+    @ In, instance, pyomo.instance, instance of pyomo model
+    @ In, paramName, str, the name of the parameter
+    @ Out, values, list, the values of the parameter
+  """
+  return list(pyomo.value(val) for val in instance.component(paramName).values())
+
+class FixedCapitalKnapsack(SingleKnapsack):
+  """
+    Single knapsack model with the available capitals declared as a non-mutable parameter
+  """
+  def initializeModel(self):
+    """
+      Initialize the pyomo model parameters, the available capitals can not be updated in the instance
+      @ In, None
+      @ Out, model, pyomo model instance, pyomo abstract model
+    """
+    model = SingleKnapsack.initializeModel(self)
+    model.del_component(model.available_capitals)
+    model.available_capitals = pyomo.Param(model.time_periods, initialize=self.modelData('available_capitals'))
+    return model
+
+## the values of the mutable parameters are pushed into the instance with store_values
+model = SingleKnapsack()
+model.initialize(skpInput())
+instance = model.constructInstance()
+calls = countInitialize(model)
+model.update(skpInput(npvs='18,20,17,19,30', capitals='12'))
+checkTrue('values only, initialize is not called', len(calls) == 0)
+checkTrue('values only, instance is kept', model.reusableInstance() is instance)
+checkTrue('values only, changed parameters', sorted(model._changedParams) == ['available_capitals', 'net_present_values'])
+checkTrue('values only, net_present_values is updated', paramValues(instance, 'net_present_values') == [18, 20, 17, 19, 30])
+checkTrue('values only, available_capitals is updated', paramValues(instance, 'available_capitals') == [12])
+checkTrue('values only, costs is unchanged', paramValues(instance, 'costs') == [1, 3, 7, 4, 8])
+fresh = SingleKnapsack()
+fresh.initialize(skpInput(npvs='18,20,17,19,30', capitals='12'))
+checkTrue('values only, same solution as the rebuilt instance', model.run() == fresh.run())
+model.update(skpInput(npvs='18,20,17,19,30', capitals='12'))
+checkTrue('same input, no changed parameters', len(calls) == 0 and model._changedParams == [])
+
+## the sets define the structure of the instance
+model.update(skpInput(investments='i1,i2,i3,i4', npvs='18,20,17,19', costs='1,3,7,4'))
+checkTrue('set change, initialize is called', len(calls) == 1)
+checkTrue('set change, instance is rebuilt', model.reusableInstance() is None)
+
+## the settings define the structure of the instance
+model = SingleKnapsack()
+model.initialize(skpInput())
+model.constructInstance()
+calls = countInitialize(model)
+model.update(skpInput(solver='cbc'))
+checkTrue('settings change, initialize is called', len(calls) == 1)
+checkTrue('settings change, instance is rebuilt', model.reusableInstance() is None)
+checkTrue('settings change, new settings are used', model.solver == 'cbc')
+
+## the non-mutable parameters are only used to build the instance
+model = FixedCapitalKnapsack()
+model.initialize(skpInput())
+instance = model.constructInstance()
+calls = countInitialize(model)
+model.update(skpInput(npvs='18,20,17,19,30'))
+checkTrue('mutable parameter, initialize is not called', len(calls) == 0)
+checkTrue('mutable parameter, instance is kept', model.reusableInstance() is instance)
+model.update(skpInput(npvs='18,20,17,19,30', capitals='12'))
+checkTrue('non-mutable parameter, initialize is called', len(calls) == 1)
+checkTrue('non-mutable parameter, instance is rebuilt', model.reusableInstance() is None)
+checkTrue('non-mutable parameter, new value is used', paramValues(model.constructInstance(), 'available_capitals') == [12])
+
+print(results)
+sys.exit(results['fail'])
@@ -0,0 +1,182 @@
+# Copyright 2020, Battelle Energy Alliance, LLC
+# ALL RIGHTS RESERVED
+"""
+  Unit tests of inputReader.readSampledInput and inputReader.applySampledValues, i.e. the sampled variables of
+  RAVEN are applied to the processed input directly, and the result is the same as processing the input with the
+  sampled values written into the xml
+  Created on Oct. 18, 2026
+  @author: wangc, mandd
+"""
+#External Modules------------------------------------------------------------------------------------
+import os
+import sys
+import copy
+import logging
+import xml.etree.ElementTree as ET
+import numpy as np
+#External Modules End--------------------------------------------------------------------------------
+
+#Internal Modules------------------------------------------------------------------------------------
+srcLoc = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
+sys.path.append(srcLoc)
+sys.path.append(os.path.join(srcLoc, 'contrib'))
+from CapitalInvestments.investment_utils import inputReader
+#Internal Modules End--------------------------------------------------------------------------------
+
+workingDir = os.path.dirname(os.path.abspath(__file__))
+results = {'pass':0, 'fail':0}
+
+def checkTrue(comment, value):
+  """
+    Check if the value is True, and record the result
+    @ In, comment, str, the description of the check
+    @ In, value, bool, the value to check
+    @ Out, value, bool, the value to check
+  """
+  if value:
+    results['pass'] += 1
+  else:
+    print('checking', comment, '... FAILED')
+    results['fail'] += 1
+  return value
+
+def rewrittenInput(root, sampledVars):
+  """
+    Process the input with the sampled values written into the xml, i.e. the way the input of each sample was
+    processed before readSampledInput
+    @ In, root, xml.etree.ElementTree.Element, root xml element node
+    @ In, sampledVars, dict, {varName:value} the values of the sampled variables
+    @ Out, initDict, dict, dictionary of inputs, see inputReader.readInput
+  """
+  newXml = copy.deepcopy(root)
+  for child in newXml.find('Parameters'):
+    if child.tag in sampledVars:
+      if isinstance(sampledVars[child.tag], (list, np.ndarray)):
+        child.text = ','.join(str(var) for var in sampledVars[child.tag])
+      else:
+        child.text = str(sampledVars[child.tag])
+    else:
+      if ',' in child.text:
+        listData = list(elem.strip() for elem in child.text.split(','))
+      else:
+        listData = list(elem.strip() for elem in child.text.split())
+      child.text = ','.join(str(sampledVars.get(var, var)) for var in listData)
+  return inputReader.readInput(newXml, workingDir)
+
+class RecordHandler(logging.Handler):
+  """
+    Logging handler that keeps the messages of the records
+  """
+  def __init__(self):
+    """
+      Constructor
+      @ In, None
+      @ Out, None
+    """
+    logging.Handler.__init__(self, level=logging.WARNING)
+    self.messages = []
+
+  def emit(self, record):
+    """
+      Keep the message of the record
+      @ In, record, logging.LogRecord, the record
+      @ Out, None
+    """
+    self.messages.append(record.getMessage())
+
+skpInput = """
+<ModelData>
+  <Sets>
+    <investments>i1,i2,i3,i4,i5</investments>
+    <time_periods>T1,T2</time_periods>
+  </Sets>
+  <Parameters>
+    <net_present_values index="investments">18,npv_i2,17,19,npv_i5</net_present_values>
+    <costs index="investments, time_periods">1,2,3,cost_i2,7,8,4,5,8,9</costs>
+    <available_capitals index="time_periods">15,16</available_capitals>
+  </Parameters>
+  <Settings>
+    <solver>glpk</solver>
+    <sense>maximize</sense>
+  </Settings>
+</ModelData>"""
+
+## placeholders mixed into the indexed nodes, and a variable that drives the whole node
+root = ET.fromstring(skpInput)
+variables = ['npv_i2', 'npv_i5', 'cost_i2', 'available_capitals', 'unused']
+initDict, slots = inputReader.readSampledInput(root, variables, workingDir)
+checkTrue('template is not modified', ET.tostring(root) == ET.tostring(ET.fromstring(skpInput)))
+checkTrue('variables with slots', sorted(slots) == ['available_capitals', 'cost_i2', 'npv_i2', 'npv_i5'])
+checkTrue('placeholder slot', slots['npv_i2'] == [('net_present_values', ['i2'], float)])
+checkTrue('placeholder slot of 2D node', slots['cost_i2'] == [('costs', [('i2', 'T2')], float)])
+checkTrue('whole node slot', slots['available_capitals'] == [('available_capitals', ['T1', 'T2'], float)])
+checkTrue('placeholders are read as zeros', initDict['Parameters']['net_present_values']['i2'] == 0.0)
+original = copy.deepcopy(initDict['Parameters'])
+samples = [{'npv_i2':20.0, 'npv_i5':25.0, 'cost_i2':4.0, 'available_capitals':np.array([15.0, 16.0])},
+           {'npv_i2':31.5, 'npv_i5':12.0, 'cost_i2':0.5, 'available_capitals':np.array([9.0, 11.5])}]
+outputs = []
+for i, sampledVars in enumerate(samples):
+  newDict = inputReader.applySampledValues(initDict, slots, sampledVars)
+  oldDict = rewrittenInput(root, sampledVars)
+  for key in ['Sets', 'Parameters', 'Settings', 'Meta', 'Uncertainties', 'ExternalConstraints']:
+    checkTrue('sample {}, {} is the same as the rewritten input'.format(i, key), newDict[key] == oldDict[key])
+  checkTrue('sample {}, settings are copied'.format(i), newDict['Settings'] is not initDict['Settings'])
+  outputs.append(newDict)
+checkTrue('input is not mutated across samples', initDict['Parameters'] == original)
+checkTrue('first sample is not mutated by the second sample', outputs[0]['Parameters']['net_present_values']['i2'] == 20.0)
+partial = inputReader.applySampledValues(initDict, slots, {'npv_i2':22.0})
+checkTrue('variables that are not sampled keep the template values', partial['Parameters']['net_present_values']['i5'] == 0.0)
+checkTrue('changed parameters are copied', partial['Parameters']['net_present_values'] is not initDict['Parameters']['net_present_values'])
+checkTrue('unchanged parameters are shared', all(partial['Parameters'][paramName] is initDict['Parameters'][paramName]
+          for paramName in ['costs', 'available_capitals']))
+
+## the length of the sampled values must match the number of entries driven by the variable
+try:
+  inputReader.applySampledValues(initDict, slots, {'available_capitals':np.array([15.0, 16.0, 17.0])})
+  checkTrue('length mismatch raises IOError', False)
+except IOError as error:
+  checkTrue('length mismatch raises IOError', 'available_capitals' in str(error))
+try:
+  inputReader.applySampledValues(initDict, slots, {'npv_i2':np.array([20.0, 21.0])})
+  checkTrue('length mismatch of placeholder raises IOError', False)
+except IOError:
+  checkTrue('length mismatch of placeholder raises IOError', True)
+checkTrue('input is not mutated by the failed samples', initDict['Parameters'] == original)
+
+## the parameters computed from the cash flows of node Economics are not driven by the variables
+economicsInput = """
+<ModelData>
+  <Sets>
+    <investments>i1,i2</investments>
+    <time_periods>T1,T2</time_periods>
+  </Sets>
+  <Economics>
+    <net_present_values>
+      <DiscountRate>0.08</DiscountRate>
+      <CashFlow index="investments, time_periods">-1.0,0.8,0.8,-2.0,1.5,1.5</CashFlow>
+    </net_present_values>
+  </Economics>
+  <Parameters>
+    <net_present_values index="investments">npv_i1,1.0</net_present_values>
+    <costs index="investments, time_periods">1,2,3,cost_i2</costs>
+    <available_capitals index="time_periods">5,5</available_capitals>
+  </Parameters>
+  <Settings>
+    <solver>glpk</solver>
+    <sense>maximize</sense>
+  </Settings>
+</ModelData>"""
+handler = RecordHandler()
+logging.getLogger(inputReader.__name__).addHandler(handler)
+root = ET.fromstring(economicsInput)
+initDict, slots = inputReader.readSampledInput(root, ['npv_i1', 'cost_i2'], workingDir)
+logging.getLogger(inputReader.__name__).removeHandler(handler)
+checkTrue('economics, warning is reported', any('net_present_values' in msg and 'npv_i1' in msg for msg in handler.messages))
+checkTrue('economics, variable is not used', sorted(slots) == ['cost_i2'])
+sampledVars = {'npv_i1':100.0, 'cost_i2':3.5}
+newDict = inputReader.applySampledValues(initDict, slots, sampledVars)
+oldDict = rewrittenInput(root, sampledVars)
+checkTrue('economics, same as the rewritten input', newDict['Parameters'] == oldDict['Parameters'])
+
+print(results)
+sys.exit(results['fail'])